@@ -1,9 +1,51 @@
+from typing import Any
+
 from ._roi import ROI, ROIBase, ROIOrigin
-from ._roi_widget import ROIWidget
+from ._roi_fingerprint import compute_roi_fingerprint
+from ._roi_fit import fit_boxes
+from ._roi_generators import create_grid_boxes, create_label_boxes
+from ._roi_ipc import ROIClient
+from ._roi_overlap import (
+    compute_iou_matrix,
+    find_duplicate_boxes,
+    find_overlapping_boxes,
+)
+from ._roi_query import query_rois
+from ._roi_rename import deduplicate_roi_names, format_roi_names, replace_roi_names
+from ._roi_snapshot import ROISnapshot, StaleROISnapshotError
 
 try:
     from ._version import version as __version__
 except ImportError:
     __version__ = "unknown"
 
-__all__ = ["ROI", "ROIBase", "ROIOrigin", "ROIWidget"]
+
+def __getattr__(name: str) -> Any:
+    # defer Qt imports, such that napari-roi can be used without a GUI
+    if name == "ROIWidget":
+        from ._roi_widget import ROIWidget
+
+        return ROIWidget
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "compute_iou_matrix",
+    "compute_roi_fingerprint",
+    "create_grid_boxes",
+    "create_label_boxes",
+    "deduplicate_roi_names",
+    "find_duplicate_boxes",
+    "find_overlapping_boxes",
+    "fit_boxes",
+    "format_roi_names",
+    "query_rois",
+    "replace_roi_names",
+    "ROI",
+    "ROIBase",
+    "ROIClient",
+    "ROIOrigin",
+    "ROISnapshot",
+    "ROIWidget",
+    "StaleROISnapshotError",
+]
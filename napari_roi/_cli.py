@@ -0,0 +1,315 @@
+import argparse
+import json
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from ._roi import ROIOrigin
+from ._roi_file import (
+    ROI_FILE_FORMATS,
+    ROI_FILE_HEIGHT_COLUMN,
+    ROI_FILE_NAME_COLUMN,
+    ROI_FILE_WIDTH_COLUMN,
+    convert_roi_file_origin,
+    read_roi_file,
+    roi_file_to_boxes,
+    validate_roi_file,
+    write_roi_file,
+)
+from ._roi_ipc import DEFAULT_ROI_SERVER_NAME, ROIClient
+
+ROI_ORIGINS = [
+    str(ROIOrigin.CENTER),
+    str(ROIOrigin.TOP_LEFT),
+    str(ROIOrigin.TOP_RIGHT),
+    str(ROIOrigin.BOTTOM_LEFT),
+    str(ROIOrigin.BOTTOM_RIGHT),
+]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = _create_parser()
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+def _create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="napari-roi", description="Convert and validate napari-roi ROI files"
+    )
+    subparsers = parser.add_subparsers(title="commands", required=True)
+
+    convert_parser = subparsers.add_parser(
+        "convert", help="convert ROI files to another X/Y origin or file format"
+    )
+    _add_input_arguments(convert_parser)
+    convert_parser.add_argument(
+        "-o", "--output-dir", type=Path, required=True, help="output directory"
+    )
+    convert_parser.add_argument(
+        "--from-origin",
+        choices=ROI_ORIGINS,
+        default=str(ROIOrigin.CENTER),
+        help="X/Y origin of the input files (default: %(default)s)",
+    )
+    convert_parser.add_argument(
+        "--to-origin",
+        choices=ROI_ORIGINS,
+        help="X/Y origin of the output files (default: unchanged)",
+    )
+    convert_parser.add_argument(
+        "--format",
+        choices=ROI_FILE_FORMATS,
+        help="format of the output files (default: unchanged)",
+    )
+    convert_parser.set_defaults(func=_convert)
+
+    merge_parser = subparsers.add_parser(
+        "merge", help="merge ROI files into a single ROI file"
+    )
+    _add_input_arguments(merge_parser)
+    merge_parser.add_argument(
+        "-o", "--output", type=Path, required=True, help="output file"
+    )
+    merge_parser.add_argument(
+        "--source-column",
+        help="name of an additional column holding the input file names",
+    )
+    merge_parser.set_defaults(func=_merge)
+
+    validate_parser = subparsers.add_parser(
+        "validate", help="validate ROI names and coordinates"
+    )
+    _add_input_arguments(validate_parser)
+    validate_parser.set_defaults(func=_validate)
+
+    stats_parser = subparsers.add_parser("stats", help="print ROI file statistics")
+    _add_input_arguments(stats_parser)
+    stats_parser.set_defaults(func=_stats)
+
+    subscribe_parser = subparsers.add_parser(
+        "subscribe",
+        help="print live ROI changes of a napari-roi widget sharing its ROIs",
+    )
+    subscribe_parser.add_argument(
+        "server",
+        nargs="?",
+        default=DEFAULT_ROI_SERVER_NAME,
+        help="server name or socket path (default: %(default)s)",
+    )
+    subscribe_parser.add_argument(
+        "--push", type=Path, help="ROI file to push to the napari-roi widget"
+    )
+    subscribe_parser.add_argument(
+        "--push-origin",
+        choices=ROI_ORIGINS,
+        default=str(ROIOrigin.CENTER),
+        help="X/Y origin of the pushed ROI file (default: %(default)s)",
+    )
+    subscribe_parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="replace all ROIs instead of adding/updating ROIs by name",
+    )
+    subscribe_parser.set_defaults(func=_subscribe)
+
+    return parser
+
+
+def _add_input_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument(
+        "inputs", nargs="+", type=Path, help="ROI files or directories of ROI files"
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="search directories recursively",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+
+
+def _convert(args: argparse.Namespace) -> int:
+    output_paths: Dict[Path, Path] = {}
+    for input_path in args.inputs:
+        for path in _find_roi_files([input_path], args.recursive):
+            # preserve the directory structure, e.g. when searching recursively
+            if input_path.is_dir():
+                output_path = args.output_dir / path.relative_to(input_path)
+            else:
+                output_path = args.output_dir / path.name
+            if args.format is not None:
+                output_path = output_path.with_suffix(f".{args.format}")
+            output_paths[path] = output_path
+    exit_code = 0
+    resolved_input_paths = {path.resolve() for path in output_paths}
+    resolved_output_paths = Counter(p.resolve() for p in output_paths.values())
+    for path, output_path in list(output_paths.items()):
+        error = None
+        if output_path.resolve() in resolved_input_paths:
+            error = f"refusing to overwrite input file {output_path}"
+        elif resolved_output_paths[output_path.resolve()] > 1:
+            error = f"multiple input files would be written to {output_path}"
+        if error is not None:
+            print(f"{path}: {error}", file=sys.stderr)
+            del output_paths[path]
+            exit_code = 1
+    kwargs = {
+        "roi_origin": args.from_origin,
+        "new_roi_origin": args.to_origin,
+    }
+    path_kwargs = {
+        path: {"output_path": output_path} for path, output_path in output_paths.items()
+    }
+    return _run(args, _convert_file, kwargs, path_kwargs=path_kwargs) or exit_code
+
+
+def _merge(args: argparse.Namespace) -> int:
+    dfs: Dict[Path, pd.DataFrame] = {}
+    exit_code = 0
+    for path, result, error in _map(args, read_roi_file, {}):
+        if error is not None:
+            print(f"{path}: {error}", file=sys.stderr)
+            exit_code = 1
+        else:
+            if args.source_column is not None:
+                result.insert(0, args.source_column, path.name)
+            dfs[path] = result
+    if len(dfs) > 0:
+        # preserve input order, regardless of the order of completion
+        paths = _find_roi_files(args.inputs, args.recursive)
+        dfs = {path: dfs[path] for path in paths if path in dfs}
+        write_roi_file(pd.concat(dfs.values(), ignore_index=True), args.output)
+        print(f"{args.output}: {sum(len(df.index) for df in dfs.values())} ROIs")
+    return exit_code
+
+
+def _validate(args: argparse.Namespace) -> int:
+    return _run(args, _validate_file, {})
+
+
+def _stats(args: argparse.Namespace) -> int:
+    return _run(args, _get_file_stats, {})
+
+
+def _subscribe(args: argparse.Namespace) -> int:
+    try:
+        client = ROIClient(args.server)
+    except OSError as e:
+        print(f"{args.server}: {e}", file=sys.stderr)
+        return 1
+    with client:
+        if args.push is not None:
+            df = read_roi_file(args.push)
+            boxes = roi_file_to_boxes(df, ROIOrigin(args.push_origin))
+            client.push(df[ROI_FILE_NAME_COLUMN].tolist(), boxes, replace=args.replace)
+        try:
+            for message in client:
+                print(json.dumps(message), flush=True)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _convert_file(
+    path: Path,
+    output_path: Path,
+    roi_origin: str,
+    new_roi_origin: Optional[str],
+) -> str:
+    df = read_roi_file(path)
+    if new_roi_origin is not None:
+        df = convert_roi_file_origin(
+            df, ROIOrigin(roi_origin), ROIOrigin(new_roi_origin)
+        )
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    write_roi_file(df, output_path)
+    return f"{len(df.index)} ROIs written to {output_path}"
+
+
+def _validate_file(path: Path) -> str:
+    problems = validate_roi_file(read_roi_file(path))
+    if len(problems) > 0:
+        raise ValueError("; ".join(problems))
+    return "OK"
+
+
+def _get_file_stats(path: Path) -> str:
+    df = read_roi_file(path)
+    widths = df[ROI_FILE_WIDTH_COLUMN]
+    heights = df[ROI_FILE_HEIGHT_COLUMN]
+    return (
+        f"{len(df.index)} ROIs, "
+        f"{df[ROI_FILE_NAME_COLUMN].nunique()} unique names, "
+        f"mean size {widths.mean():.6g} x {heights.mean():.6g}, "
+        f"total area {(widths * heights).sum():.6g}"
+    )
+
+
+def _run(
+    args: argparse.Namespace,
+    fn: Callable[..., str],
+    kwargs: Dict[str, Any],
+    path_kwargs: Optional[Dict[Path, Dict[str, Any]]] = None,
+) -> int:
+    exit_code = 0
+    for path, result, error in _map(args, fn, kwargs, path_kwargs=path_kwargs):
+        if error is not None:
+            print(f"{path}: {error}", file=sys.stderr)
+            exit_code = 1
+        else:
+            print(f"{path}: {result}")
+    return exit_code
+
+
+def _map(
+    args: argparse.Namespace,
+    fn: Callable[..., Any],
+    kwargs: Dict[str, Any],
+    path_kwargs: Optional[Dict[Path, Dict[str, Any]]] = None,
+) -> Iterator[Tuple[Path, Any, Optional[BaseException]]]:
+    if path_kwargs is not None:
+        paths = list(path_kwargs.keys())  # only paths with arguments
+    else:
+        paths = _find_roi_files(args.inputs, args.recursive)
+        path_kwargs = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+        futures = {
+            executor.submit(fn, path, **kwargs, **path_kwargs.get(path, {})): path
+            for path in paths
+        }
+        # stream results as soon as they become available
+        for future in as_completed(futures):
+            error = future.exception()
+            if error is not None:
+                yield futures[future], None, error
+            else:
+                yield futures[future], future.result(), None
+
+
+def _find_roi_files(inputs: Sequence[Path], recursive: bool) -> List[Path]:
+    paths = []
+    for input_path in inputs:
+        if input_path.is_dir():
+            for roi_file_format in ROI_FILE_FORMATS:
+                pattern = f"*.{roi_file_format}"
+                paths += sorted(
+                    input_path.rglob(pattern) if recursive else input_path.glob(pattern)
+                )
+        else:
+            paths.append(input_path)
+    return paths
+
+
+if __name__ == "__main__":
+    sys.exit(main())
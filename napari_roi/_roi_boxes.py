@@ -0,0 +1,127 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from ._roi import ROIOrigin
+
+# relative position of the X/Y origin within the ROI bounding box
+_ROI_ORIGIN_FACTORS = {
+    ROIOrigin.CENTER: (0.5, 0.5),
+    ROIOrigin.TOP_LEFT: (0.0, 0.0),
+    ROIOrigin.TOP_RIGHT: (1.0, 0.0),
+    ROIOrigin.BOTTOM_LEFT: (0.0, 1.0),
+    ROIOrigin.BOTTOM_RIGHT: (1.0, 1.0),
+}
+
+
+def boxes_to_rectangles(boxes: np.ndarray) -> np.ndarray:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    y_min, x_min, y_max, x_max = boxes.T
+    return np.stack(
+        (
+            np.column_stack((y_min, x_min)),
+            np.column_stack((y_min, x_max)),
+            np.column_stack((y_max, x_max)),
+            np.column_stack((y_max, x_min)),
+        ),
+        axis=1,
+    )
+
+
+def shapes_to_boxes(
+    data: Sequence[np.ndarray], matrix: Optional[np.ndarray] = None
+) -> np.ndarray:
+    if len(data) == 0:
+        return np.empty((0, 4))
+    vertices = np.concatenate(data)[:, -2:].astype(float)
+    if matrix is not None:
+        vertices = transform_points(vertices, matrix)
+    offsets = np.cumsum([0] + [len(d) for d in data[:-1]])
+    return np.column_stack(
+        (
+            np.minimum.reduceat(vertices, offsets, axis=0),
+            np.maximum.reduceat(vertices, offsets, axis=0),
+        )
+    )
+
+
+def transform_points(points: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    # applies a homogeneous 3x3 affine matrix in (Y, X) order to the last two axes
+    points = np.array(points, dtype=float)
+    matrix = np.asarray(matrix, dtype=float)
+    points[..., -2:] = points[..., -2:] @ matrix[:2, :2].T + matrix[:2, 2]
+    return points
+
+
+def transform_boxes(boxes: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    # bounding boxes of the transformed boxes, exact for axis-aligned transforms
+    corners = transform_points(boxes_to_rectangles(boxes), matrix)
+    return np.column_stack((corners.min(axis=1), corners.max(axis=1)))
+
+
+def is_axis_aligned(matrix: np.ndarray) -> bool:
+    matrix = np.asarray(matrix, dtype=float)
+    return matrix[0, 1] == 0.0 and matrix[1, 0] == 0.0
+
+
+def boxes_to_xy(
+    boxes: np.ndarray, roi_origin: ROIOrigin
+) -> Tuple[np.ndarray, np.ndarray]:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    fx, fy = _get_roi_origin_factors(roi_origin)
+    x = boxes[:, 1] + fx * (boxes[:, 3] - boxes[:, 1])
+    y = boxes[:, 0] + fy * (boxes[:, 2] - boxes[:, 0])
+    return x, y
+
+
+def xywh_to_boxes(
+    x: np.ndarray,
+    y: np.ndarray,
+    width: np.ndarray,
+    height: np.ndarray,
+    roi_origin: ROIOrigin,
+) -> np.ndarray:
+    x, y, width, height = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (x, y, width, height))
+    )
+    fx, fy = _get_roi_origin_factors(roi_origin)
+    x_min = x - fx * width
+    y_min = y - fy * height
+    return np.column_stack(
+        (
+            y_min.ravel(),
+            x_min.ravel(),
+            (y_min + height).ravel(),
+            (x_min + width).ravel(),
+        )
+    )
+
+
+def find_visible_boxes(
+    boxes: np.ndarray,
+    extent: Sequence[float],
+    min_width: float = 0.0,
+    max_count: Optional[int] = None,
+) -> np.ndarray:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    y_min, x_min, y_max, x_max = extent
+    widths = boxes[:, 3] - boxes[:, 1]
+    visible_mask = (
+        (boxes[:, 0] < y_max)
+        & (boxes[:, 1] < x_max)
+        & (boxes[:, 2] > y_min)
+        & (boxes[:, 3] > x_min)
+        & (widths >= min_width)
+    )
+    indices = np.flatnonzero(visible_mask)
+    if max_count is not None and len(indices) > max_count:
+        # prefer the widest boxes, keeping the original order
+        indices = np.sort(indices[np.argsort(-widths[indices])[:max_count]])
+    return indices
+
+
+def _get_roi_origin_factors(roi_origin: ROIOrigin) -> Tuple[float, float]:
+    try:
+        return _ROI_ORIGIN_FACTORS[ROIOrigin(roi_origin)]
+    except KeyError:
+        raise NotImplementedError()
@@ -0,0 +1,169 @@
+from typing import Any, Dict, Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+ROI_CHANGE_INSERT = "insert"
+ROI_CHANGE_DELETE = "delete"
+ROI_CHANGE_UPDATE = "update"
+
+ROIChange = Dict[str, Any]
+
+
+def diff_rois(
+    old_roi_names: Union[Sequence[str], np.ndarray],
+    old_boxes: np.ndarray,
+    new_roi_names: Union[Sequence[str], np.ndarray],
+    new_boxes: np.ndarray,
+) -> List[ROIChange]:
+    old_roi_names = np.asarray(old_roi_names, dtype=str)
+    new_roi_names = np.asarray(new_roi_names, dtype=str)
+    old_boxes = np.asarray(old_boxes, dtype=float).reshape(-1, 4)
+    new_boxes = np.asarray(new_boxes, dtype=float).reshape(-1, 4)
+    n_old, n_new = len(old_roi_names), len(new_roi_names)
+    n = min(n_old, n_new)
+    # unchanged rows at the beginning (prefix) and at the end (suffix)
+    prefix = _count_leading_true(
+        _equal_rois(old_roi_names[:n], old_boxes[:n], new_roi_names[:n], new_boxes[:n])
+    )
+    suffix = _count_leading_true(
+        _equal_rois(
+            old_roi_names[::-1][: n - prefix],
+            old_boxes[::-1][: n - prefix],
+            new_roi_names[::-1][: n - prefix],
+            new_boxes[::-1][: n - prefix],
+        )
+    )
+    old_stop, new_stop = n_old - suffix, n_new - suffix
+    m = min(old_stop, new_stop) - prefix
+    changes = []
+    updated = ~_equal_rois(
+        old_roi_names[prefix : prefix + m],
+        old_boxes[prefix : prefix + m],
+        new_roi_names[prefix : prefix + m],
+        new_boxes[prefix : prefix + m],
+    )
+    for index in prefix + np.flatnonzero(updated):
+        changes.append(
+            _create_change(ROI_CHANGE_UPDATE, index, new_roi_names, new_boxes)
+        )
+    for index in range(old_stop - 1, prefix + m - 1, -1):
+        changes.append({"op": ROI_CHANGE_DELETE, "index": index})
+    for index in range(prefix + m, new_stop):
+        changes.append(
+            _create_change(ROI_CHANGE_INSERT, index, new_roi_names, new_boxes)
+        )
+    return changes
+
+
+def apply_roi_changes(
+    roi_names: Union[Sequence[str], np.ndarray],
+    boxes: np.ndarray,
+    changes: Iterable[ROIChange],
+) -> Tuple[List[str], np.ndarray]:
+    roi_names = list(roi_names)
+    box_list = list(np.asarray(boxes, dtype=float).reshape(-1, 4))
+    for change in changes:
+        op, index = change["op"], int(change["index"])
+        if op == ROI_CHANGE_INSERT:
+            roi_names.insert(index, str(change["name"]))
+            box_list.insert(index, np.asarray(change["box"], dtype=float))
+        elif op == ROI_CHANGE_DELETE:
+            del roi_names[index]
+            del box_list[index]
+        elif op == ROI_CHANGE_UPDATE:
+            roi_names[index] = str(change["name"])
+            box_list[index] = np.asarray(change["box"], dtype=float)
+        else:
+            raise ValueError(f"Unsupported ROI change: {op}")
+    return roi_names, np.array(box_list, dtype=float).reshape(-1, 4)
+
+
+def match_rois_by_name(
+    old_roi_names: Union[Sequence[str], np.ndarray],
+    new_roi_names: Union[Sequence[str], np.ndarray],
+) -> np.ndarray:
+    # match the n-th occurrence of each name, such that duplicates are kept
+    old_df = pd.DataFrame({"name": np.asarray(old_roi_names, dtype=str)})
+    old_df["occurrence"] = old_df.groupby("name").cumcount()
+    new_df = pd.DataFrame({"name": np.asarray(new_roi_names, dtype=str)})
+    new_df["occurrence"] = new_df.groupby("name").cumcount()
+    new_df["new_index"] = np.arange(len(new_df.index))
+    df = pd.merge(old_df, new_df, how="left", on=["name", "occurrence"])
+    # index of the matching new ROI for each old ROI, -1 for deleted ROIs
+    return df["new_index"].fillna(-1).to_numpy(dtype=int)
+
+
+def diff_rois_by_name(
+    old_roi_names: Union[Sequence[str], np.ndarray],
+    old_boxes: np.ndarray,
+    new_roi_names: Union[Sequence[str], np.ndarray],
+    new_boxes: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    old_boxes = np.asarray(old_boxes, dtype=float).reshape(-1, 4)
+    new_boxes = np.asarray(new_boxes, dtype=float).reshape(-1, 4)
+    new_indices = match_rois_by_name(old_roi_names, new_roi_names)
+    matched_old_indices = np.flatnonzero(new_indices >= 0)
+    matched_new_indices = new_indices[matched_old_indices]
+    updated = ~np.all(
+        np.isclose(
+            old_boxes[matched_old_indices],
+            new_boxes[matched_new_indices],
+            rtol=1e-9,
+            atol=1e-9,
+        ),
+        axis=1,
+    )
+    return (
+        np.flatnonzero(new_indices < 0),
+        matched_old_indices[updated],
+        matched_new_indices[updated],
+        np.setdiff1d(np.arange(len(new_boxes)), matched_new_indices),
+    )
+
+
+def merge_rois(
+    old_roi_names: Union[Sequence[str], np.ndarray],
+    old_boxes: np.ndarray,
+    new_roi_names: Union[Sequence[str], np.ndarray],
+    new_boxes: np.ndarray,
+) -> Tuple[List[str], np.ndarray]:
+    old_roi_names = np.asarray(old_roi_names, dtype=str)
+    new_roi_names = np.asarray(new_roi_names, dtype=str)
+    boxes = np.array(old_boxes, dtype=float).reshape(-1, 4)
+    new_boxes = np.asarray(new_boxes, dtype=float).reshape(-1, 4)
+    # update the first ROI of each existing name, append all other ROIs
+    first_old_indices = pd.Series(np.arange(len(old_roi_names)), index=old_roi_names)
+    first_old_indices = first_old_indices[~first_old_indices.index.duplicated()]
+    old_indices = first_old_indices.index.get_indexer(new_roi_names)
+    updated = old_indices >= 0
+    boxes[first_old_indices.to_numpy()[old_indices[updated]]] = new_boxes[updated]
+    return (
+        old_roi_names.tolist() + new_roi_names[~updated].tolist(),
+        np.concatenate((boxes, new_boxes[~updated])),
+    )
+
+
+def _equal_rois(
+    roi_names_a: np.ndarray,
+    boxes_a: np.ndarray,
+    roi_names_b: np.ndarray,
+    boxes_b: np.ndarray,
+) -> np.ndarray:
+    return (roi_names_a == roi_names_b) & np.all(boxes_a == boxes_b, axis=1)
+
+
+def _count_leading_true(mask: np.ndarray) -> int:
+    false_indices = np.flatnonzero(~mask)
+    return int(false_indices[0]) if len(false_indices) > 0 else len(mask)
+
+
+def _create_change(
+    op: str, index: int, roi_names: np.ndarray, boxes: np.ndarray
+) -> ROIChange:
+    return {
+        "op": op,
+        "index": int(index),
+        "name": str(roi_names[index]),
+        "box": boxes[index].tolist(),
+    }
@@ -0,0 +1,79 @@
+from io import StringIO
+
+import pandas as pd
+
+from ._roi_file import (
+    ROI_FILE_COLUMNS,
+    ROI_FILE_HEIGHT_COLUMN,
+    ROI_FILE_METADATA_PREFIX,
+    ROI_FILE_NAME_COLUMN,
+    ROI_FILE_WIDTH_COLUMN,
+    ROI_FILE_X_COLUMN,
+    ROI_FILE_Y_COLUMN,
+    validate_roi_file,
+)
+
+# header names accepted for pasted ROI rows (case-insensitive), covering both ROI
+# file columns and ROI table columns
+ROI_TEXT_COLUMN_ALIASES = {
+    "name": ROI_FILE_NAME_COLUMN,
+    "x": ROI_FILE_X_COLUMN,
+    "y": ROI_FILE_Y_COLUMN,
+    "w": ROI_FILE_WIDTH_COLUMN,
+    "width": ROI_FILE_WIDTH_COLUMN,
+    "h": ROI_FILE_HEIGHT_COLUMN,
+    "height": ROI_FILE_HEIGHT_COLUMN,
+}
+
+
+def format_roi_text(df: pd.DataFrame) -> str:
+    return df.to_csv(sep="\t", index=False)
+
+
+def parse_roi_text(text: str) -> pd.DataFrame:
+    lines = text.lstrip("\r\n").splitlines(keepends=True)
+    if len(lines) > 0 and lines[0].startswith(ROI_FILE_METADATA_PREFIX):
+        lines = lines[1:]  # pasted from a CSV/TSV ROI file
+    if len(lines) == 0 or lines[0].strip() == "":
+        raise ValueError("No ROIs to paste")
+    sep = "\t" if "\t" in lines[0] else ","
+    header = pd.read_csv(StringIO(lines[0]), sep=sep, header=None, dtype=str)
+    header_columns = [
+        ROI_TEXT_COLUMN_ALIASES.get(str(c).strip().lower(), str(c).strip())
+        for c in header.iloc[0].fillna("")
+    ]
+    if set(ROI_FILE_COLUMNS).issubset(header_columns):
+        # named columns in any order, additional columns hold ROI attributes
+        if len(set(header_columns)) != len(header_columns):
+            raise ValueError("Duplicate columns in ROI text")
+        df = pd.read_csv(
+            StringIO("".join(lines[1:])),
+            sep=sep,
+            header=None,
+            names=header_columns,
+            converters={ROI_FILE_NAME_COLUMN: str},
+            skip_blank_lines=True,
+        )
+    elif len(header_columns) >= len(ROI_FILE_COLUMNS):
+        # unnamed columns in ROI table order, e.g. copied from a spreadsheet
+        df = pd.read_csv(
+            StringIO("".join(lines)),
+            sep=sep,
+            header=None,
+            names=ROI_FILE_COLUMNS,
+            usecols=range(len(ROI_FILE_COLUMNS)),
+            converters={0: str},
+            skip_blank_lines=True,
+        )
+    else:
+        raise ValueError(
+            f"Expected at least {len(ROI_FILE_COLUMNS)} columns "
+            f"({', '.join(ROI_FILE_COLUMNS)}), got {len(header_columns)}"
+        )
+    df[ROI_FILE_NAME_COLUMN] = df[ROI_FILE_NAME_COLUMN].fillna("").astype(str)
+    for column in ROI_FILE_COLUMNS[1:]:
+        df[column] = pd.to_numeric(df[column], errors="coerce")
+    problems = validate_roi_file(df)
+    if len(problems) > 0:
+        raise ValueError("Invalid ROI text: " + "; ".join(problems))
+    return df
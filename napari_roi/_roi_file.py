@@ -0,0 +1,239 @@
+import json
+from io import StringIO
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from ._roi import ROIOrigin
+from ._roi_boxes import boxes_to_xy, xywh_to_boxes
+
+ROI_FILE_NAME_COLUMN = "Name"
+ROI_FILE_X_COLUMN = "X"
+ROI_FILE_Y_COLUMN = "Y"
+ROI_FILE_WIDTH_COLUMN = "W"
+ROI_FILE_HEIGHT_COLUMN = "H"
+ROI_FILE_COLUMNS = (
+    ROI_FILE_NAME_COLUMN,
+    ROI_FILE_X_COLUMN,
+    ROI_FILE_Y_COLUMN,
+    ROI_FILE_WIDTH_COLUMN,
+    ROI_FILE_HEIGHT_COLUMN,
+)
+
+ROI_FILE_FORMATS = ("csv", "tsv", "json", "parquet")
+
+# napari-roi metadata (stored in DataFrame.attrs) is written to a leading comment
+# line for CSV/TSV files and to a top-level object for JSON files
+ROI_FILE_METADATA_PREFIX = "#napari-roi "
+ROI_FILE_METADATA_KEY = "napari-roi"
+ROI_FILE_ROIS_KEY = "rois"
+
+# ROIs in world coordinates record the data-to-world transform of their layer as a
+# 3x3 matrix in (Y, X) order, such that they can be mapped back to data coordinates
+ROI_FILE_COORDINATES_KEY = "coordinates"
+ROI_FILE_UNIT_KEY = "unit"
+ROI_FILE_TRANSFORM_KEY = "transform"
+ROI_FILE_WORLD_COORDINATES = "world"
+
+# content hash of ROI names, boxes and attributes, independent of the X/Y origin
+ROI_FILE_FINGERPRINT_KEY = "fingerprint"
+
+# additional columns hold ROI attributes, whose types are recorded by column name
+ROI_FILE_ATTRIBUTES_KEY = "attributes"
+ROI_ATTRIBUTE_TYPES = ("category", "float64", "int64")
+
+
+def read_roi_file(path: Union[str, PathLike]) -> pd.DataFrame:
+    path = Path(path)
+    roi_file_format = get_roi_file_format(path)
+    metadata: Dict[str, Any] = {}
+    if roi_file_format in ("csv", "tsv"):
+        with path.open("r", newline="") as f:
+            first_line = f.readline()
+            if first_line.startswith(ROI_FILE_METADATA_PREFIX):
+                metadata = json.loads(first_line[len(ROI_FILE_METADATA_PREFIX) :])
+            else:
+                f.seek(0)
+            df = pd.read_csv(
+                f,
+                sep="\t" if roi_file_format == "tsv" else ",",
+                converters={ROI_FILE_NAME_COLUMN: str},
+            )
+    elif roi_file_format == "json":
+        with path.open("r") as f:
+            content = json.load(f)
+        if isinstance(content, dict):
+            metadata = content.get(ROI_FILE_METADATA_KEY, {})
+            content = content.get(ROI_FILE_ROIS_KEY, [])
+        if len(content) == 0:
+            df = pd.DataFrame(columns=ROI_FILE_COLUMNS)
+        else:
+            df = pd.read_json(StringIO(json.dumps(content)), orient="records")
+    elif roi_file_format == "parquet":
+        try:
+            df = pd.read_parquet(path)  # restores DataFrame.attrs
+        except ImportError as e:
+            raise _create_parquet_import_error() from e
+        metadata = dict(df.attrs)
+    else:
+        raise NotImplementedError()
+    missing_columns = [c for c in ROI_FILE_COLUMNS if c not in df.columns]
+    if len(missing_columns) > 0:
+        raise ValueError(f"Missing columns {', '.join(missing_columns)}")
+    df[ROI_FILE_NAME_COLUMN] = df[ROI_FILE_NAME_COLUMN].fillna("").astype(str)
+    for column, attribute_type in metadata.get(ROI_FILE_ATTRIBUTES_KEY, {}).items():
+        if column in df.columns:
+            try:
+                df[column] = df[column].astype(attribute_type)
+            except (TypeError, ValueError):
+                pass  # e.g. missing integer values
+    df.attrs = metadata
+    return df
+
+
+def write_roi_file(df: pd.DataFrame, path: Union[str, PathLike]) -> None:
+    path = Path(path)
+    roi_file_format = get_roi_file_format(path)
+    if roi_file_format in ("csv", "tsv"):
+        with path.open("w", newline="") as f:
+            if len(df.attrs) > 0:
+                f.write(f"{ROI_FILE_METADATA_PREFIX}{json.dumps(df.attrs)}\n")
+            df.to_csv(f, sep="\t" if roi_file_format == "tsv" else ",", index=False)
+    elif roi_file_format == "json":
+        if len(df.attrs) > 0:
+            content = {
+                ROI_FILE_METADATA_KEY: df.attrs,
+                ROI_FILE_ROIS_KEY: json.loads(df.to_json(orient="records")),
+            }
+            with path.open("w") as f:
+                json.dump(content, f, indent=2)
+        else:
+            df.to_json(path, orient="records", indent=2)
+    elif roi_file_format == "parquet":
+        try:
+            df.to_parquet(path, index=False)
+        except ImportError as e:
+            raise _create_parquet_import_error() from e
+    else:
+        raise NotImplementedError()
+
+
+def get_roi_file_format(path: Union[str, PathLike]) -> str:
+    roi_file_format = Path(path).suffix.lower().lstrip(".")
+    if roi_file_format not in ROI_FILE_FORMATS:
+        raise ValueError(f"Unsupported ROI file format: {Path(path).suffix}")
+    return roi_file_format
+
+
+def roi_file_to_boxes(df: pd.DataFrame, roi_origin: ROIOrigin) -> np.ndarray:
+    return xywh_to_boxes(
+        df[ROI_FILE_X_COLUMN].to_numpy(dtype=float),
+        df[ROI_FILE_Y_COLUMN].to_numpy(dtype=float),
+        df[ROI_FILE_WIDTH_COLUMN].to_numpy(dtype=float),
+        df[ROI_FILE_HEIGHT_COLUMN].to_numpy(dtype=float),
+        roi_origin,
+    )
+
+
+def boxes_to_roi_file(
+    roi_names: np.ndarray,
+    boxes: np.ndarray,
+    roi_origin: ROIOrigin,
+    attributes: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    x, y = boxes_to_xy(boxes, roi_origin)
+    df = pd.DataFrame(
+        data={
+            ROI_FILE_NAME_COLUMN: np.asarray(roi_names, dtype=str),
+            ROI_FILE_X_COLUMN: x,
+            ROI_FILE_Y_COLUMN: y,
+            ROI_FILE_WIDTH_COLUMN: boxes[:, 3] - boxes[:, 1],
+            ROI_FILE_HEIGHT_COLUMN: boxes[:, 2] - boxes[:, 0],
+        }
+    )
+    if attributes is not None and len(attributes.columns) > 0:
+        df = pd.concat((df, attributes.reset_index(drop=True)), axis=1)
+        df.attrs[ROI_FILE_ATTRIBUTES_KEY] = get_roi_attribute_types(attributes)
+    return df
+
+
+def get_roi_file_attributes(df: pd.DataFrame) -> pd.DataFrame:
+    attributes = df[[c for c in df.columns if c not in ROI_FILE_COLUMNS]]
+    attributes = attributes.reset_index(drop=True)
+    for column in attributes.columns:
+        # store untyped text compactly, e.g. class labels
+        attribute_type = get_roi_attribute_type(attributes[column])
+        if str(attributes[column].dtype) != attribute_type:
+            attributes[column] = attributes[column].astype(attribute_type)
+    return attributes
+
+
+def get_roi_attribute_type(values: pd.Series) -> str:
+    if str(values.dtype) in ROI_ATTRIBUTE_TYPES:
+        return str(values.dtype)
+    if pd.api.types.is_numeric_dtype(values):
+        return "float64"
+    return "category"
+
+
+def get_roi_attribute_types(attributes: pd.DataFrame) -> Dict[str, str]:
+    return {str(column): str(dtype) for column, dtype in attributes.dtypes.items()}
+
+
+def get_roi_file_transform(metadata: Dict[str, Any]) -> Optional[np.ndarray]:
+    if (
+        metadata.get(ROI_FILE_COORDINATES_KEY) == ROI_FILE_WORLD_COORDINATES
+        and ROI_FILE_TRANSFORM_KEY in metadata
+    ):
+        return np.asarray(metadata[ROI_FILE_TRANSFORM_KEY], dtype=float).reshape(3, 3)
+    return None
+
+
+def convert_roi_file_origin(
+    df: pd.DataFrame, roi_origin: ROIOrigin, new_roi_origin: ROIOrigin
+) -> pd.DataFrame:
+    df = df.copy()
+    x, y = boxes_to_xy(roi_file_to_boxes(df, roi_origin), new_roi_origin)
+    df[ROI_FILE_X_COLUMN] = x
+    df[ROI_FILE_Y_COLUMN] = y
+    return df
+
+
+def validate_roi_file(df: pd.DataFrame) -> List[str]:
+    problems = []
+    names = df[ROI_FILE_NAME_COLUMN]
+    empty_names = names.isna() | (names.astype(str).str.strip() == "")
+    if empty_names.any():
+        problems.append(f"{int(empty_names.sum())} ROI(s) without name")
+    duplicated_names = names[~empty_names & names.duplicated(keep=False)]
+    if len(duplicated_names) > 0:
+        problems.append(
+            f"{len(duplicated_names)} ROI(s) with non-unique names, e.g. "
+            f"'{duplicated_names.iloc[0]}'"
+        )
+    for column in ROI_FILE_COLUMNS[1:]:
+        values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+        invalid_values = ~np.isfinite(values)
+        if invalid_values.any():
+            problems.append(
+                f"{int(invalid_values.sum())} ROI(s) with invalid {column} values"
+            )
+        if column in (ROI_FILE_WIDTH_COLUMN, ROI_FILE_HEIGHT_COLUMN):
+            non_positive_values = ~invalid_values & (values <= 0)
+            if non_positive_values.any():
+                problems.append(
+                    f"{int(non_positive_values.sum())} ROI(s) with non-positive "
+                    f"{column} values"
+                )
+    return problems
+
+
+def _create_parquet_import_error() -> ImportError:
+    return ImportError(
+        "Parquet ROI files require pyarrow or fastparquet, "
+        "e.g. pip install napari-roi[parquet]"
+    )
@@ -0,0 +1,126 @@
+import hashlib
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+
+class ROIFingerprint:
+    def __init__(self) -> None:
+        self._roi_names = np.empty(0, dtype=str)
+        self._boxes = np.empty((0, 4))
+        self._row_hashes = np.empty(0, dtype=np.uint64)
+        self._roi_fingerprint = compute_roi_fingerprint(self._roi_names, self._boxes)
+        self._fingerprint = self._roi_fingerprint
+
+    def update(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> str:
+        roi_names = np.asarray(roi_names, dtype=str)
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        if len(roi_names) != len(self._roi_names):
+            self._update_row_hashes(roi_names, boxes, hash_rois(roi_names, boxes))
+        else:
+            # only rehash changed ROIs
+            changed_mask = (roi_names != self._roi_names) | np.any(
+                boxes != self._boxes, axis=1
+            )
+            if changed_mask.any():
+                row_hashes = self._row_hashes.copy()
+                row_hashes[changed_mask] = hash_rois(
+                    roi_names[changed_mask], boxes[changed_mask]
+                )
+                self._update_row_hashes(roi_names, boxes, row_hashes)
+        self._fingerprint = self._roi_fingerprint
+        if attributes is not None and len(attributes.columns) > 0:
+            attribute_hashes = pd.util.hash_pandas_object(attributes, index=False)
+            self._fingerprint = _combine_row_hashes(
+                np.concatenate(
+                    (
+                        self._row_hashes,
+                        attribute_hashes.to_numpy(dtype=np.uint64),
+                        pd.util.hash_array(
+                            np.array(
+                                [f"{c}:{t}" for c, t in attributes.dtypes.items()],
+                                dtype=object,
+                            )
+                        ),
+                    )
+                )
+            )
+        return self._fingerprint
+
+    def _update_row_hashes(
+        self, roi_names: np.ndarray, boxes: np.ndarray, row_hashes: np.ndarray
+    ) -> None:
+        self._roi_names = roi_names
+        self._boxes = boxes.copy()
+        self._row_hashes = row_hashes
+        self._roi_fingerprint = _combine_row_hashes(row_hashes)
+
+    def restore(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        row_hashes: np.ndarray,
+    ) -> None:
+        # e.g. from a persistent cache, avoids rehashing unchanged ROIs
+        roi_names = np.asarray(roi_names, dtype=str)
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        row_hashes = np.asarray(row_hashes, dtype=np.uint64)
+        if not len(roi_names) == len(boxes) == len(row_hashes):
+            raise ValueError("Number of ROI names, boxes and hashes differ")
+        self._update_row_hashes(roi_names, boxes, row_hashes)
+        self._fingerprint = self._roi_fingerprint
+
+    @property
+    def fingerprint(self) -> str:
+        return self._fingerprint
+
+    @property
+    def roi_names(self) -> np.ndarray:
+        return self._roi_names
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes
+
+    @property
+    def row_hashes(self) -> np.ndarray:
+        return self._row_hashes
+
+
+def hash_rois(
+    roi_names: Union[Sequence[str], np.ndarray], boxes: np.ndarray
+) -> np.ndarray:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    row_hashes = pd.util.hash_pandas_object(
+        pd.DataFrame(
+            {
+                "name": pd.Series(np.asarray(roi_names, dtype=str), dtype=object),
+                "y_min": boxes[:, 0],
+                "x_min": boxes[:, 1],
+                "y_max": boxes[:, 2],
+                "x_max": boxes[:, 3],
+            }
+        ),
+        index=False,
+    )
+    return row_hashes.to_numpy(dtype=np.uint64)
+
+
+def compute_roi_fingerprint(
+    roi_names: Union[Sequence[str], np.ndarray],
+    boxes: np.ndarray,
+    attributes: Optional[pd.DataFrame] = None,
+) -> str:
+    if attributes is not None and len(attributes.columns) > 0:
+        return ROIFingerprint().update(roi_names, boxes, attributes=attributes)
+    return _combine_row_hashes(hash_rois(roi_names, boxes))
+
+
+def _combine_row_hashes(row_hashes: np.ndarray) -> str:
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).hexdigest()
@@ -0,0 +1,92 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
+DEFAULT_ROI_FIT_BATCH_SIZE = 64
+
+
+def compute_otsu_threshold(values: np.ndarray, bins: int = 256) -> float:
+    values = np.asarray(values, dtype=float).ravel()
+    values = values[np.isfinite(values)]
+    if len(values) == 0:
+        return np.nan
+    min_value, max_value = values.min(), values.max()
+    if min_value == max_value:
+        return float(min_value)
+    counts, edges = np.histogram(values, bins=bins, range=(min_value, max_value))
+    centers = (edges[:-1] + edges[1:]) / 2
+    # between-class variance for all candidate thresholds at once
+    weights0 = np.cumsum(counts)
+    weights1 = weights0[-1] - weights0
+    sums0 = np.cumsum(counts * centers)
+    means0 = sums0 / np.maximum(weights0, 1)
+    means1 = (sums0[-1] - sums0) / np.maximum(weights1, 1)
+    variances = (weights0 * weights1 * (means0 - means1) ** 2)[:-1]
+    # center of the plateau for well-separated classes, away from the noise tails
+    best_indices = np.flatnonzero(variances == variances.max())
+    return float(np.mean(centers[best_indices]))
+
+
+def fit_box(
+    image: np.ndarray,
+    box: np.ndarray,
+    threshold: Optional[float] = None,
+    rgb: bool = False,
+) -> np.ndarray:
+    box = np.asarray(box, dtype=float)
+    height, width = image.shape[-3:-1] if rgb else image.shape[-2:]
+    # napari centers pixels on integer coordinates
+    y_min, x_min, y_max, x_max = (
+        int(np.clip(np.ceil(value), 0, n))
+        for value, n in zip(box, (height, width, height, width))
+    )
+    if y_max <= y_min or x_max <= x_min:
+        return box
+    crop = np.asarray(image[y_min:y_max, x_min:x_max], dtype=float)
+    if rgb:
+        crop = crop[..., :3].mean(axis=-1)
+    if threshold is None:
+        threshold = compute_otsu_threshold(crop)
+    foreground = crop > threshold
+    rows = np.flatnonzero(foreground.any(axis=1))
+    cols = np.flatnonzero(foreground.any(axis=0))
+    if len(rows) == 0 or len(cols) == 0:
+        return box  # no foreground, keep the ROI as is
+    return np.array(
+        [
+            y_min + rows[0] - 0.5,
+            x_min + cols[0] - 0.5,
+            y_min + rows[-1] + 0.5,
+            x_min + cols[-1] + 0.5,
+        ]
+    )
+
+
+def fit_boxes(
+    image: np.ndarray,
+    boxes: np.ndarray,
+    threshold: Optional[float] = None,
+    rgb: bool = False,
+    batch_size: int = DEFAULT_ROI_FIT_BATCH_SIZE,
+    max_workers: Optional[int] = None,
+) -> np.ndarray:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    if len(boxes) == 0:
+        return boxes.copy()
+
+    def fit_batch(start: int) -> np.ndarray:
+        return np.array(
+            [
+                fit_box(image, box, threshold=threshold, rgb=rgb)
+                for box in boxes[start : start + batch_size]
+            ]
+        )
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    # crops are read and thresholded in parallel, e.g. from dask arrays
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        batches = executor.map(fit_batch, range(0, len(boxes), batch_size))
+        return np.concatenate(list(batches))
@@ -0,0 +1,64 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.ndimage import find_objects
+
+
+def create_grid_boxes(
+    extent: Sequence[float],
+    tile_width: float,
+    tile_height: float,
+    overlap: float = 0.0,
+    stride_x: Optional[float] = None,
+    stride_y: Optional[float] = None,
+    clip: bool = True,
+) -> np.ndarray:
+    y_min, x_min, y_max, x_max = (float(v) for v in extent)
+    if tile_width <= 0 or tile_height <= 0:
+        raise ValueError("Tile width and height must be positive")
+    if stride_x is None:
+        stride_x = tile_width - overlap
+    if stride_y is None:
+        stride_y = tile_height - overlap
+    if stride_x <= 0 or stride_y <= 0:
+        raise ValueError("Tile overlap must be smaller than the tile size")
+    y_starts = _create_tile_starts(y_min, y_max, tile_height, stride_y)
+    x_starts = _create_tile_starts(x_min, x_max, tile_width, stride_x)
+    yy, xx = np.meshgrid(y_starts, x_starts, indexing="ij")
+    boxes = np.column_stack(
+        (yy.ravel(), xx.ravel(), yy.ravel() + tile_height, xx.ravel() + tile_width)
+    )
+    if clip:
+        boxes[:, 2] = np.minimum(boxes[:, 2], y_max)
+        boxes[:, 3] = np.minimum(boxes[:, 3], x_max)
+    return boxes
+
+
+def create_label_boxes(labels: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    labels = np.asarray(labels)
+    if labels.ndim < 2:
+        raise ValueError("Labels must have at least two dimensions")
+    if not np.issubdtype(labels.dtype, np.integer):
+        labels = labels.astype(np.int64)
+    object_slices = find_objects(labels)
+    label_values = np.array(
+        [i + 1 for i, sl in enumerate(object_slices) if sl is not None],
+        dtype=np.int64,
+    )
+    bounds = np.array(
+        [
+            (sl[-2].start, sl[-1].start, sl[-2].stop, sl[-1].stop)
+            for sl in object_slices
+            if sl is not None
+        ],
+        dtype=float,
+    ).reshape(-1, 4)
+    # napari centers pixels on integer coordinates
+    return label_values, bounds - 0.5
+
+
+def _create_tile_starts(
+    start: float, stop: float, size: float, stride: float
+) -> np.ndarray:
+    num_tiles = max(int(np.ceil((stop - start - size) / stride)), 0) + 1
+    return start + stride * np.arange(num_tiles)
@@ -0,0 +1,124 @@
+import json
+import os
+import socket
+import tempfile
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ._roi_changes import ROIChange, apply_roi_changes
+
+DEFAULT_ROI_SERVER_NAME = "napari-roi"
+
+ROI_MESSAGE_SNAPSHOT = "snapshot"
+ROI_MESSAGE_CHANGES = "changes"
+ROI_MESSAGE_PUSH = "push"
+
+ROIMessage = Dict[str, Any]
+
+
+def get_roi_server_path(server_name: str) -> str:
+    # same resolution as QLocalServer for non-absolute server names on Unix
+    if os.path.isabs(server_name):
+        return server_name
+    return os.path.join(tempfile.gettempdir(), server_name)
+
+
+def encode_roi_message(message: ROIMessage) -> bytes:
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode_roi_message(line: bytes) -> ROIMessage:
+    message = json.loads(line.decode("utf-8"))
+    if not isinstance(message, dict) or "type" not in message:
+        raise ValueError("Invalid ROI message")
+    return message
+
+
+def create_snapshot_message(
+    roi_names: Union[Sequence[str], np.ndarray], boxes: np.ndarray
+) -> ROIMessage:
+    return {
+        "type": ROI_MESSAGE_SNAPSHOT,
+        "names": [str(roi_name) for roi_name in roi_names],
+        "boxes": np.asarray(boxes, dtype=float).reshape(-1, 4).tolist(),
+    }
+
+
+def create_changes_message(changes: List[ROIChange]) -> ROIMessage:
+    return {"type": ROI_MESSAGE_CHANGES, "changes": changes}
+
+
+def create_push_message(
+    roi_names: Union[Sequence[str], np.ndarray],
+    boxes: np.ndarray,
+    replace: bool = False,
+) -> ROIMessage:
+    return {
+        "type": ROI_MESSAGE_PUSH,
+        "names": [str(roi_name) for roi_name in roi_names],
+        "boxes": np.asarray(boxes, dtype=float).reshape(-1, 4).tolist(),
+        "replace": replace,
+    }
+
+
+class ROIClient:
+    def __init__(
+        self,
+        server_name: str = DEFAULT_ROI_SERVER_NAME,
+        timeout: Optional[float] = None,
+    ) -> None:
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.settimeout(timeout)
+        self._socket.connect(get_roi_server_path(server_name))
+        self._file = self._socket.makefile("rb")
+        self._roi_names: List[str] = []
+        self._boxes = np.empty((0, 4))
+
+    def __enter__(self) -> "ROIClient":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __iter__(self) -> Iterator[ROIMessage]:
+        while True:
+            message = self.receive()
+            if message is None:
+                break
+            yield message
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def receive(self) -> Optional[ROIMessage]:
+        line = self._file.readline()
+        if not line:
+            return None  # connection closed
+        message = decode_roi_message(line)
+        if message["type"] == ROI_MESSAGE_SNAPSHOT:
+            self._roi_names = list(message["names"])
+            self._boxes = np.asarray(message["boxes"], dtype=float).reshape(-1, 4)
+        elif message["type"] == ROI_MESSAGE_CHANGES:
+            self._roi_names, self._boxes = apply_roi_changes(
+                self._roi_names, self._boxes, message["changes"]
+            )
+        return message
+
+    def push(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        replace: bool = False,
+    ) -> None:
+        message = create_push_message(roi_names, boxes, replace=replace)
+        self._socket.sendall(encode_roi_message(message))
+
+    @property
+    def roi_names(self) -> List[str]:
+        return self._roi_names
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes
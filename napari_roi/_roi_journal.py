@@ -0,0 +1,215 @@
+import json
+import os
+import threading
+import uuid
+from os import PathLike
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ._roi import ROIOrigin
+from ._roi_changes import ROIChange, apply_roi_changes, diff_rois
+from ._roi_file import (
+    ROI_FILE_FINGERPRINT_KEY,
+    ROI_FILE_NAME_COLUMN,
+    boxes_to_roi_file,
+    get_roi_file_attributes,
+    read_roi_file,
+    roi_file_to_boxes,
+    write_roi_file,
+)
+from ._roi_fingerprint import compute_roi_fingerprint
+
+ROI_JOURNAL_ID_KEY = "journal_id"
+ROI_JOURNAL_SEQ_KEY = "journal_seq"
+
+# serializes snapshot writes from the main thread and from compaction workers
+_snapshot_lock = threading.Lock()
+
+
+def get_roi_journal_file(roi_file: Union[str, PathLike]) -> Path:
+    roi_file = Path(roi_file)
+    return roi_file.with_name(f"{roi_file.name}.journal")
+
+
+def read_roi_journal(
+    journal_file: Union[str, PathLike]
+) -> Tuple[Optional[str], List[ROIChange]]:
+    journal_id = None
+    changes = []
+    journal_file = Path(journal_file)
+    if journal_file.is_file():
+        with journal_file.open("r") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # incomplete last record, e.g. after a crash
+                if ROI_JOURNAL_ID_KEY in record:
+                    journal_id = record[ROI_JOURNAL_ID_KEY]
+                else:
+                    changes.append(record)
+    return journal_id, changes
+
+
+def load_roi_journal(
+    roi_file: Union[str, PathLike], roi_origin: ROIOrigin
+) -> Tuple[List[str], np.ndarray, Dict[str, Any], pd.DataFrame]:
+    df = read_roi_file(roi_file)
+    roi_names = df[ROI_FILE_NAME_COLUMN].tolist()
+    boxes = roi_file_to_boxes(df, roi_origin)
+    attributes = get_roi_file_attributes(df)
+    journal_id, changes = read_roi_journal(get_roi_journal_file(roi_file))
+    # only replay changes that are not yet part of the snapshot
+    if journal_id is not None and journal_id == df.attrs.get(ROI_JOURNAL_ID_KEY):
+        seq = df.attrs.get(ROI_JOURNAL_SEQ_KEY, 0)
+        changes = [change for change in changes if change["seq"] > seq]
+        if len(changes) > 0:
+            roi_names, boxes = apply_roi_changes(roi_names, boxes, changes)
+            # the journal does not record attributes, match them by ROI name
+            attributes.index = df[ROI_FILE_NAME_COLUMN]
+            attributes = attributes[~attributes.index.duplicated()]
+            attributes = attributes.reindex(roi_names).reset_index(drop=True)
+    return roi_names, boxes, df.attrs, attributes
+
+
+class ROIJournal:
+    DEFAULT_MAX_JOURNAL_SIZE = 1_000_000  # bytes
+
+    def __init__(
+        self,
+        roi_file: Union[str, PathLike],
+        max_journal_size: int = DEFAULT_MAX_JOURNAL_SIZE,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self._roi_file = Path(roi_file)
+        self._metadata = dict(metadata or {})
+        self._journal_file = get_roi_journal_file(roi_file)
+        self._max_journal_size = max_journal_size
+        self._journal_id = uuid.uuid4().hex
+        self._seq = 0
+        self._roi_names = np.empty(0, dtype=str)
+        self._boxes = np.empty((0, 4))
+        self._compacting = False
+
+    def reset(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        roi_origin: ROIOrigin,
+    ) -> None:
+        self._journal_id = uuid.uuid4().hex
+        self._seq = 0
+        self._roi_names = np.array(roi_names, dtype=str)
+        self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        with _snapshot_lock:
+            # write the snapshot first, such that an outdated journal is ignored
+            _write_snapshot(self.create_snapshot(roi_origin), self._roi_file)
+            _replace_file(self._journal_file, self._create_journal_header())
+
+    def record(
+        self, roi_names: Union[Sequence[str], np.ndarray], boxes: np.ndarray
+    ) -> int:
+        changes = diff_rois(self._roi_names, self._boxes, roi_names, boxes)
+        if len(changes) > 0:
+            lines = []
+            for change in changes:
+                self._seq += 1
+                lines.append(json.dumps({"seq": self._seq, **change}) + "\n")
+            with self._journal_file.open("a") as f:
+                f.writelines(lines)
+            self._roi_names = np.array(roi_names, dtype=str)
+            self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        return len(changes)
+
+    def create_snapshot(self, roi_origin: ROIOrigin) -> pd.DataFrame:
+        df = boxes_to_roi_file(self._roi_names, self._boxes, roi_origin)
+        df.attrs = {
+            **self._metadata,
+            ROI_FILE_FINGERPRINT_KEY: compute_roi_fingerprint(
+                self._roi_names, self._boxes
+            ),
+            ROI_JOURNAL_ID_KEY: self._journal_id,
+            ROI_JOURNAL_SEQ_KEY: self._seq,
+        }
+        return df
+
+    def start_compaction(self, roi_origin: ROIOrigin) -> pd.DataFrame:
+        self._compacting = True
+        return self.create_snapshot(roi_origin)
+
+    def finish_compaction(self, snapshot: pd.DataFrame) -> None:
+        self._compacting = False
+        journal_id, changes = read_roi_journal(self._journal_file)
+        if journal_id == self._journal_id == snapshot.attrs[ROI_JOURNAL_ID_KEY]:
+            seq = snapshot.attrs[ROI_JOURNAL_SEQ_KEY]
+            lines = [self._create_journal_header()] + [
+                json.dumps(change) + "\n" for change in changes if change["seq"] > seq
+            ]
+            _replace_file(self._journal_file, "".join(lines))
+
+    def abort_compaction(self) -> None:
+        self._compacting = False
+
+    def _create_journal_header(self) -> str:
+        return json.dumps({ROI_JOURNAL_ID_KEY: self._journal_id}) + "\n"
+
+    @property
+    def roi_file(self) -> Path:
+        return self._roi_file
+
+    @property
+    def journal_id(self) -> str:
+        return self._journal_id
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return self._metadata
+
+    @property
+    def journal_file(self) -> Path:
+        return self._journal_file
+
+    @property
+    def needs_compaction(self) -> bool:
+        return (
+            not self._compacting
+            and self._journal_file.is_file()
+            and self._journal_file.stat().st_size > self._max_journal_size
+        )
+
+
+def write_roi_journal_snapshot(
+    snapshot: pd.DataFrame, roi_file: Union[str, PathLike]
+) -> pd.DataFrame:
+    with _snapshot_lock:
+        # skip outdated snapshots, e.g. if the journal was reset in the meantime
+        journal_id = _read_roi_journal_id(get_roi_journal_file(roi_file))
+        if journal_id == snapshot.attrs[ROI_JOURNAL_ID_KEY]:
+            _write_snapshot(snapshot, Path(roi_file))
+    return snapshot
+
+
+def _read_roi_journal_id(journal_file: Path) -> Optional[str]:
+    if journal_file.is_file():
+        with journal_file.open("r") as f:
+            try:
+                return json.loads(f.readline()).get(ROI_JOURNAL_ID_KEY)
+            except json.JSONDecodeError:
+                pass
+    return None
+
+
+def _write_snapshot(snapshot: pd.DataFrame, roi_file: Path) -> None:
+    tmp_roi_file = roi_file.with_name(f".{roi_file.stem}.tmp{roi_file.suffix}")
+    write_roi_file(snapshot, tmp_roi_file)
+    os.replace(tmp_roi_file, roi_file)
+
+
+def _replace_file(path: Path, content: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with tmp_path.open("w") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
@@ -0,0 +1,197 @@
+from typing import Iterator, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix, csr_matrix
+
+OVERLAP_METRICS = ("iou", "overlap")
+
+_MAX_CANDIDATES_PER_CHUNK = 1_000_000
+_MAX_CELLS_PER_BOX = 64
+
+
+def find_overlapping_boxes(
+    boxes_a: np.ndarray, boxes_b: Optional[np.ndarray] = None
+) -> pd.DataFrame:
+    boxes_a = np.asarray(boxes_a, dtype=float).reshape(-1, 4)
+    self_overlap = boxes_b is None
+    if boxes_b is None:
+        boxes_b = boxes_a
+    boxes_b = np.asarray(boxes_b, dtype=float).reshape(-1, 4)
+    index_a, index_b = _find_intersecting_pairs(boxes_a, boxes_b)
+    if self_overlap:
+        mask = index_a < index_b
+        index_a, index_b = index_a[mask], index_b[mask]
+    a = boxes_a[index_a]
+    b = boxes_b[index_b]
+    intersection = (np.minimum(a[:, 2], b[:, 2]) - np.maximum(a[:, 0], b[:, 0])) * (
+        np.minimum(a[:, 3], b[:, 3]) - np.maximum(a[:, 1], b[:, 1])
+    )
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a + area_b - intersection
+    min_area = np.minimum(area_a, area_b)
+    df = pd.DataFrame(
+        data={
+            "index_a": index_a,
+            "index_b": index_b,
+            "intersection": intersection,
+            "iou": np.divide(
+                intersection, union, out=np.zeros_like(union), where=union > 0
+            ),
+            "overlap": np.divide(
+                intersection,
+                min_area,
+                out=np.zeros_like(min_area),
+                where=min_area > 0,
+            ),
+        }
+    )
+    return df.sort_values(["index_a", "index_b"], ignore_index=True)
+
+
+def compute_iou_matrix(
+    boxes_a: np.ndarray, boxes_b: Optional[np.ndarray] = None
+) -> csr_matrix:
+    n_a = len(np.asarray(boxes_a).reshape(-1, 4))
+    n_b = n_a if boxes_b is None else len(np.asarray(boxes_b).reshape(-1, 4))
+    df = find_overlapping_boxes(boxes_a, boxes_b=boxes_b)
+    return coo_matrix(
+        (df["iou"].to_numpy(), (df["index_a"].to_numpy(), df["index_b"].to_numpy())),
+        shape=(n_a, n_b),
+    ).tocsr()
+
+
+def find_duplicate_boxes(
+    boxes: np.ndarray, threshold: float = 0.5, metric: str = "iou"
+) -> np.ndarray:
+    if metric not in OVERLAP_METRICS:
+        raise ValueError(f"Unsupported overlap metric: {metric}")
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    df = find_overlapping_boxes(boxes)
+    df = df[df[metric] >= threshold]
+    graph = coo_matrix(
+        (np.ones(len(df)), (df["index_a"].to_numpy(), df["index_b"].to_numpy())),
+        shape=(len(boxes), len(boxes)),
+    ).tocsr()
+    # greedily keep boxes in order, removing only boxes matching a kept box
+    duplicate_mask = np.zeros(len(boxes), dtype=bool)
+    for index in np.unique(df["index_a"].to_numpy()):
+        if not duplicate_mask[index]:
+            start, stop = graph.indptr[index], graph.indptr[index + 1]
+            duplicate_mask[graph.indices[start:stop]] = True
+    return duplicate_mask
+
+
+def _find_intersecting_pairs(
+    boxes_a: np.ndarray, boxes_b: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    index_a_parts = [np.empty(0, dtype=np.intp)]
+    index_b_parts = [np.empty(0, dtype=np.intp)]
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return index_a_parts[0], index_b_parts[0]
+    # uniform grid spatial index with cells of roughly twice the typical box size
+    box_sizes = np.concatenate(
+        (boxes_a[:, 2:] - boxes_a[:, :2], boxes_b[:, 2:] - boxes_b[:, :2])
+    )
+    cell_size = max(2.0 * float(np.median(box_sizes)), 1e-12)
+    grid_origin = np.minimum(boxes_a[:, :2].min(axis=0), boxes_b[:, :2].min(axis=0))
+    grid_stop = np.maximum(boxes_a[:, 2:].max(axis=0), boxes_b[:, 2:].max(axis=0))
+    num_grid_cols = int((grid_stop[1] - grid_origin[1]) // cell_size) + 1
+    first_cells_a, num_cells_a = _get_cell_ranges(boxes_a, grid_origin, cell_size)
+    first_cells_b, num_cells_b = _get_cell_ranges(boxes_b, grid_origin, cell_size)
+    # boxes spanning many cells are compared against all boxes instead
+    large_a = np.prod(num_cells_a, axis=1) > _MAX_CELLS_PER_BOX
+    large_b = np.prod(num_cells_b, axis=1) > _MAX_CELLS_PER_BOX
+    for index_a in np.flatnonzero(large_a):
+        index_b = np.flatnonzero(_intersects(boxes_a[index_a], boxes_b))
+        index_a_parts.append(np.full(len(index_b), index_a))
+        index_b_parts.append(index_b)
+    for index_b in np.flatnonzero(large_b):
+        index_a = np.flatnonzero(_intersects(boxes_b[index_b], boxes_a) & ~large_a)
+        index_a_parts.append(index_a)
+        index_b_parts.append(np.full(len(index_a), index_b))
+    cells_a, cell_indices_a = _create_cells(
+        first_cells_a, num_cells_a, np.flatnonzero(~large_a)
+    )
+    cells_b, cell_indices_b = _create_cells(
+        first_cells_b, num_cells_b, np.flatnonzero(~large_b)
+    )
+    cell_ids_a = cells_a[:, 0] * num_grid_cols + cells_a[:, 1]
+    cell_ids_b = cells_b[:, 0] * num_grid_cols + cells_b[:, 1]
+    order_b = np.argsort(cell_ids_b, kind="stable")
+    sorted_cell_ids_b = cell_ids_b[order_b]
+    starts = np.searchsorted(sorted_cell_ids_b, cell_ids_a, side="left")
+    stops = np.searchsorted(sorted_cell_ids_b, cell_ids_a, side="right")
+    for entry_a, sorted_entry_b in _expand_ranges(starts, stops):
+        index_a = cell_indices_a[entry_a]
+        index_b = cell_indices_b[order_b[sorted_entry_b]]
+        a = boxes_a[index_a]
+        b = boxes_b[index_b]
+        mask = _intersects(a, b)
+        # report each pair only from the cell containing its intersection's corner
+        reference_cells = (
+            (np.maximum(a[:, :2], b[:, :2]) - grid_origin) // cell_size
+        ).astype(np.int64)
+        mask &= np.all(reference_cells == cells_a[entry_a], axis=1)
+        index_a_parts.append(index_a[mask])
+        index_b_parts.append(index_b[mask])
+    return np.concatenate(index_a_parts), np.concatenate(index_b_parts)
+
+
+def _intersects(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    return (
+        (b[..., 0] < a[..., 2])
+        & (b[..., 2] > a[..., 0])
+        & (b[..., 1] < a[..., 3])
+        & (b[..., 3] > a[..., 1])
+    )
+
+
+def _get_cell_ranges(
+    boxes: np.ndarray, grid_origin: np.ndarray, cell_size: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    first_cells = ((boxes[:, :2] - grid_origin) // cell_size).astype(np.int64)
+    last_cells = ((boxes[:, 2:] - grid_origin) // cell_size).astype(np.int64)
+    return first_cells, last_cells - first_cells + 1
+
+
+def _create_cells(
+    first_cells: np.ndarray, num_cells: np.ndarray, indices: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    counts = num_cells[indices, 0] * num_cells[indices, 1]
+    cell_indices = np.repeat(indices, counts)
+    local_indices = np.arange(int(counts.sum())) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    local_num_cols = np.repeat(num_cells[indices, 1], counts)
+    cells = np.repeat(first_cells[indices], counts, axis=0)
+    cells[:, 0] += local_indices // local_num_cols
+    cells[:, 1] += local_indices % local_num_cols
+    return cells, cell_indices
+
+
+def _expand_ranges(
+    starts: np.ndarray, stops: np.ndarray
+) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    counts = np.maximum(stops - starts, 0)
+    cumulative_counts = np.cumsum(counts)
+    chunk_start = 0
+    while chunk_start < len(counts):
+        offset = cumulative_counts[chunk_start] - counts[chunk_start]
+        chunk_stop = int(
+            np.searchsorted(
+                cumulative_counts, offset + _MAX_CANDIDATES_PER_CHUNK, side="right"
+            )
+        )
+        chunk_stop = max(chunk_stop, chunk_start + 1)
+        chunk_counts = counts[chunk_start:chunk_stop]
+        index_a = np.repeat(np.arange(chunk_start, chunk_stop), chunk_counts)
+        chunk_offsets = np.cumsum(chunk_counts) - chunk_counts
+        index_b = (
+            np.arange(int(chunk_counts.sum()))
+            - np.repeat(chunk_offsets, chunk_counts)
+            + np.repeat(starts[chunk_start:chunk_stop], chunk_counts)
+        )
+        yield index_a, index_b
+        chunk_start = chunk_stop
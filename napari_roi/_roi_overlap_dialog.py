@@ -0,0 +1,127 @@
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+import pandas as pd
+from napari.layers import Shapes
+from qtpy.QtWidgets import (
+    QComboBox,
+    QDialog,
+    QDoubleSpinBox,
+    QFormLayout,
+    QHBoxLayout,
+    QPushButton,
+    QTableView,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ._roi_overlap import OVERLAP_METRICS
+from .qt.utils import DataFrameTableModel
+
+if TYPE_CHECKING:
+    from ._roi_widget import ROIWidget
+
+
+class ROIOverlapDialog(QDialog):
+    CURRENT_LAYER_TEXT = "(current layer)"
+
+    def __init__(self, roi_widget: "ROIWidget", parent: Optional[QWidget] = None):
+        super(ROIOverlapDialog, self).__init__(parent=parent)
+        self._roi_widget = roi_widget
+        self._matches = pd.DataFrame()
+
+        self.setWindowTitle("ROI overlaps")
+        self.setMinimumSize(500, 400)
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        form_layout = QFormLayout()
+        self._other_layer_combo_box = QComboBox(parent=self)
+        self._other_layer_combo_box.addItem(self.CURRENT_LAYER_TEXT)
+        self._other_layer_combo_box.addItems(
+            [
+                layer.name
+                for layer in roi_widget.viewer.layers
+                if isinstance(layer, Shapes) and layer is not roi_widget.roi_layer
+            ]
+        )
+        self._other_layer_combo_box.currentTextChanged.connect(
+            self._on_other_layer_combo_box_current_text_changed
+        )
+        form_layout.addRow("Compare with:", self._other_layer_combo_box)
+        self._metric_combo_box = QComboBox(parent=self)
+        self._metric_combo_box.addItems(OVERLAP_METRICS)
+        form_layout.addRow("Metric:", self._metric_combo_box)
+        self._threshold_double_spin_box = QDoubleSpinBox(parent=self)
+        self._threshold_double_spin_box.setRange(0.0, 1.0)
+        self._threshold_double_spin_box.setSingleStep(0.05)
+        self._threshold_double_spin_box.setValue(0.5)
+        form_layout.addRow("Threshold:", self._threshold_double_spin_box)
+        self._find_push_button = QPushButton("Find", parent=self)
+        self._find_push_button.clicked.connect(self._on_find_push_button_clicked)
+        form_layout.addRow(self._find_push_button)
+        layout.addLayout(form_layout)
+
+        self._matches_table_model = DataFrameTableModel(parent=self)
+        self._matches_table_view = QTableView(parent=self)
+        self._matches_table_view.setModel(self._matches_table_model)
+        layout.addWidget(self._matches_table_view)
+
+        buttons_layout = QHBoxLayout()
+        self._select_push_button = QPushButton("Select", parent=self)
+        self._select_push_button.clicked.connect(self._on_select_push_button_clicked)
+        buttons_layout.addWidget(self._select_push_button)
+        self._remove_duplicates_push_button = QPushButton(
+            "Remove duplicates", parent=self
+        )
+        self._remove_duplicates_push_button.clicked.connect(
+            self._on_remove_duplicates_push_button_clicked
+        )
+        buttons_layout.addWidget(self._remove_duplicates_push_button)
+        layout.addLayout(buttons_layout)
+
+        self._refresh_buttons()
+
+    def _on_other_layer_combo_box_current_text_changed(self, text: str) -> None:
+        self._matches = pd.DataFrame()
+        self._matches_table_model.dataframe = self._matches
+        self._refresh_buttons()
+
+    def _on_find_push_button_clicked(self, checked: bool) -> None:
+        metric = self._metric_combo_box.currentText()
+        matches = self._roi_widget.find_overlapping_rois(
+            other_roi_layer=self._get_other_roi_layer()
+        )
+        self._matches = matches[
+            matches[metric] >= self._threshold_double_spin_box.value()
+        ].reset_index(drop=True)
+        self._matches_table_model.dataframe = self._matches[
+            ["name_a", "name_b", "iou", "overlap"]
+        ]
+        self._refresh_buttons()
+
+    def _on_select_push_button_clicked(self, checked: bool) -> None:
+        indices = self._matches["index_a"].to_numpy()
+        if self._get_other_roi_layer() is None:
+            indices = np.union1d(indices, self._matches["index_b"].to_numpy())
+        self._roi_widget.select_rois(indices)
+
+    def _on_remove_duplicates_push_button_clicked(self, checked: bool) -> None:
+        self._roi_widget.remove_duplicate_rois(
+            threshold=self._threshold_double_spin_box.value(),
+            metric=self._metric_combo_box.currentText(),
+        )
+        self._on_find_push_button_clicked(False)
+
+    def _get_other_roi_layer(self) -> Optional[Shapes]:
+        layer_name = self._other_layer_combo_box.currentText()
+        if layer_name == self.CURRENT_LAYER_TEXT:
+            return None
+        return self._roi_widget.viewer.layers[layer_name]
+
+    def _refresh_buttons(self) -> None:
+        has_matches = len(self._matches.index) > 0
+        self._select_push_button.setEnabled(has_matches)
+        self._remove_duplicates_push_button.setEnabled(
+            has_matches and self._get_other_roi_layer() is None
+        )
@@ -0,0 +1,57 @@
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from ._roi import ROIOrigin
+from ._roi_boxes import boxes_to_xy
+
+ROI_QUERY_COLUMNS = ("name", "x", "y", "width", "height", "area")
+
+
+def create_roi_query_frame(
+    roi_names: Union[Sequence[str], np.ndarray],
+    boxes: np.ndarray,
+    roi_origin: ROIOrigin,
+    attributes: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    x, y = boxes_to_xy(boxes, roi_origin)
+    width = boxes[:, 3] - boxes[:, 1]
+    height = boxes[:, 2] - boxes[:, 0]
+    df = pd.DataFrame(
+        {
+            "name": pd.Series(np.asarray(roi_names, dtype=str), dtype=object),
+            "x": x,
+            "y": y,
+            "width": width,
+            "height": height,
+            "area": width * height,
+        }
+    )
+    if attributes is not None:
+        attribute_names = [c for c in attributes.columns if c not in df.columns]
+        if len(attribute_names) > 0:
+            df = pd.concat(
+                (df, attributes[attribute_names].reset_index(drop=True)), axis=1
+            )
+    return df
+
+
+def query_rois(df: pd.DataFrame, expression: str) -> np.ndarray:
+    if expression.strip() == "":
+        return np.arange(len(df))
+    try:
+        try:
+            mask = df.eval(expression)
+        except NotImplementedError:
+            # string methods are not supported by numexpr
+            mask = df.eval(expression, engine="python")
+    except Exception as e:
+        raise ValueError(f"Invalid ROI query '{expression}': {e}")
+    if np.ndim(mask) == 0:
+        mask = np.full(len(df), mask)
+    mask = np.asarray(mask)
+    if mask.dtype != bool or mask.shape != (len(df),):
+        raise ValueError(f"ROI query '{expression}' does not evaluate to a condition")
+    return np.flatnonzero(mask)
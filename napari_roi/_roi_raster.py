@@ -0,0 +1,258 @@
+import os
+import shutil
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from os import PathLike
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+ROI_RASTER_FORMATS = ("zarr", "tif", "tiff")
+DEFAULT_ROI_RASTER_TILE_SHAPE = (1024, 1024)
+
+TileSlices = Tuple[slice, slice]
+
+
+def rasterize_boxes(
+    boxes: np.ndarray,
+    shape: Sequence[int],
+    labels: Optional[np.ndarray] = None,
+    offset: Sequence[int] = (0, 0),
+    dtype: Optional[np.dtype] = None,
+) -> np.ndarray:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    if labels is None:
+        labels = np.arange(1, len(boxes) + 1)
+    labels = np.asarray(labels)
+    if dtype is None:
+        dtype = get_roi_raster_dtype(labels)
+    raster = np.zeros(tuple(shape), dtype=dtype)
+    # napari centers pixels on integer coordinates
+    pixel_boxes = _get_pixel_boxes(boxes, shape, offset)
+    for (y_min, x_min, y_max, x_max), label in zip(pixel_boxes, labels):
+        raster[y_min:y_max, x_min:x_max] = label  # later ROIs take precedence
+    return raster
+
+
+def index_boxes_by_tile(
+    boxes: np.ndarray, shape: Sequence[int], tile_shape: Sequence[int]
+) -> Dict[Tuple[int, int], np.ndarray]:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    pixel_boxes = _get_pixel_boxes(boxes, shape, (0, 0))
+    valid_mask = (pixel_boxes[:, 2] > pixel_boxes[:, 0]) & (
+        pixel_boxes[:, 3] > pixel_boxes[:, 1]
+    )
+    indices = np.flatnonzero(valid_mask)
+    pixel_boxes = pixel_boxes[valid_mask]
+    tile_h, tile_w = tile_shape
+    ty_min = pixel_boxes[:, 0] // tile_h
+    tx_min = pixel_boxes[:, 1] // tile_w
+    ty_count = (pixel_boxes[:, 2] - 1) // tile_h - ty_min + 1
+    tx_count = (pixel_boxes[:, 3] - 1) // tile_w - tx_min + 1
+    # one entry per (ROI, intersecting tile) pair
+    counts = ty_count * tx_count
+    roi_indices = np.repeat(indices, counts)
+    offsets = np.arange(len(roi_indices)) - np.repeat(
+        np.cumsum(counts) - counts, counts
+    )
+    ty = np.repeat(ty_min, counts) + offsets // np.repeat(tx_count, counts)
+    tx = np.repeat(tx_min, counts) + offsets % np.repeat(tx_count, counts)
+    n_tiles_x = -(-shape[1] // tile_w)
+    tile_ids = ty * n_tiles_x + tx
+    order = np.argsort(tile_ids, kind="stable")  # keep ROI order within tiles
+    tile_ids, roi_indices = tile_ids[order], roi_indices[order]
+    unique_tile_ids, starts = np.unique(tile_ids, return_index=True)
+    return {
+        (int(tile_id // n_tiles_x), int(tile_id % n_tiles_x)): tile_roi_indices
+        for tile_id, tile_roi_indices in zip(
+            unique_tile_ids, np.split(roi_indices, starts[1:])
+        )
+    }
+
+
+def iter_roi_raster_tiles(
+    boxes: np.ndarray,
+    shape: Sequence[int],
+    labels: Optional[np.ndarray] = None,
+    tile_shape: Sequence[int] = DEFAULT_ROI_RASTER_TILE_SHAPE,
+    dtype: Optional[np.dtype] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Tuple[TileSlices, np.ndarray]]:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    if labels is None:
+        labels = np.arange(1, len(boxes) + 1)
+    tile_labels = np.asarray(labels)
+    if len(tile_labels) != len(boxes):
+        raise ValueError("Number of labels and boxes differ")
+    if dtype is None:
+        dtype = get_roi_raster_dtype(tile_labels)
+    tile_index = index_boxes_by_tile(boxes, shape, tile_shape)
+    empty_indices = np.empty(0, dtype=int)
+
+    def rasterize_tile(ty: int, tx: int) -> np.ndarray:
+        y_slice, x_slice = get_roi_raster_tile_slices(shape, tile_shape, ty, tx)
+        indices = tile_index.get((ty, tx), empty_indices)
+        return rasterize_boxes(
+            boxes[indices],
+            (y_slice.stop - y_slice.start, x_slice.stop - x_slice.start),
+            labels=tile_labels[indices],
+            offset=(y_slice.start, x_slice.start),
+            dtype=dtype,
+        )
+
+    if max_workers is None:
+        max_workers = min(32, (os.cpu_count() or 1) + 4)
+    n_tiles_y, n_tiles_x = get_roi_raster_tile_counts(shape, tile_shape)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # bound the number of pending tiles to limit memory usage
+        max_pending = 2 * max_workers
+        pending: Deque[Tuple[TileSlices, Future]] = deque()
+        for ty in range(n_tiles_y):
+            for tx in range(n_tiles_x):
+                if len(pending) >= max_pending:
+                    tile_slices, future = pending.popleft()
+                    yield tile_slices, future.result()
+                pending.append(
+                    (
+                        get_roi_raster_tile_slices(shape, tile_shape, ty, tx),
+                        executor.submit(rasterize_tile, ty, tx),
+                    )
+                )
+        while len(pending) > 0:
+            tile_slices, future = pending.popleft()
+            yield tile_slices, future.result()
+
+
+def write_roi_raster(
+    path: Union[str, PathLike],
+    boxes: np.ndarray,
+    shape: Sequence[int],
+    labels: Optional[np.ndarray] = None,
+    tile_shape: Sequence[int] = DEFAULT_ROI_RASTER_TILE_SHAPE,
+    max_workers: Optional[int] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> None:
+    path = Path(path)
+    roi_raster_format = get_roi_raster_format(path)
+    shape = (int(shape[0]), int(shape[1]))
+    tile_shape = (int(tile_shape[0]), int(tile_shape[1]))
+    if labels is None:
+        labels = np.arange(1, len(boxes) + 1)
+    dtype = get_roi_raster_dtype(labels)
+    n_tiles_y, n_tiles_x = get_roi_raster_tile_counts(shape, tile_shape)
+    n_tiles = n_tiles_y * n_tiles_x
+    tiles = iter_roi_raster_tiles(
+        boxes,
+        shape,
+        labels=labels,
+        tile_shape=tile_shape,
+        dtype=dtype,
+        max_workers=max_workers,
+    )
+    if roi_raster_format in ("tif", "tiff") and (
+        tile_shape[0] % 16 != 0 or tile_shape[1] % 16 != 0
+    ):
+        raise ValueError("TIFF tile sizes must be multiples of 16")
+    try:
+        if roi_raster_format == "zarr":
+            try:
+                import zarr
+            except ImportError as e:
+                raise _create_import_error("Zarr", "zarr") from e
+
+            z = zarr.open_array(
+                store=str(path), mode="w", shape=shape, chunks=tile_shape, dtype=dtype
+            )
+            for i, ((y_slice, x_slice), tile) in enumerate(tiles):
+                z[y_slice, x_slice] = tile
+                if progress_callback is not None:
+                    progress_callback(i + 1, n_tiles)
+        elif roi_raster_format in ("tif", "tiff"):
+            try:
+                import tifffile
+            except ImportError as e:
+                raise _create_import_error("TIFF", "tifffile", extra="tiff") from e
+
+            def iter_padded_tiles() -> Iterator[np.ndarray]:
+                for i, (_, tile) in enumerate(tiles):
+                    padded_tile = np.zeros(tile_shape, dtype=dtype)
+                    padded_tile[: tile.shape[0], : tile.shape[1]] = tile
+                    if progress_callback is not None:
+                        progress_callback(i + 1, n_tiles)
+                    yield padded_tile
+
+            tifffile.imwrite(
+                path,
+                data=iter_padded_tiles(),
+                shape=shape,
+                dtype=dtype,
+                tile=tile_shape,
+                bigtiff=True,
+                compression="zlib",
+            )
+        else:
+            raise NotImplementedError()
+    except InterruptedError:
+        # canceled, do not leave a partially written raster behind
+        _remove_roi_raster(path)
+        raise
+
+
+def get_roi_raster_format(path: Union[str, PathLike]) -> str:
+    roi_raster_format = Path(path).suffix.lower().lstrip(".")
+    if roi_raster_format not in ROI_RASTER_FORMATS:
+        raise ValueError(f"Unsupported ROI raster format: {Path(path).suffix}")
+    return roi_raster_format
+
+
+def get_roi_raster_dtype(labels: np.ndarray) -> np.dtype:
+    max_label = int(np.max(labels, initial=0))
+    for dtype_name in ("uint8", "uint16", "uint32"):
+        dtype = np.dtype(dtype_name)
+        if max_label <= np.iinfo(dtype).max:
+            return dtype
+    return np.dtype(np.uint64)
+
+
+def get_roi_raster_tile_counts(
+    shape: Sequence[int], tile_shape: Sequence[int]
+) -> Tuple[int, int]:
+    return -(-int(shape[0]) // tile_shape[0]), -(-int(shape[1]) // tile_shape[1])
+
+
+def get_roi_raster_tile_slices(
+    shape: Sequence[int], tile_shape: Sequence[int], ty: int, tx: int
+) -> TileSlices:
+    y_start, x_start = ty * tile_shape[0], tx * tile_shape[1]
+    return (
+        slice(y_start, min(y_start + tile_shape[0], int(shape[0]))),
+        slice(x_start, min(x_start + tile_shape[1], int(shape[1]))),
+    )
+
+
+def _get_pixel_boxes(
+    boxes: np.ndarray, shape: Sequence[int], offset: Sequence[int]
+) -> np.ndarray:
+    # first and last (exclusive) pixel whose center lies within each box
+    pixel_boxes = np.ceil(boxes).astype(np.int64)
+    pixel_boxes -= np.array([offset[0], offset[1], offset[0], offset[1]])
+    pixel_boxes[:, [0, 2]] = np.clip(pixel_boxes[:, [0, 2]], 0, int(shape[0]))
+    pixel_boxes[:, [1, 3]] = np.clip(pixel_boxes[:, [1, 3]], 0, int(shape[1]))
+    return pixel_boxes
+
+
+def _remove_roi_raster(path: Path) -> None:
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+    elif path.exists():
+        path.unlink()
+
+
+def _create_import_error(
+    format_name: str, package: str, extra: Optional[str] = None
+) -> ImportError:
+    return ImportError(
+        f"{format_name} ROI rasters require {package}, "
+        f"e.g. pip install napari-roi[{extra or package}]"
+    )
@@ -0,0 +1,98 @@
+import re
+from string import Formatter
+from typing import Any, Dict, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+ROI_NAME_TEMPLATE_FIELDS = ("name", "index")
+
+
+def format_roi_names(
+    roi_names: Union[Sequence[str], np.ndarray],
+    template: str,
+    start: int = 1,
+    **fields: Any,
+) -> np.ndarray:
+    roi_name_column = pd.Series(np.asarray(roi_names, dtype=str), dtype=object)
+    indices = pd.Series(np.arange(start, start + len(roi_name_column)))
+    new_roi_names = pd.Series("", index=roi_name_column.index, dtype=object)
+    for literal_text, field_name, format_spec, conversion in Formatter().parse(
+        template
+    ):
+        new_roi_names += literal_text
+        if field_name is None:
+            continue
+        if conversion is not None:
+            raise ValueError(f"Unsupported conversion in ROI name template: {template}")
+        if field_name in fields:
+            new_roi_names += format(fields[field_name], format_spec or "")
+        elif field_name == "name":
+            new_roi_names += _format_column(roi_name_column, format_spec or "")
+        elif field_name == "index":
+            new_roi_names += _format_column(indices, format_spec or "")
+        else:
+            raise ValueError(f"Unknown field in ROI name template: {field_name}")
+    return new_roi_names.to_numpy(dtype=str)
+
+
+def replace_roi_names(
+    roi_names: Union[Sequence[str], np.ndarray], pattern: str, replacement: str
+) -> np.ndarray:
+    try:
+        regex = re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regular expression: {e}")
+    roi_name_column = pd.Series(np.asarray(roi_names, dtype=str), dtype=object)
+    return roi_name_column.str.replace(regex, replacement, regex=True).to_numpy(
+        dtype=str
+    )
+
+
+def deduplicate_roi_names(
+    roi_names: Union[Sequence[str], np.ndarray],
+    existing_roi_names: Union[Sequence[str], np.ndarray] = (),
+) -> np.ndarray:
+    # numbers conflicting names like new ROIs, e.g. "ROI" -> "ROI (2)"
+    taken_roi_names = set(np.asarray(existing_roi_names, dtype=str).tolist())
+    next_roi_numbers: Dict[str, int] = {}
+    new_roi_names = []
+    for roi_name in np.asarray(roi_names, dtype=str).tolist():
+        if roi_name in taken_roi_names:
+            roi_number = next_roi_numbers.get(roi_name, 2)
+            while f"{roi_name} ({roi_number})" in taken_roi_names:
+                roi_number += 1
+            next_roi_numbers[roi_name] = roi_number + 1
+            roi_name = f"{roi_name} ({roi_number})"
+        taken_roi_names.add(roi_name)
+        new_roi_names.append(roi_name)
+    return np.asarray(new_roi_names, dtype=str).reshape(-1)
+
+
+def check_roi_names(
+    roi_names: Union[Sequence[str], np.ndarray],
+    other_roi_names: Union[Sequence[str], np.ndarray] = (),
+) -> None:
+    # other (e.g. untouched) ROI names may contain duplicates themselves
+    roi_name_column = pd.Series(np.asarray(roi_names, dtype=str), dtype=object)
+    empty_roi_names = roi_name_column.str.strip() == ""
+    if empty_roi_names.any():
+        raise ValueError(f"{int(empty_roi_names.sum())} ROI name(s) would be empty")
+    duplicated_roi_names = roi_name_column[
+        roi_name_column.duplicated()
+        | roi_name_column.isin(np.asarray(other_roi_names, dtype=str).tolist())
+    ]
+    if len(duplicated_roi_names) > 0:
+        raise ValueError(
+            f"{len(duplicated_roi_names)} ROI name(s) would not be unique, e.g. "
+            f"'{duplicated_roi_names.iloc[0]}'"
+        )
+
+
+def _format_column(column: pd.Series, format_spec: str) -> pd.Series:
+    if format_spec == "":
+        return column.astype(str)
+    zero_padding = re.fullmatch(r"0(\d+)d", format_spec)
+    if zero_padding is not None and column.dtype.kind == "i" and (column >= 0).all():
+        return column.astype(str).str.zfill(int(zero_padding.group(1)))
+    return column.map(lambda value: format(value, format_spec))
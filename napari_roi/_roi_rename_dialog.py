@@ -0,0 +1,102 @@
+from typing import TYPE_CHECKING, Optional
+
+from qtpy.QtWidgets import (
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLineEdit,
+    QMessageBox,
+    QSpinBox,
+    QVBoxLayout,
+    QWidget,
+)
+
+from ._roi_rename import ROI_NAME_TEMPLATE_FIELDS
+
+if TYPE_CHECKING:
+    from ._roi_widget import ROIWidget
+
+
+class ROIRenameDialog(QDialog):
+    TEMPLATE_MODE_TEXT = "Template"
+    PATTERN_MODE_TEXT = "Regular expression"
+
+    def __init__(self, roi_widget: "ROIWidget", parent: Optional[QWidget] = None):
+        super(ROIRenameDialog, self).__init__(parent=parent)
+        self._roi_widget = roi_widget
+
+        self.setWindowTitle("Rename ROIs")
+        self.setMinimumWidth(400)
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        form_layout = QFormLayout()
+        self._mode_combo_box = QComboBox(parent=self)
+        self._mode_combo_box.addItems((self.TEMPLATE_MODE_TEXT, self.PATTERN_MODE_TEXT))
+        self._mode_combo_box.currentTextChanged.connect(
+            self._on_mode_combo_box_current_text_changed
+        )
+        form_layout.addRow("Mode:", self._mode_combo_box)
+        self._template_line_edit = QLineEdit("{name}", parent=self)
+        self._template_line_edit.setToolTip(
+            "Python format string with the fields "
+            + ", ".join(f"{{{field}}}" for field in ROI_NAME_TEMPLATE_FIELDS)
+            + ", e.g. tile_{index:04d}"
+        )
+        form_layout.addRow("Template:", self._template_line_edit)
+        self._start_spin_box = QSpinBox(parent=self)
+        self._start_spin_box.setRange(0, 2**31 - 1)
+        self._start_spin_box.setValue(1)
+        form_layout.addRow("First index:", self._start_spin_box)
+        self._pattern_line_edit = QLineEdit(parent=self)
+        form_layout.addRow("Pattern:", self._pattern_line_edit)
+        self._replacement_line_edit = QLineEdit(parent=self)
+        self._replacement_line_edit.setToolTip(r"Use \1, \2, ... for groups")
+        form_layout.addRow("Replacement:", self._replacement_line_edit)
+        self._selected_only_check_box = QCheckBox("Selected ROIs only", parent=self)
+        selected_count = len(roi_widget.selected_roi_indices)
+        self._selected_only_check_box.setEnabled(selected_count > 0)
+        self._selected_only_check_box.setChecked(selected_count > 0)
+        form_layout.addRow(self._selected_only_check_box)
+        layout.addLayout(form_layout)
+
+        button_box = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel,
+            parent=self,
+        )
+        button_box.accepted.connect(self._on_button_box_accepted)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+
+        self._on_mode_combo_box_current_text_changed(self._mode_combo_box.currentText())
+
+    def _on_mode_combo_box_current_text_changed(self, text: str) -> None:
+        template_mode = text == self.TEMPLATE_MODE_TEXT
+        self._template_line_edit.setEnabled(template_mode)
+        self._start_spin_box.setEnabled(template_mode)
+        self._pattern_line_edit.setEnabled(not template_mode)
+        self._replacement_line_edit.setEnabled(not template_mode)
+
+    def _on_button_box_accepted(self) -> None:
+        indices = None
+        if self._selected_only_check_box.isChecked():
+            indices = self._roi_widget.selected_roi_indices
+        try:
+            if self._mode_combo_box.currentText() == self.TEMPLATE_MODE_TEXT:
+                self._roi_widget.rename_rois(
+                    template=self._template_line_edit.text(),
+                    indices=indices,
+                    start=self._start_spin_box.value(),
+                )
+            else:
+                self._roi_widget.rename_rois(
+                    pattern=self._pattern_line_edit.text(),
+                    replacement=self._replacement_line_edit.text(),
+                    indices=indices,
+                )
+        except ValueError as e:
+            QMessageBox.warning(self, "Rename ROIs", str(e))
+        else:
+            self.accept()
@@ -0,0 +1,33 @@
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+class StaleROISnapshotError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class ROISnapshot:
+    version: int
+    roi_names: np.ndarray
+    boxes: np.ndarray  # data coordinates
+    vertices: Optional[Tuple[np.ndarray, ...]] = None  # data coordinates
+
+    def __post_init__(self) -> None:
+        # arrays are shared with the snapshot owner and must not be modified
+        self.roi_names.flags.writeable = False
+        self.boxes.flags.writeable = False
+        for vertices in self.vertices or ():
+            vertices.flags.writeable = False
+
+    def __len__(self) -> int:
+        return len(self.roi_names)
+
+    def check_version(self, version: int) -> None:
+        if version != self.version:
+            raise StaleROISnapshotError(
+                f"ROIs have changed since the snapshot was taken "
+                f"(version {self.version}, now {version})"
+            )
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import zipfile
+from dataclasses import dataclass
+from os import PathLike
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+
+from ._roi import ROIOrigin
+from ._roi_journal import get_roi_journal_file
+
+# incremented whenever the cache layout changes, invalidating existing caches
+ROI_STATE_CACHE_VERSION = 2
+
+
+@dataclass(frozen=True)
+class ROIStateCache:
+    roi_names: np.ndarray
+    rectangles: np.ndarray  # data coordinates, as inserted into the Shapes layer
+    fingerprint_boxes: np.ndarray  # ROI coordinates, as hashed by ROIFingerprint
+    fingerprint_row_hashes: np.ndarray
+
+
+def get_roi_state_cache_file(roi_file: Union[str, PathLike]) -> Path:
+    roi_file = Path(roi_file)
+    return roi_file.with_name(f"{roi_file.name}.cache")
+
+
+def get_roi_state_cache_key(
+    roi_file: Union[str, PathLike], roi_origin: ROIOrigin
+) -> np.ndarray:
+    # the cache is valid as long as the ROI file and its journal are unchanged and
+    # the ROI origin, which determines the derived boxes, is the same
+    key = [ROI_STATE_CACHE_VERSION, str(roi_origin)]
+    for path in (Path(roi_file), get_roi_journal_file(roi_file)):
+        try:
+            stat = path.stat()
+            key += [stat.st_mtime_ns, stat.st_size]
+        except OSError:
+            key += [-1, -1]
+    return np.array([str(k) for k in key])
+
+
+def write_roi_state_cache(
+    roi_file: Union[str, PathLike],
+    roi_origin: ROIOrigin,
+    roi_names: Union[Sequence[str], np.ndarray],
+    rectangles: np.ndarray,
+    fingerprint_boxes: np.ndarray,
+    fingerprint_row_hashes: np.ndarray,
+) -> None:
+    arrays = {
+        "roi_names": np.asarray(roi_names, dtype=str),
+        "rectangles": np.asarray(rectangles, dtype=float).reshape(-1, 4, 2),
+        "fingerprint_boxes": np.asarray(fingerprint_boxes, dtype=float),
+        "fingerprint_row_hashes": np.asarray(fingerprint_row_hashes, dtype=np.uint64),
+    }
+    if not len(set(len(a) for a in arrays.values())) == 1:
+        raise ValueError("Number of ROI names, rectangles and hashes differ")
+    cache_file = get_roi_state_cache_file(roi_file)
+    tmp_cache_file = cache_file.with_name(f".{cache_file.name}.tmp")
+    with tmp_cache_file.open("wb") as f:
+        np.savez(
+            f,
+            key=get_roi_state_cache_key(roi_file, roi_origin),
+            content_hash=np.array(_hash_arrays(arrays)),
+            **arrays,
+        )
+    os.replace(tmp_cache_file, cache_file)
+
+
+def read_roi_state_cache(
+    roi_file: Union[str, PathLike], roi_origin: ROIOrigin
+) -> Optional[ROIStateCache]:
+    cache_file = get_roi_state_cache_file(roi_file)
+    if not cache_file.is_file():
+        return None
+    try:
+        with np.load(cache_file, allow_pickle=False) as npz:
+            key = get_roi_state_cache_key(roi_file, roi_origin)
+            if not np.array_equal(npz["key"], key):
+                return None  # outdated
+            arrays = {
+                name: npz[name]
+                for name in (
+                    "roi_names",
+                    "rectangles",
+                    "fingerprint_boxes",
+                    "fingerprint_row_hashes",
+                )
+            }
+            if str(npz["content_hash"]) != _hash_arrays(arrays):
+                return None  # corrupted
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+    return ROIStateCache(**arrays)
+
+
+def _hash_arrays(arrays: Dict[str, np.ndarray]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for name, array in arrays.items():
+        h.update(name.encode())
+        h.update(f"{array.dtype}{array.shape}".encode())
+        h.update(np.ascontiguousarray(array).tobytes())
+    return h.hexdigest()
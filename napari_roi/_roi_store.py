@@ -0,0 +1,163 @@
+from typing import Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from ._roi import ROIOrigin
+from ._roi_file import (
+    ROI_FILE_NAME_COLUMN,
+    boxes_to_roi_file,
+    get_roi_file_attributes,
+    roi_file_to_boxes,
+)
+from ._roi_query import create_roi_query_frame, query_rois
+
+
+class ROIStore:
+    def __init__(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray] = (),
+        boxes: Optional[np.ndarray] = None,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        self._roi_names = np.asarray(roi_names, dtype=object).ravel()
+        if boxes is None:
+            boxes = np.empty((0, 4))
+        self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        if len(self._roi_names) != len(self._boxes):
+            raise ValueError("Number of ROI names and boxes differ")
+        if attributes is None:
+            attributes = pd.DataFrame(index=pd.RangeIndex(len(self._boxes)))
+        if len(attributes) != len(self._boxes):
+            raise ValueError("Number of ROI names and attributes differ")
+        self._attributes = attributes.reset_index(drop=True)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, roi_origin: ROIOrigin) -> "ROIStore":
+        return cls(
+            df[ROI_FILE_NAME_COLUMN].astype(str).to_numpy(),
+            roi_file_to_boxes(df, roi_origin),
+            attributes=get_roi_file_attributes(df),
+        )
+
+    def __len__(self) -> int:
+        return len(self._boxes)
+
+    def to_dataframe(self, roi_origin: ROIOrigin) -> pd.DataFrame:
+        return boxes_to_roi_file(
+            self._roi_names, self._boxes, roi_origin, attributes=self._attributes
+        )
+
+    def find(self, extent: Sequence[float]) -> np.ndarray:
+        y_min, x_min, y_max, x_max = extent
+        return np.flatnonzero(
+            (self._boxes[:, 0] < y_max)
+            & (self._boxes[:, 1] < x_max)
+            & (self._boxes[:, 2] > y_min)
+            & (self._boxes[:, 3] > x_min)
+        )
+
+    def append(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> np.ndarray:
+        roi_names = np.asarray(roi_names, dtype=object).ravel()
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        if len(roi_names) != len(boxes):
+            raise ValueError("Number of ROI names and boxes differ")
+        if attributes is None:
+            attributes = _create_default_attributes(self._attributes, len(boxes))
+        if len(attributes) != len(boxes):
+            raise ValueError("Number of ROI names and attributes differ")
+        n = len(self._boxes)
+        self._roi_names = np.concatenate((self._roi_names, roi_names))
+        self._boxes = np.concatenate((self._boxes, boxes))
+        self._attributes = pd.concat(
+            (self._attributes, attributes.reset_index(drop=True)), ignore_index=True
+        )
+        return np.arange(n, len(self._boxes))
+
+    def update(
+        self,
+        indices: Iterable[int],
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+    ) -> None:
+        indices = np.asarray(list(indices), dtype=int)
+        self._roi_names[indices] = np.asarray(roi_names, dtype=object).ravel()
+        self._boxes[indices] = np.asarray(boxes, dtype=float).reshape(-1, 4)
+
+    def reset(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        if attributes is None:
+            attributes = _create_default_attributes(
+                self._attributes, len(np.asarray(roi_names, dtype=object).ravel())
+            )
+        roi_store = ROIStore(roi_names, boxes, attributes=attributes)
+        self._roi_names = roi_store.roi_names
+        self._boxes = roi_store.boxes
+        self._attributes = roi_store.attributes
+
+    def delete(self, indices: Iterable[int]) -> None:
+        keep_mask = np.ones(len(self._boxes), dtype=bool)
+        keep_mask[np.asarray(list(indices), dtype=int)] = False
+        self._roi_names = self._roi_names[keep_mask]
+        self._boxes = self._boxes[keep_mask]
+        self._attributes = self._attributes.iloc[keep_mask].reset_index(drop=True)
+
+    def query(self, expression: str, roi_origin: ROIOrigin) -> np.ndarray:
+        df = create_roi_query_frame(
+            self._roi_names, self._boxes, roi_origin, attributes=self._attributes
+        )
+        return query_rois(df, expression)  # raises ValueError
+
+    @property
+    def roi_names(self) -> np.ndarray:
+        return self._roi_names
+
+    @property
+    def boxes(self) -> np.ndarray:
+        return self._boxes
+
+    @property
+    def attributes(self) -> pd.DataFrame:
+        return self._attributes
+
+
+def _create_default_attributes(attributes: pd.DataFrame, n: int) -> pd.DataFrame:
+    # same defaults as for new ROI attributes in the Shapes layer
+    default_attributes = pd.DataFrame(index=pd.RangeIndex(n))
+    for column, dtype in attributes.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            default_attributes[column] = pd.Categorical(
+                [None] * n, categories=dtype.categories
+            )
+        else:
+            default = np.nan if pd.api.types.is_float_dtype(dtype) else 0
+            default_attributes[column] = np.full(n, default, dtype=dtype)
+    return default_attributes
+
+
+def compute_roi_density(
+    boxes: np.ndarray, max_size: int = 1024
+) -> Tuple[np.ndarray, Tuple[float, float], Tuple[float, float]]:
+    boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+    if len(boxes) == 0:
+        return np.zeros((1, 1)), (1.0, 1.0), (0.0, 0.0)
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2.0
+    origin = centers.min(axis=0)
+    pixel_size = float((centers.max(axis=0) - origin).max()) / max_size or 1.0
+    pixels = ((centers - origin) / pixel_size).astype(int)
+    shape = pixels.max(axis=0) + 1
+    density = np.bincount(
+        np.ravel_multi_index(pixels.T, shape), minlength=int(np.prod(shape))
+    ).reshape(shape)
+    # density pixels are centered on their bins
+    translate = origin + pixel_size / 2.0
+    return density, (pixel_size, pixel_size), (translate[0], translate[1])
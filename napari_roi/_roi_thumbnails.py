@@ -0,0 +1,77 @@
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def select_thumbnail_level(
+    level_shapes: Sequence[Sequence[int]], box: Sequence[float], size: int
+) -> int:
+    box_height, box_width = box[2] - box[0], box[3] - box[1]
+    base_height, base_width = level_shapes[0][-2:]
+    # lowest resolution at which the ROI still covers the thumbnail size
+    for level in reversed(range(1, len(level_shapes))):
+        level_height, level_width = level_shapes[level][-2:]
+        if (
+            max(
+                box_height * level_height / base_height,
+                box_width * level_width / base_width,
+            )
+            >= size
+        ):
+            return level
+    return 0
+
+
+def crop_thumbnail(
+    levels: Sequence[np.ndarray],
+    box: Sequence[float],
+    size: int,
+    contrast_limits: Optional[Tuple[float, float]] = None,
+    leading_index: Tuple[int, ...] = (),
+    rgb: bool = False,
+) -> np.ndarray:
+    spatial_axes = slice(-3, -1) if rgb else slice(-2, None)
+    level_shapes = [level.shape[spatial_axes] for level in levels]
+    level = select_thumbnail_level(level_shapes, box, size)
+    scale_y = level_shapes[level][0] / level_shapes[0][0]
+    scale_x = level_shapes[level][1] / level_shapes[0][1]
+    # napari centers pixels on integer coordinates
+    y_min, x_min, y_max, x_max = (
+        int(np.clip(np.ceil(value), 0, n))
+        for value, n in (
+            (box[0] * scale_y, level_shapes[level][0]),
+            (box[1] * scale_x, level_shapes[level][1]),
+            (box[2] * scale_y, level_shapes[level][0]),
+            (box[3] * scale_x, level_shapes[level][1]),
+        )
+    )
+    height, width = y_max - y_min, x_max - x_min
+    thumbnail_shape = (size, size, 3) if rgb else (size, size)
+    thumbnail = np.zeros(thumbnail_shape, dtype=np.uint8)
+    if height == 0 or width == 0:
+        return thumbnail
+    # strided reads limit the amount of data read for large crops
+    factor = size / max(height, width)
+    out_height = max(1, round(height * factor))
+    out_width = max(1, round(width * factor))
+    step_y = max(1, height // out_height)
+    step_x = max(1, width // out_width)
+    crop = np.asarray(
+        levels[level][
+            leading_index + (slice(y_min, y_max, step_y), slice(x_min, x_max, step_x))
+        ]
+    )
+    # nearest-neighbor sampling of the strided crop
+    rows = np.arange(out_height) * crop.shape[0] // out_height
+    cols = np.arange(out_width) * crop.shape[1] // out_width
+    crop = crop[rows][:, cols]
+    if contrast_limits is not None:
+        low, high = contrast_limits
+        crop = (crop.astype(float) - low) / ((high - low) or 1.0)
+        crop = (np.clip(crop, 0.0, 1.0) * 255).astype(np.uint8)
+    else:
+        crop = crop.astype(np.uint8)
+    y_offset = (size - out_height) // 2
+    x_offset = (size - out_width) // 2
+    thumbnail[y_offset : y_offset + out_height, x_offset : x_offset + out_width] = crop
+    return thumbnail
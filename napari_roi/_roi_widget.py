@@ -1,13 +1,32 @@
-import re
+import json
+from contextlib import contextmanager
 from pathlib import Path
-from typing import TYPE_CHECKING, MutableSequence, Optional, Sequence
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    MutableSequence,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
 
+import numpy as np
 import pandas as pd
-from napari.layers import Shapes
+from napari.layers import Image, Labels, Layer, Shapes
+from napari.qt.threading import create_worker
 from napari.utils.events import Event
 from napari.viewer import Viewer
-from qtpy.QtCore import QEvent, QItemSelection, QObject, QPoint, QSignalBlocker, Qt
+from qtpy.QtCore import QEvent, QModelIndex, QObject, QPoint, QSignalBlocker, QSize, Qt
+from qtpy.QtGui import QKeySequence
 from qtpy.QtWidgets import (
+    QApplication,
     QCheckBox,
     QComboBox,
     QDockWidget,
@@ -15,19 +34,75 @@ from qtpy.QtWidgets import (
     QFileDialog,
     QFormLayout,
     QGridLayout,
+    QHBoxLayout,
     QHeaderView,
+    QInputDialog,
     QLineEdit,
+    QListView,
     QMenu,
     QMessageBox,
+    QProgressDialog,
     QPushButton,
+    QShortcut,
+    QSplitter,
     QStyle,
     QTableView,
     QWidget,
 )
 
 from ._roi import ROI, ROIBase, ROIOrigin
-from .qt import ROILayerAccessor, ROITableModel
-from .qt.utils import MutableItemModelSequenceWrapper
+from ._roi_boxes import (
+    boxes_to_rectangles,
+    is_axis_aligned,
+    transform_boxes,
+    transform_points,
+)
+from ._roi_changes import diff_rois_by_name, match_rois_by_name, merge_rois
+from ._roi_clipboard import format_roi_text, parse_roi_text
+from ._roi_file import (
+    ROI_FILE_FINGERPRINT_KEY,
+    ROI_FILE_NAME_COLUMN,
+    get_roi_file_attributes,
+    get_roi_file_transform,
+    read_roi_file,
+    roi_file_to_boxes,
+    write_roi_file,
+)
+from ._roi_fingerprint import ROIFingerprint
+from ._roi_fit import fit_boxes
+from ._roi_generators import create_grid_boxes, create_label_boxes
+from ._roi_journal import (
+    ROI_JOURNAL_ID_KEY,
+    ROIJournal,
+    load_roi_journal,
+    write_roi_journal_snapshot,
+)
+from ._roi_overlap import find_duplicate_boxes, find_overlapping_boxes
+from ._roi_overlap_dialog import ROIOverlapDialog
+from ._roi_query import ROI_QUERY_COLUMNS
+from ._roi_raster import DEFAULT_ROI_RASTER_TILE_SHAPE, write_roi_raster
+from ._roi_rename import (
+    check_roi_names,
+    deduplicate_roi_names,
+    format_roi_names,
+    replace_roi_names,
+)
+from ._roi_rename_dialog import ROIRenameDialog
+from ._roi_snapshot import ROISnapshot, StaleROISnapshotError
+from ._roi_state_cache import read_roi_state_cache, write_roi_state_cache
+from ._roi_store import ROIStore
+from .qt import (
+    ROIFileWatcher,
+    ROIGalleryModel,
+    ROILabelLOD,
+    ROILayerAccessor,
+    ROILayerManager,
+    ROIOverview,
+    ROISelectionSynchronizer,
+    ROIServer,
+    ROITableModel,
+)
+from .qt.utils import MutableItemModelSequenceWrapper, get_layer_data_to_world_matrix
 
 if TYPE_CHECKING:
     from vispy.app.canvas import MouseEvent
@@ -43,8 +118,19 @@ class ROIWidget(QWidget):
 
         self._viewer = napari_viewer
         self._roi_layer: Optional[Shapes] = None
+        self._roi_layer_manager = ROILayerManager()
         self._roi_layer_accessor: Optional[ROILayerAccessor] = None
         self._roi_table_model: Optional[ROITableModel] = None
+        self._roi_selection_synchronizer: Optional[ROISelectionSynchronizer] = None
+        self._roi_journal: Optional[ROIJournal] = None
+        self._roi_file_watcher: Optional[ROIFileWatcher] = None
+        self._roi_server: Optional[ROIServer] = None
+        self._roi_label_lods: Dict[int, ROILabelLOD] = {}  # by id(roi_layer)
+        self._roi_overviews: Dict[int, ROIOverview] = {}  # by id(roi_layer)
+        self._roi_fingerprints: Dict[int, ROIFingerprint] = {}  # by id(roi_layer)
+        self._saved_roi_file_states: Dict[
+            int, Tuple[str, str, str, str, Optional[int]]
+        ] = {}  # by id(roi_layer)
 
         self.setMinimumHeight(200)
         self.setLayout(QGridLayout())
@@ -75,6 +161,26 @@ class ROIWidget(QWidget):
         self._add_roi_push_button = QPushButton("Add ROI", parent=self._add_widget)
         self._add_roi_push_button.clicked.connect(self._on_add_roi_push_button_clicked)
         add_widget_layout.addRow(self._add_roi_push_button)
+        self._roi_grid_overlap_double_spin_box = QDoubleSpinBox(parent=self._add_widget)
+        self._roi_grid_overlap_double_spin_box.setRange(0.0, float("inf"))
+        self._roi_grid_overlap_double_spin_box.valueChanged.connect(
+            self._on_roi_grid_overlap_double_spin_box_value_changed
+        )
+        add_widget_layout.addRow("Overlap:", self._roi_grid_overlap_double_spin_box)
+        self._add_roi_grid_push_button = QPushButton(
+            "Add ROI grid", parent=self._add_widget
+        )
+        self._add_roi_grid_push_button.clicked.connect(
+            self._on_add_roi_grid_push_button_clicked
+        )
+        add_widget_layout.addRow(self._add_roi_grid_push_button)
+        self._add_label_rois_push_button = QPushButton(
+            "Add ROIs from labels", parent=self._add_widget
+        )
+        self._add_label_rois_push_button.clicked.connect(
+            self._on_add_label_rois_push_button_clicked
+        )
+        add_widget_layout.addRow(self._add_label_rois_push_button)
 
         self._roi_table_widget = QWidget(parent=self)
         roi_table_widget_layout = QFormLayout()
@@ -92,7 +198,34 @@ class ROIWidget(QWidget):
         self._roi_table_view.customContextMenuRequested.connect(
             self._on_roi_table_view_context_menu_requested
         )
-        roi_table_widget_layout.addRow(self._roi_table_view)
+        for key_sequence, slot in (
+            (QKeySequence.StandardKey.Copy, self._copy_selected_rois),
+            (QKeySequence.StandardKey.Paste, self._paste_rois_from_clipboard),
+        ):
+            shortcut = QShortcut(QKeySequence(key_sequence), self._roi_table_view)
+            shortcut.setContext(Qt.ShortcutContext.WidgetShortcut)
+            shortcut.activated.connect(slot)
+        self._roi_gallery_model = ROIGalleryModel(self._viewer, parent=self)
+        self._roi_gallery_view = QListView(parent=self._roi_table_widget)
+        self._roi_gallery_view.setViewMode(QListView.ViewMode.IconMode)
+        self._roi_gallery_view.setResizeMode(QListView.ResizeMode.Adjust)
+        self._roi_gallery_view.setMovement(QListView.Movement.Static)
+        self._roi_gallery_view.setUniformItemSizes(True)
+        self._roi_gallery_view.setIconSize(
+            QSize(
+                self._roi_gallery_model.thumbnail_size,
+                self._roi_gallery_model.thumbnail_size,
+            )
+        )
+        self._roi_gallery_view.setModel(self._roi_gallery_model)
+        self._roi_gallery_view.clicked.connect(self._on_roi_gallery_view_clicked)
+        self._roi_gallery_view.setVisible(False)
+        roi_table_splitter = QSplitter(
+            Qt.Orientation.Horizontal, parent=self._roi_table_widget
+        )
+        roi_table_splitter.addWidget(self._roi_table_view)
+        roi_table_splitter.addWidget(self._roi_gallery_view)
+        roi_table_widget_layout.addRow(roi_table_splitter)
         self._roi_origin_combo_box = QComboBox(parent=self._roi_table_widget)
         self._roi_origin_combo_box.setFixedWidth(200)
         self._roi_origin_combo_box.addItems(
@@ -108,6 +241,107 @@ class ROIWidget(QWidget):
             self._on_roi_origin_combo_box_current_text_changed
         )
         roi_table_widget_layout.addRow("X/Y origin:", self._roi_origin_combo_box)
+        self._label_lod_widget = QWidget(parent=self._roi_table_widget)
+        label_lod_widget_layout = QHBoxLayout()
+        label_lod_widget_layout.setContentsMargins(0, 0, 0, 0)
+        self._label_lod_widget.setLayout(label_lod_widget_layout)
+        self._label_lod_check_box = QCheckBox(
+            "Level of detail", parent=self._label_lod_widget
+        )
+        self._label_lod_check_box.setToolTip(
+            "Only show labels of visible ROIs with a minimum on-screen width"
+        )
+        self._label_lod_check_box.stateChanged.connect(
+            self._on_label_lod_check_box_state_changed
+        )
+        label_lod_widget_layout.addWidget(self._label_lod_check_box)
+        self._min_label_size_double_spin_box = QDoubleSpinBox(
+            parent=self._label_lod_widget
+        )
+        self._min_label_size_double_spin_box.setRange(0.0, float("inf"))
+        self._min_label_size_double_spin_box.setSuffix(" px")
+        self._min_label_size_double_spin_box.valueChanged.connect(
+            self._on_min_label_size_double_spin_box_value_changed
+        )
+        label_lod_widget_layout.addWidget(self._min_label_size_double_spin_box)
+        roi_table_widget_layout.addRow("Labels:", self._label_lod_widget)
+        self._coordinates_widget = QWidget(parent=self._roi_table_widget)
+        coordinates_widget_layout = QHBoxLayout()
+        coordinates_widget_layout.setContentsMargins(0, 0, 0, 0)
+        self._coordinates_widget.setLayout(coordinates_widget_layout)
+        self._world_coordinates_check_box = QCheckBox(
+            "World", parent=self._coordinates_widget
+        )
+        self._world_coordinates_check_box.setToolTip(
+            "Show, save and load ROIs in world coordinates, applying the layer"
+            " scale, translation and affine transform"
+        )
+        self._world_coordinates_check_box.stateChanged.connect(
+            self._on_world_coordinates_check_box_state_changed
+        )
+        coordinates_widget_layout.addWidget(self._world_coordinates_check_box)
+        self._roi_unit_line_edit = QLineEdit(parent=self._coordinates_widget)
+        self._roi_unit_line_edit.setPlaceholderText("Unit")
+        self._roi_unit_line_edit.editingFinished.connect(
+            self._on_roi_unit_line_edit_editing_finished
+        )
+        coordinates_widget_layout.addWidget(self._roi_unit_line_edit)
+        roi_table_widget_layout.addRow("Coordinates:", self._coordinates_widget)
+        self._roi_gallery_check_box = QCheckBox(
+            "Thumbnails", parent=self._roi_table_widget
+        )
+        self._roi_gallery_check_box.setToolTip(
+            "Show a thumbnail of every ROI, cropped from an image layer"
+        )
+        self._roi_gallery_check_box.stateChanged.connect(
+            self._on_roi_gallery_check_box_state_changed
+        )
+        roi_table_widget_layout.addRow("Gallery:", self._roi_gallery_check_box)
+        self._roi_filter_widget = QWidget(parent=self._roi_table_widget)
+        roi_filter_widget_layout = QHBoxLayout()
+        roi_filter_widget_layout.setContentsMargins(0, 0, 0, 0)
+        self._roi_filter_widget.setLayout(roi_filter_widget_layout)
+        self._roi_filter_line_edit = QLineEdit(parent=self._roi_filter_widget)
+        self._roi_filter_line_edit.setPlaceholderText("e.g. width > 500 & y < 1000")
+        self._roi_filter_line_edit.setToolTip(
+            "Condition on the columns "
+            + ", ".join(ROI_QUERY_COLUMNS)
+            + ", e.g. name.str.startswith('tumor')"
+        )
+        self._roi_filter_line_edit.returnPressed.connect(
+            self._on_select_filtered_push_button_clicked
+        )
+        roi_filter_widget_layout.addWidget(self._roi_filter_line_edit)
+        self._select_filtered_push_button = QPushButton(
+            "Select", parent=self._roi_filter_widget
+        )
+        self._select_filtered_push_button.clicked.connect(
+            self._on_select_filtered_push_button_clicked
+        )
+        roi_filter_widget_layout.addWidget(self._select_filtered_push_button)
+        self._delete_filtered_push_button = QPushButton(
+            "Delete", parent=self._roi_filter_widget
+        )
+        self._delete_filtered_push_button.clicked.connect(
+            self._on_delete_filtered_push_button_clicked
+        )
+        roi_filter_widget_layout.addWidget(self._delete_filtered_push_button)
+        self._export_filtered_push_button = QPushButton(
+            "Export...", parent=self._roi_filter_widget
+        )
+        self._export_filtered_push_button.clicked.connect(
+            self._on_export_filtered_push_button_clicked
+        )
+        roi_filter_widget_layout.addWidget(self._export_filtered_push_button)
+        roi_table_widget_layout.addRow("Filter:", self._roi_filter_widget)
+        self._find_overlaps_push_button = QPushButton(
+            "Find overlaps", parent=self._roi_table_widget
+        )
+        self._find_overlaps_push_button.setFixedWidth(200)
+        self._find_overlaps_push_button.clicked.connect(
+            self._on_find_overlaps_push_button_clicked
+        )
+        roi_table_widget_layout.addRow(self._find_overlaps_push_button)
 
         self._save_widget = QWidget(parent=self)
         save_widget_layout = QGridLayout()
@@ -133,6 +367,58 @@ class ROIWidget(QWidget):
         )
         self._save_push_button.clicked.connect(self._on_save_push_button_clicked)
         save_widget_layout.addWidget(self._save_push_button, 1, 1, 1, 1)
+        self._journal_roi_file_check_box = QCheckBox(
+            "Journal", parent=self._save_widget
+        )
+        self._journal_roi_file_check_box.setToolTip(
+            "Autosave by appending changes to a journal file next to the ROI file"
+        )
+        self._journal_roi_file_check_box.stateChanged.connect(
+            self._on_journal_roi_file_check_box_state_changed
+        )
+        save_widget_layout.addWidget(self._journal_roi_file_check_box, 2, 0, 1, 1)
+        self._watch_roi_file_check_box = QCheckBox("Watch", parent=self._save_widget)
+        self._watch_roi_file_check_box.setToolTip(
+            "Reload changed ROIs when the ROI file is modified by another program"
+        )
+        self._watch_roi_file_check_box.stateChanged.connect(
+            self._on_watch_roi_file_check_box_state_changed
+        )
+        save_widget_layout.addWidget(self._watch_roi_file_check_box, 2, 1, 1, 1)
+        self._export_push_button = QPushButton(
+            "Export all layers", parent=self._save_widget
+        )
+        self._export_push_button.clicked.connect(self._on_export_push_button_clicked)
+        save_widget_layout.addWidget(self._export_push_button, 3, 1, 1, 1)
+        self._serve_check_box = QCheckBox("Serve", parent=self._save_widget)
+        self._serve_check_box.setToolTip(
+            "Share ROIs with other programs through a local socket"
+        )
+        self._serve_check_box.stateChanged.connect(
+            self._on_serve_check_box_state_changed
+        )
+        save_widget_layout.addWidget(self._serve_check_box, 3, 0, 1, 1)
+        self._open_overview_push_button = QPushButton(
+            "Open overview", parent=self._save_widget
+        )
+        self._open_overview_push_button.setToolTip(
+            "Open a large ROI file, showing ROIs as editable shapes only when"
+            " zoomed in"
+        )
+        self._open_overview_push_button.clicked.connect(
+            self._on_open_overview_push_button_clicked
+        )
+        save_widget_layout.addWidget(self._open_overview_push_button, 4, 1, 1, 1)
+        self._export_raster_push_button = QPushButton(
+            "Export mask", parent=self._save_widget
+        )
+        self._export_raster_push_button.setToolTip(
+            "Export ROIs as a tiled label image or binary mask (Zarr or TIFF)"
+        )
+        self._export_raster_push_button.clicked.connect(
+            self._on_export_raster_push_button_clicked
+        )
+        save_widget_layout.addWidget(self._export_raster_push_button, 4, 0, 1, 1)
 
         self._update_layout(False)
         self.installEventFilter(self)
@@ -143,6 +429,7 @@ class ROIWidget(QWidget):
         self._viewer.layers.selection.events.active.connect(
             self._on_active_layer_changed
         )
+        self._viewer.layers.events.removed.connect(self._on_layer_removed)
 
         self._initialized = True
 
@@ -156,42 +443,468 @@ class ROIWidget(QWidget):
     def load_roi_file(self) -> None:
         assert self._roi_layer_accessor is not None
         assert self.roi_file is not None
-        df = None
+        assert self._roi_layer is not None
+        n = len(self._roi_layer_accessor)
+        attributes = None
+        # reuses the ROIs derived when the ROI file was last saved or loaded
+        roi_state_cache = read_roi_state_cache(
+            self.roi_file, self._roi_layer_accessor.roi_origin
+        )
+        roi_names: Union[Sequence[str], np.ndarray]
+        if roi_state_cache is not None:
+            roi_names = roi_state_cache.roi_names
+            rectangles = roi_state_cache.rectangles
+        else:
+            try:
+                # replays the journal, if any
+                roi_names, boxes, metadata, attributes = load_roi_journal(
+                    self.roi_file, self._roi_layer_accessor.roi_origin
+                )
+            except Exception as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", e)
+                return
+            rectangles = boxes_to_rectangles(boxes)
+            transform = get_roi_file_transform(metadata)
+            if transform is not None:
+                # map world coordinates back using the recorded transform
+                rectangles = transform_points(rectangles, np.linalg.inv(transform))
+        with self._roi_layer.events.blocker_all():
+            self._roi_layer_accessor.insert_rectangles(
+                n, roi_names, rectangles, attributes=attributes
+            )
+        if n == 0:
+            if roi_state_cache is not None:
+                self._get_roi_fingerprint().restore(
+                    roi_state_cache.roi_names,
+                    roi_state_cache.fingerprint_boxes,
+                    roi_state_cache.fingerprint_row_hashes,
+                )
+            else:
+                self._write_roi_state_cache()
+        self._roi_layer.refresh()
+        self._refresh_roi_table_widget()
+        self._publish_rois()
+
+    def save_roi_file(self, force: bool = False) -> bool:
+        assert self._roi_layer_accessor is not None
+        assert self.roi_file is not None
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        roi_file_state = self._get_roi_file_state()
+        saved_roi_file_state = self._saved_roi_file_states.get(id(self._roi_layer))
+        if not force and roi_file_state == saved_roi_file_state:
+            return False  # nothing changed since the last save
+        fingerprint = roi_file_state[1]
+        journaled = False
         try:
-            df = pd.read_csv(self.roi_file)
+            if roi_overview is not None:
+                # the Shapes layer only holds the ROIs of the current view
+                df = roi_overview.roi_store.to_dataframe(
+                    self._roi_layer_accessor.roi_origin
+                )
+                if len(df.attrs) > 0:  # keep plain ROI files free of metadata
+                    df.attrs[ROI_FILE_FINGERPRINT_KEY] = fingerprint
+                write_roi_file(df, self.roi_file)
+            elif (
+                self.autosave_roi_file
+                and self.journal_roi_file
+                and len(self._roi_layer_accessor.attribute_names) == 0
+            ):
+                # the journal does not record ROI attributes
+                self._save_roi_journal()
+                journaled = True
+            else:
+                df = self._roi_layer_accessor.to_dataframe()
+                if len(df.attrs) > 0:  # keep plain ROI files free of metadata
+                    df.attrs[ROI_FILE_FINGERPRINT_KEY] = fingerprint
+                write_roi_file(df, self.roi_file)
         except Exception as e:
+            self._saved_roi_file_states.pop(id(self._roi_layer), None)
             QMessageBox.warning(self._viewer.window.qt_viewer, "Error", e)
-        if df is not None:
-            assert self._roi_layer is not None
-            with self._roi_layer.events.blocker_all():
-                for i, row in df.iterrows():
-                    roi = ROI(
-                        name=row["Name"],
-                        x=row["X"],
-                        y=row["Y"],
-                        width=row["W"],
-                        height=row["H"],
-                    )
-                    self._roi_layer_accessor.append(roi)
-            self._roi_layer.refresh()
+            return False
+        self._saved_roi_file_states[id(self._roi_layer)] = (
+            *roi_file_state[:-1],
+            _get_mtime_ns(self.roi_file),
+        )
+        if not journaled:
+            self._write_roi_state_cache()  # errors do not fail the save
+        if self._roi_file_watcher is not None:
+            self._roi_file_watcher.ignore_changes()
+        return True
+
+    def start_roi_server(self, server_name: str = ROIServer.DEFAULT_SERVER_NAME) -> str:
+        self.stop_roi_server()
+        roi_server = ROIServer(parent=self)
+        roi_server.listen(server_name)
+        roi_server.rois_pushed.connect(self._on_rois_pushed)
+        self._roi_server = roi_server
+        self._reset_roi_server()
+        with QSignalBlocker(self._serve_check_box):
+            self._serve_check_box.setChecked(True)
+        self._serve_check_box.setToolTip(roi_server.server_name)
+        return roi_server.server_name
+
+    def stop_roi_server(self) -> None:
+        if self._roi_server is not None:
+            self._roi_server.close()
+            self._roi_server.deleteLater()
+            self._roi_server = None
+        with QSignalBlocker(self._serve_check_box):
+            self._serve_check_box.setChecked(False)
+
+    def sync_rois(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        assert self._roi_layer_accessor is not None
+        boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        if roi_overview is not None:
+            with self._updating_roi_layer():
+                roi_overview.reset(roi_names, boxes, attributes=attributes)
+            return
+        (
+            deleted_indices,
+            updated_indices,
+            updated_new_indices,
+            inserted_new_indices,
+        ) = diff_rois_by_name(
+            self._roi_layer_accessor.roi_names,
+            self._roi_layer_accessor.roi_boxes,
+            roi_names,
+            boxes,
+        )
+        layer_attributes = None
+        if attributes is not None:
+            # ROI attributes in layer order, i.e. matched ROIs first, then new ROIs
+            new_indices = match_rois_by_name(
+                self._roi_layer_accessor.roi_names, roi_names
+            )
+            layer_attributes = attributes.reset_index(drop=True).iloc[
+                np.concatenate((new_indices[new_indices >= 0], inserted_new_indices))
+            ]
+        if (
+            len(deleted_indices) > 0
+            or len(updated_indices) > 0
+            or len(inserted_new_indices) > 0
+            or (
+                layer_attributes is not None
+                and not layer_attributes.reset_index(drop=True).equals(
+                    self._roi_layer_accessor.attributes
+                )
+            )
+        ):
+            with self._updating_roi_layer():
+                self._roi_layer_accessor.apply_rectangle_changes(
+                    deleted_indices,
+                    updated_indices,
+                    self._roi_layer_accessor.roi_boxes_to_rectangles(
+                        boxes[updated_new_indices]
+                    ),
+                    [roi_names[i] for i in inserted_new_indices],
+                    self._roi_layer_accessor.roi_boxes_to_rectangles(
+                        boxes[inserted_new_indices]
+                    ),
+                    attributes=layer_attributes,
+                )
+
+    def open_roi_overview(
+        self, roi_file: Path, max_shapes: int = ROIOverview.DEFAULT_MAX_SHAPES
+    ) -> Shapes:
+        roi_origin = ROIOrigin(self.roi_origin or ROILayerAccessor.DEFAULT_ROI_ORIGIN)
+        roi_store = ROIStore.from_dataframe(read_roi_file(roi_file), roi_origin)
+        roi_layer = self._viewer.add_shapes(ndim=2, name=roi_file.stem)
+        roi_layer_accessor = self._roi_layer_manager.get_roi_layer_accessor(roi_layer)
+        roi_layer_accessor.roi_origin = roi_origin
+        roi_layer_accessor.roi_file = roi_file
+        roi_overview = ROIOverview(
+            self._viewer,
+            roi_store,
+            roi_layer_accessor,
+            max_shapes=max_shapes,
+            parent=self,
+        )
+        roi_overview.window_changed.connect(
+            lambda: self._on_roi_overview_window_changed(roi_layer)
+        )
+        self._roi_overviews[id(roi_layer)] = roi_overview
+        if roi_layer is self._roi_layer:
             self._refresh_roi_table_widget()
+            self._reset_roi_server()
+        return roi_layer
+
+    def export_roi_file(
+        self, path: Path, roi_layers: Optional[Iterable[Shapes]] = None
+    ) -> None:
+        if roi_layers is None:
+            roi_layers = [
+                layer for layer in self._viewer.layers if isinstance(layer, Shapes)
+            ]
+        roi_origin = ROIOrigin(self.roi_origin or ROILayerAccessor.DEFAULT_ROI_ORIGIN)
+        df = self._roi_layer_manager.to_dataframe(roi_origin, layers=roi_layers)
+        write_roi_file(df, path)
 
-    def save_roi_file(self) -> None:
+    def export_rois(self, path: Path, indices: Iterable[int]) -> None:
         assert self._roi_layer_accessor is not None
-        assert self.roi_file is not None
-        df = pd.DataFrame(
-            data={
-                "Name": [roi.name for roi in self._roi_layer_accessor],
-                "X": [roi.x for roi in self._roi_layer_accessor],
-                "Y": [roi.y for roi in self._roi_layer_accessor],
-                "W": [roi.width for roi in self._roi_layer_accessor],
-                "H": [roi.height for roi in self._roi_layer_accessor],
-            }
+        df = self._roi_layer_accessor.to_dataframe()
+        subset_df = df.iloc[np.asarray(list(indices), dtype=int)].reset_index(drop=True)
+        subset_df.attrs = df.attrs
+        write_roi_file(subset_df, path)
+
+    def export_roi_raster(
+        self,
+        path: Path,
+        shape: Sequence[int],
+        indices: Optional[Iterable[int]] = None,
+        binary: bool = False,
+        tile_shape: Sequence[int] = DEFAULT_ROI_RASTER_TILE_SHAPE,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        assert self._roi_layer_accessor is not None
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        if roi_overview is not None:
+            roi_overview.sync()
+            boxes = roi_overview.roi_store.boxes
+        else:
+            boxes = self._roi_layer_accessor.boxes  # image data coordinates
+        labels = np.arange(1, len(boxes) + 1)
+        if indices is not None:
+            indices = np.asarray(list(indices), dtype=int)
+            boxes, labels = boxes[indices], labels[indices]
+        if binary:
+            labels = np.ones(len(boxes), dtype=np.uint8)
+        write_roi_raster(
+            path,
+            boxes,
+            shape,
+            labels=labels,
+            tile_shape=tile_shape,
+            progress_callback=progress_callback,
         )
-        try:
-            df.to_csv(self.roi_file, index=False)
-        except Exception as e:
-            QMessageBox.warning(self._viewer.window.qt_viewer, "Error", e)
+
+    def add_grid_rois(
+        self,
+        extent: Sequence[float],
+        overlap: Optional[float] = None,
+        stride_x: Optional[float] = None,
+        stride_y: Optional[float] = None,
+    ) -> None:
+        assert self.new_roi_width is not None
+        assert self.new_roi_height is not None
+        if overlap is None:
+            overlap = self.roi_grid_overlap
+        boxes = create_grid_boxes(
+            extent,
+            self.new_roi_width,
+            self.new_roi_height,
+            overlap=overlap,
+            stride_x=stride_x,
+            stride_y=stride_y,
+        )
+        self._add_boxes(boxes)
+
+    def add_label_rois(self, labels: np.ndarray) -> None:
+        _, boxes = create_label_boxes(labels)
+        self._add_boxes(boxes)
+
+    def find_overlapping_rois(
+        self, other_roi_layer: Optional[Shapes] = None
+    ) -> pd.DataFrame:
+        assert self._roi_layer_accessor is not None
+        other_roi_layer_accessor = self._roi_layer_accessor
+        if other_roi_layer is not None:
+            other_roi_layer_accessor = self._roi_layer_manager.get_roi_layer_accessor(
+                other_roi_layer
+            )
+        df = find_overlapping_boxes(
+            self._roi_layer_accessor.boxes,
+            boxes_b=other_roi_layer_accessor.boxes if other_roi_layer else None,
+        )
+        df.insert(
+            0, "name_a", self._roi_layer_accessor.roi_names[df["index_a"].to_numpy()]
+        )
+        df.insert(
+            1, "name_b", other_roi_layer_accessor.roi_names[df["index_b"].to_numpy()]
+        )
+        return df
+
+    def remove_duplicate_rois(self, threshold: float = 0.5, metric: str = "iou") -> int:
+        assert self._roi_layer_accessor is not None
+        duplicate_mask = find_duplicate_boxes(
+            self._roi_layer_accessor.boxes, threshold=threshold, metric=metric
+        )
+        if duplicate_mask.any():
+            with self._updating_roi_layer():
+                self._roi_layer_accessor.delete_rois(np.flatnonzero(duplicate_mask))
+        return int(duplicate_mask.sum())
+
+    def rename_rois(
+        self,
+        template: Optional[str] = None,
+        pattern: Optional[str] = None,
+        replacement: str = "",
+        indices: Optional[Iterable[int]] = None,
+        start: int = 1,
+        **fields: Any,
+    ) -> int:
+        assert self._roi_layer_accessor is not None
+        roi_names = self._roi_layer_accessor.roi_names
+        if indices is None:
+            indices = np.arange(len(roi_names))
+        indices = np.asarray(list(indices), dtype=int)
+        if template is not None:
+            new_roi_names = format_roi_names(
+                roi_names[indices], template, start=start, **fields
+            )
+        elif pattern is not None:
+            new_roi_names = replace_roi_names(roi_names[indices], pattern, replacement)
+        else:
+            raise ValueError("Either a template or a pattern is required")
+        changed_mask = new_roi_names != roi_names[indices]
+        if changed_mask.any():
+            untouched_mask = np.ones(len(roi_names), dtype=bool)
+            untouched_mask[indices[changed_mask]] = False
+            check_roi_names(  # raises ValueError
+                new_roi_names[changed_mask], roi_names[untouched_mask]
+            )
+            with self._updating_roi_layer():
+                self._roi_layer_accessor.rename_rois(
+                    indices[changed_mask], new_roi_names[changed_mask]
+                )
+        return int(changed_mask.sum())
+
+    def query_rois(self, expression: str) -> np.ndarray:
+        assert self._roi_layer_accessor is not None
+        return self._roi_layer_accessor.query(expression)  # raises ValueError
+
+    def fit_rois(
+        self,
+        image_layer: Image,
+        indices: Optional[Iterable[int]] = None,
+        threshold: Optional[float] = None,
+    ) -> int:
+        snapshot = self.snapshot_rois()
+        if indices is None:
+            indices = range(len(snapshot))
+        indices = np.asarray(list(indices), dtype=int)
+        boxes = _fit_layer_boxes(
+            self._get_current_image(image_layer),
+            snapshot.boxes[indices],
+            self._get_image_matrix(image_layer),  # raises ValueError
+            threshold=threshold,
+            rgb=image_layer.rgb,
+        )
+        return self._update_fitted_rois(snapshot, indices, boxes)
+
+    def snapshot_rois(self, vertices: bool = False) -> ROISnapshot:
+        assert self._roi_layer_accessor is not None
+        return self._roi_layer_accessor.snapshot(vertices=vertices)
+
+    def update_rois(
+        self,
+        snapshot: ROISnapshot,
+        indices: Iterable[int],
+        boxes: Optional[np.ndarray] = None,
+        roi_names: Optional[Union[Sequence[str], np.ndarray]] = None,
+    ) -> None:
+        assert self._roi_layer_accessor is not None
+        # raises StaleROISnapshotError if the ROIs changed since the snapshot
+        snapshot.check_version(self._roi_layer_accessor.version)
+        indices = np.asarray(list(indices), dtype=int)
+        if boxes is not None:
+            boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+            if len(boxes) != len(indices):
+                raise ValueError("Number of indices and boxes differ")
+        if roi_names is not None:
+            roi_names = np.asarray(roi_names, dtype=str)
+            if len(roi_names) != len(indices):
+                raise ValueError("Number of indices and ROI names differ")
+            all_roi_names = snapshot.roi_names.astype(object)
+            all_roi_names[indices] = roi_names
+            check_roi_names(all_roi_names)  # raises ValueError
+        if len(indices) > 0:
+            with self._updating_roi_layer():
+                if boxes is not None:
+                    # snapshot boxes are in data coordinates
+                    self._roi_layer_accessor.update_boxes(indices, boxes)
+                if roi_names is not None:
+                    self._roi_layer_accessor.rename_rois(indices, roi_names)
+
+    def copy_rois(self, indices: Optional[Iterable[int]] = None) -> str:
+        assert self._roi_layer_accessor is not None
+        df = self._roi_layer_accessor.to_dataframe()
+        if indices is not None:
+            df = df.iloc[np.asarray(list(indices), dtype=int)]
+        text = format_roi_text(df)
+        clipboard = QApplication.clipboard()
+        assert clipboard is not None
+        clipboard.setText(text)
+        return text
+
+    def paste_rois(
+        self, text: Optional[str] = None, index: Optional[int] = None
+    ) -> int:
+        assert self._roi_layer_accessor is not None
+        if text is None:
+            clipboard = QApplication.clipboard()
+            assert clipboard is not None
+            text = clipboard.text()
+        df = parse_roi_text(text)  # raises ValueError
+        roi_names = deduplicate_roi_names(
+            df[ROI_FILE_NAME_COLUMN].to_numpy(dtype=str),
+            self._roi_layer_accessor.roi_names,
+        )
+        check_roi_names(roi_names)  # raises ValueError
+        if index is None:
+            index = len(self._roi_layer_accessor)
+        boxes = roi_file_to_boxes(df, self._roi_layer_accessor.roi_origin)
+        attributes = get_roi_file_attributes(df)
+        with self._updating_roi_layer():
+            self._roi_layer_accessor.insert_rectangles(
+                index,
+                roi_names,
+                self._roi_layer_accessor.roi_boxes_to_rectangles(boxes),
+                attributes=attributes if len(attributes.columns) > 0 else None,
+            )
+        if len(attributes.columns) > 0 and self._roi_table_model is not None:
+            self._roi_table_model.reset()  # attribute columns may have been added
+        return len(df)
+
+    def add_roi_attribute(
+        self, name: str, attribute_type: str = "category", default: Any = None
+    ) -> None:
+        assert self._roi_layer_accessor is not None
+        assert self._roi_table_model is not None
+        with self._updating_roi_layer():
+            self._roi_layer_accessor.add_attribute(  # raises ValueError
+                name, attribute_type=attribute_type, default=default
+            )
+        self._roi_table_model.reset()
+
+    def remove_roi_attribute(self, name: str) -> None:
+        assert self._roi_layer_accessor is not None
+        assert self._roi_table_model is not None
+        with self._updating_roi_layer():
+            self._roi_layer_accessor.remove_attribute(name)
+        self._roi_table_model.reset()
+
+    def delete_rois(self, indices: Iterable[int]) -> None:
+        assert self._roi_layer_accessor is not None
+        indices = np.asarray(list(indices), dtype=int)
+        if len(indices) > 0:
+            with self._updating_roi_layer():
+                self._roi_layer_accessor.delete_rois(indices)
+
+    def show_roi_gallery(self, image_layer: Optional[Image]) -> None:
+        self._roi_gallery_model.image_layer = image_layer
+        self._roi_gallery_view.setVisible(image_layer is not None)
+        with QSignalBlocker(self._roi_gallery_check_box):
+            self._roi_gallery_check_box.setChecked(image_layer is not None)
+
+    def select_rois(self, indices: Iterable[int]) -> None:
+        assert self._roi_selection_synchronizer is not None
+        self._roi_selection_synchronizer.select(indices)
 
     def get_rois(self) -> MutableSequence[ROIBase]:
         assert self._roi_layer_accessor is not None
@@ -215,7 +928,34 @@ class ROIWidget(QWidget):
             self._roi_layer = None
         self._on_roi_layer_changed(old_roi_layer)
 
+    def _on_layer_removed(self, event: Event) -> None:
+        if isinstance(event.value, Shapes):
+            roi_overview = self._roi_overviews.pop(id(event.value), None)
+            if roi_overview is not None:
+                roi_overview.close()
+            self._roi_fingerprints.pop(id(event.value), None)
+            self._saved_roi_file_states.pop(id(event.value), None)
+            roi_label_lod = self._roi_label_lods.pop(id(event.value), None)
+            if roi_label_lod is not None:
+                roi_label_lod.close()
+            self._roi_layer_manager.remove(event.value)
+        if event.value is self._roi_gallery_model.image_layer:
+            self.show_roi_gallery(None)
+        for roi_layer_id, roi_label_lod in list(self._roi_label_lods.items()):
+            if roi_label_lod.label_layer is event.value:
+                # label layers removed by the user turn off label LOD
+                roi_layer = roi_label_lod.roi_layer_accessor.layer
+                del self._roi_label_lods[roi_layer_id]
+                roi_label_lod.close()
+                roi_label_lod.roi_layer_accessor.label_lod = False
+                if roi_layer is self._roi_layer:
+                    self._refresh_roi_table_widget()
+
     def _on_roi_layer_changed(self, old_roi_layer: Optional[Shapes]) -> None:
+        if self._roi_selection_synchronizer is not None:
+            self._roi_selection_synchronizer.close()
+            self._roi_selection_synchronizer = None
+        self._roi_journal = None
         if old_roi_layer is not None:
             old_roi_layer.events.data.disconnect(self._on_roi_layer_data_changed)
             old_roi_layer.events.properties.disconnect(
@@ -223,8 +963,12 @@ class ROIWidget(QWidget):
             )
             old_roi_layer.mouse_drag_callbacks.remove(self._on_roi_layer_mouse_drag)
         if self._roi_layer is not None:
-            self._roi_layer_accessor = ROILayerAccessor(self._roi_layer)
-            self._roi_table_model = ROITableModel(self._roi_layer_accessor)
+            self._roi_layer_accessor = self._roi_layer_manager.get_roi_layer_accessor(
+                self._roi_layer
+            )
+            self._roi_table_model = self._roi_layer_manager.get_roi_table_model(
+                self._roi_layer
+            )
             self._roi_layer.events.data.connect(self._on_roi_layer_data_changed)
             self._roi_layer.events.properties.connect(
                 self._on_roi_layer_properties_changed
@@ -232,23 +976,26 @@ class ROIWidget(QWidget):
             self._roi_layer.mouse_drag_callbacks.append(self._on_roi_layer_mouse_drag)
             self._roi_layer.text = ROILayerAccessor.ROI_NAME_FEATURES_KEY
             self._roi_layer.text.color = self.ROI_LAYER_TEXT_COLOR  # type: ignore
+            self._refresh_roi_label_lod()
             self.setEnabled(True)
         else:
             self._roi_layer_accessor = None
             self._roi_table_model = None
             self.setEnabled(False)
+        self._refresh_roi_file_watcher()
+        self._reset_roi_server()
+        self._roi_gallery_model.roi_layer_accessor = self._roi_layer_accessor
         old_roi_table_model = self._roi_table_view.model()
         self._roi_table_view.setModel(self._roi_table_model)
         if old_roi_table_model is None and self._roi_table_model is not None:
-            for c in range(0, self._roi_table_model.columnCount()):
-                self._roi_table_view.setColumnWidth(c, self.DEFAULT_COLUMN_WIDTHS[c])
+            for c, column_width in enumerate(self.DEFAULT_COLUMN_WIDTHS):
+                self._roi_table_view.setColumnWidth(c, column_width)
             self._roi_table_view.horizontalHeader().setSectionResizeMode(
                 QHeaderView.ResizeMode.Interactive
             )
-        selection_model = self._roi_table_view.selectionModel()
-        if selection_model is not None:
-            selection_model.selectionChanged.connect(
-                self._on_roi_table_view_selection_changed
+        if self._roi_layer is not None:
+            self._roi_selection_synchronizer = ROISelectionSynchronizer(
+                self._roi_layer, self._roi_table_view, parent=self
             )
         self._refresh_add_widget()
         self._refresh_roi_table_widget()
@@ -278,30 +1025,292 @@ class ROIWidget(QWidget):
         self._roi_layer_accessor.append(roi)
         self._refresh_roi_table_widget()
 
-    def _on_roi_table_view_selection_changed(
-        self, selected: QItemSelection, deselected: QItemSelection
-    ) -> None:
-        assert self._roi_layer is not None
-        row_indices = set(index.row() for index in selected.indexes())
-        self._roi_layer.selected_data = row_indices
-        self._roi_layer.refresh()
+    def _on_roi_grid_overlap_double_spin_box_value_changed(self, value: float) -> None:
+        self.roi_grid_overlap = value
+
+    def _on_add_roi_grid_push_button_clicked(self) -> None:
+        image_layer = self._choose_layer("Add ROI grid", (Image, Labels))
+        if image_layer is not None:
+            height, width = _get_layer_image_shape(image_layer)
+            try:
+                self.add_grid_rois((-0.5, -0.5, height - 0.5, width - 0.5))
+            except ValueError as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
+    def _on_add_label_rois_push_button_clicked(self) -> None:
+        labels_layer = self._choose_layer("Add ROIs from labels", (Labels,))
+        if labels_layer is not None:
+            labels_data = labels_layer.data
+            if labels_layer.multiscale:
+                labels_data = labels_data[0]
+            self.add_label_rois(np.asarray(labels_data))
 
     def _on_roi_table_view_context_menu_requested(self, pos: QPoint) -> None:
+        if self._roi_layer_accessor is None:
+            return
         index = self._roi_table_view.indexAt(pos)
+        attribute_names = self._roi_layer_accessor.attribute_names
+        attribute_name = None
+        if index.isValid() and index.column() >= 5:
+            attribute_name = attribute_names[index.column() - 5]
+        menu = QMenu()
+        delete_action = rename_action = remove_attribute_action = None
+        fit_action = menu.addAction("Fit to image...")
+        fit_action.setEnabled(len(self.selected_roi_indices) > 0)
+        menu.addSeparator()
+        copy_action = menu.addAction("Copy")
+        copy_action.setEnabled(len(self.selected_roi_indices) > 0)
+        paste_action = menu.addAction("Paste")
+        menu.addSeparator()
         if index.isValid():
-            menu = QMenu()
             delete_action = menu.addAction(
                 self.style().standardIcon(QStyle.StandardPixmap.SP_DialogCloseButton),
                 "Delete",
             )
-            if menu.exec(self._roi_table_view.mapToGlobal(pos)) == delete_action:
-                assert self._roi_layer_accessor is not None
-                del self._roi_layer_accessor[index.row()]
-                self._refresh_roi_table_widget(row_indices=[index.row()])
+            rename_action = menu.addAction("Rename...")
+            menu.addSeparator()
+        add_attribute_action = menu.addAction("Add attribute...")
+        if attribute_name is not None:
+            remove_attribute_action = menu.addAction(
+                f"Remove attribute '{attribute_name}'"
+            )
+        action = menu.exec(self._roi_table_view.mapToGlobal(pos))
+        if action is None:
+            return
+        if action == fit_action:
+            self._fit_selected_rois_interactively()
+        elif action == copy_action:
+            self._copy_selected_rois()
+        elif action == paste_action:
+            self._paste_rois_from_clipboard()
+        elif action == delete_action:
+            del self._roi_layer_accessor[index.row()]
+            self._refresh_roi_table_widget(row_indices=[index.row()])
+        elif action == rename_action:
+            ROIRenameDialog(self, parent=self).exec()
+        elif action == add_attribute_action:
+            self._add_roi_attribute_interactively()
+        elif action == remove_attribute_action:
+            assert attribute_name is not None
+            self.remove_roi_attribute(attribute_name)
+
+    def _fit_selected_rois_interactively(self) -> None:
+        image_layer = self._choose_layer("Fit to image", (Image,))
+        if image_layer is None:
+            return
+        threshold_method, ok = QInputDialog.getItem(
+            self,
+            "Fit to image",
+            "Threshold:",
+            ["Otsu (per ROI)", "Fixed"],
+            editable=False,
+        )
+        if not ok:
+            return
+        threshold = None
+        if threshold_method == "Fixed":
+            contrast_limits = image_layer.contrast_limits
+            threshold, ok = QInputDialog.getDouble(
+                self,
+                "Fit to image",
+                "Threshold:",
+                value=(contrast_limits[0] + contrast_limits[1]) / 2,
+                min=-1e12,
+                max=1e12,
+                decimals=3,
+            )
+            if not ok:
+                return
+        try:
+            matrix = self._get_image_matrix(image_layer)
+        except ValueError as e:
+            QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+            return
+        snapshot = self.snapshot_rois()
+        indices = self.selected_roi_indices
+        create_worker(
+            _fit_layer_boxes,
+            self._get_current_image(image_layer),
+            snapshot.boxes[indices],
+            matrix,
+            threshold=threshold,
+            rgb=image_layer.rgb,
+            _connect={
+                "returned": lambda boxes: self._on_rois_fitted(
+                    snapshot, indices, boxes
+                ),
+                "errored": lambda e: QMessageBox.warning(
+                    self._viewer.window.qt_viewer, "Error", str(e)
+                ),
+            },
+            _ignore_errors=True,
+        )
+
+    def _on_rois_fitted(
+        self, snapshot: ROISnapshot, indices: np.ndarray, boxes: np.ndarray
+    ) -> None:
+        if self._roi_layer_accessor is None:
+            return
+        try:
+            self._update_fitted_rois(snapshot, indices, boxes)
+        except StaleROISnapshotError:
+            QMessageBox.warning(
+                self._viewer.window.qt_viewer,
+                "Fit to image",
+                "ROIs were modified while fitting, please try again",
+            )
+
+    def _update_fitted_rois(
+        self, snapshot: ROISnapshot, indices: np.ndarray, boxes: np.ndarray
+    ) -> int:
+        changed_mask = np.any(boxes != snapshot.boxes[indices], axis=1)
+        # all fitted ROIs are written back in a single layer update
+        self.update_rois(snapshot, indices[changed_mask], boxes=boxes[changed_mask])
+        return int(changed_mask.sum())
+
+    def _get_image_matrix(self, image_layer: Image) -> np.ndarray:
+        # maps ROI layer data coordinates to image layer data coordinates
+        assert self._roi_layer is not None
+        matrix = np.linalg.inv(
+            get_layer_data_to_world_matrix(image_layer)
+        ) @ get_layer_data_to_world_matrix(self._roi_layer)
+        if not is_axis_aligned(matrix.round(decimals=9)):
+            raise ValueError(
+                "ROI and image layers are rotated or sheared relative to each other"
+            )
+        return matrix
+
+    def _get_current_image(self, image_layer: Image) -> np.ndarray:
+        image = image_layer.data[0] if image_layer.multiscale else image_layer.data
+        n_leading = image.ndim - (3 if image_layer.rgb else 2)
+        if n_leading > 0:
+            # the currently displayed plane, read lazily
+            data_point = image_layer.world_to_data(self._viewer.dims.point)
+            image = image[
+                tuple(
+                    int(np.clip(round(value), 0, n - 1))
+                    for value, n in zip(data_point[:n_leading], image.shape[:n_leading])
+                )
+            ]
+        return image
+
+    def _copy_selected_rois(self) -> None:
+        if self._roi_layer_accessor is not None:
+            selected_roi_indices = self.selected_roi_indices
+            if len(selected_roi_indices) > 0:
+                self.copy_rois(selected_roi_indices)
+
+    def _paste_rois_from_clipboard(self) -> None:
+        if self._roi_layer_accessor is not None:
+            index = None
+            selected_roi_indices = self.selected_roi_indices
+            if len(selected_roi_indices) > 0:
+                index = int(selected_roi_indices[0])
+            try:
+                self.paste_rois(index=index)
+            except ValueError as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
+    def _add_roi_attribute_interactively(self) -> None:
+        name, ok = QInputDialog.getText(self, "Add attribute", "Attribute name:")
+        if not ok:
+            return
+        attribute_type_texts = {
+            "Category": "category",
+            "Number": "float64",
+            "Integer": "int64",
+        }
+        attribute_type_text, ok = QInputDialog.getItem(
+            self,
+            "Add attribute",
+            "Attribute type:",
+            list(attribute_type_texts.keys()),
+            editable=False,
+        )
+        if not ok:
+            return
+        try:
+            self.add_roi_attribute(
+                name.strip(), attribute_type=attribute_type_texts[attribute_type_text]
+            )
+        except ValueError as e:
+            QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
+    def _on_roi_gallery_check_box_state_changed(self, state: Qt.CheckState) -> None:
+        image_layer = None
+        if state == Qt.CheckState.Checked:
+            image_layer = self._choose_layer("Show gallery", (Image,))
+            if image_layer is None:
+                with QSignalBlocker(self._roi_gallery_check_box):
+                    self._roi_gallery_check_box.setChecked(False)
+        self.show_roi_gallery(image_layer)
+
+    def _on_roi_gallery_view_clicked(self, index: QModelIndex) -> None:
+        self.select_rois([index.row()])
+
+    def _on_label_lod_check_box_state_changed(self, state: Qt.CheckState) -> None:
+        self.label_lod = state == Qt.CheckState.Checked
+
+    def _on_min_label_size_double_spin_box_value_changed(self, value: float) -> None:
+        self.min_label_size = value
+
+    def _on_world_coordinates_check_box_state_changed(
+        self, state: Qt.CheckState
+    ) -> None:
+        self.world_coordinates = state == Qt.CheckState.Checked
+        if self._initialized and self.autosave_roi_file:
+            self.save_roi_file()
+
+    def _on_roi_unit_line_edit_editing_finished(self) -> None:
+        if self.roi_unit != self._roi_unit_line_edit.text():
+            self.roi_unit = self._roi_unit_line_edit.text()
+            if self._initialized and self.autosave_roi_file:
+                self.save_roi_file()
+
+    def _on_select_filtered_push_button_clicked(self, checked: bool = False) -> None:
+        indices = self._query_filtered_rois()
+        if indices is not None:
+            self.select_rois(indices)
+
+    def _on_delete_filtered_push_button_clicked(self, checked: bool) -> None:
+        indices = self._query_filtered_rois()
+        if indices is not None and len(indices) > 0:
+            answer = QMessageBox.question(
+                self,
+                "Delete ROIs",
+                f"Do you want to delete {len(indices)} ROI(s)?",
+                buttons=QMessageBox.StandardButton.No | QMessageBox.StandardButton.Yes,
+                defaultButton=QMessageBox.StandardButton.No,
+            )
+            if answer == QMessageBox.StandardButton.Yes:
+                self.delete_rois(indices)
+
+    def _on_export_filtered_push_button_clicked(self, checked: bool) -> None:
+        indices = self._query_filtered_rois()
+        if indices is None:
+            return
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export ROI coordinates of filtered ROIs as",
+            str(Path.home()),
+            "Comma-separated values files (*.csv)",
+        )
+        if file_name:
+            path = Path(file_name)
+            if path.suffix.lower() != ".csv":
+                path = path.with_name(path.name + ".csv")
+            try:
+                self.export_rois(path, indices)
+            except Exception as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
+    def _on_find_overlaps_push_button_clicked(self, checked: bool) -> None:
+        ROIOverlapDialog(self, parent=self).exec()
 
     def _on_roi_origin_combo_box_current_text_changed(self, text: str) -> None:
         self.roi_origin = ROIOrigin(text)
-        self._refresh_roi_table_widget()
+        if self._roi_table_model is not None:
+            self._roi_table_model.refresh_columns([1, 2])  # x, y
         if self._initialized and self.autosave_roi_file:
             self.save_roi_file()
 
@@ -345,16 +1354,160 @@ class ROIWidget(QWidget):
         if self._initialized and state == Qt.CheckState.Checked:
             self.save_roi_file()
 
+    def _on_journal_roi_file_check_box_state_changed(
+        self, state: Qt.CheckState
+    ) -> None:
+        self.journal_roi_file = state == Qt.CheckState.Checked
+        if self._initialized and self.autosave_roi_file:
+            self.save_roi_file()
+
+    def _on_watch_roi_file_check_box_state_changed(self, state: Qt.CheckState) -> None:
+        self.watch_roi_file = state == Qt.CheckState.Checked
+
+    def _on_serve_check_box_state_changed(self, state: Qt.CheckState) -> None:
+        if state == Qt.CheckState.Checked:
+            try:
+                server_name = self.start_roi_server()
+            except RuntimeError as e:
+                self.stop_roi_server()
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+            else:
+                self._viewer.status = f"Serving ROIs at {server_name}"
+        else:
+            self.stop_roi_server()
+
+    def _on_rois_pushed(
+        self, roi_names: List[str], boxes: np.ndarray, replace: bool
+    ) -> None:
+        if self._roi_layer_accessor is not None:
+            if not replace:
+                roi_names, boxes = merge_rois(*self._get_rois(), roi_names, boxes)
+            self.sync_rois(roi_names, boxes)
+
+    def _on_roi_file_changed(self, df: pd.DataFrame) -> None:
+        assert self._roi_layer_accessor is not None
+        if (
+            self._roi_journal is not None
+            and df.attrs.get(ROI_JOURNAL_ID_KEY) == self._roi_journal.journal_id
+        ):
+            return  # our own journal snapshot, e.g. read before compaction finished
+        boxes = roi_file_to_boxes(df, self._roi_layer_accessor.roi_origin)
+        # file coordinates -> data coordinates -> ROI (data or world) coordinates
+        matrix = self._roi_layer_accessor.roi_matrix
+        transform = get_roi_file_transform(df.attrs)
+        if transform is not None:
+            matrix = matrix @ np.linalg.inv(transform)
+        if not np.array_equal(matrix, np.eye(3)):
+            boxes = transform_boxes(boxes, matrix)
+        self.sync_rois(
+            df[ROI_FILE_NAME_COLUMN].tolist(),
+            boxes,
+            attributes=get_roi_file_attributes(df),
+        )
+
     def _on_save_push_button_clicked(self, checked: bool) -> None:
         self.save_roi_file()
 
+    def _on_open_overview_push_button_clicked(self, checked: bool) -> None:
+        path, _ = QFileDialog.getOpenFileName(
+            self,
+            "Open ROI coordinates",
+            str(Path.home()),
+            "Comma-separated values files (*.csv)",
+        )
+        if path:
+            try:
+                self.open_roi_overview(Path(path))
+            except Exception as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
+    def _on_export_raster_push_button_clicked(self, checked: bool) -> None:
+        image_layer = self._choose_layer("Export mask", (Image, Labels))
+        if image_layer is None:
+            return
+        raster_type, ok = QInputDialog.getItem(
+            self,
+            "Export mask",
+            "Type:",
+            ["Label image (ROI numbers)", "Binary mask"],
+            editable=False,
+        )
+        if not ok:
+            return
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Export ROI mask as",
+            str(Path.home()),
+            "Zarr arrays (*.zarr);;TIFF files (*.tif *.tiff)",
+        )
+        if not file_name:
+            return
+        path = Path(file_name)
+        if path.suffix.lower() not in (".zarr", ".tif", ".tiff"):
+            suffix = ".zarr" if selected_filter.startswith("Zarr") else ".tif"
+            path = path.with_name(path.name + suffix)
+        progress_dialog = QProgressDialog(
+            "Exporting ROI mask...", "Cancel", 0, 100, parent=self
+        )
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(500)
+
+        def progress_callback(n: int, total: int) -> None:
+            progress_dialog.setMaximum(total)
+            progress_dialog.setValue(n)
+            if progress_dialog.wasCanceled():
+                raise InterruptedError()
+
+        indices = None
+        if self._roi_filter_line_edit.text().strip():
+            # only export filtered ROIs, e.g. one mask per class
+            indices = self._query_filtered_rois(all_rois=True)
+            if indices is None:
+                return
+        try:
+            self.export_roi_raster(
+                path,
+                _get_layer_image_shape(image_layer),
+                indices=indices,
+                binary=raster_type == "Binary mask",
+                progress_callback=progress_callback,
+            )
+        except InterruptedError:
+            pass
+        except Exception as e:
+            QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+        finally:
+            progress_dialog.close()
+
+    def _on_roi_overview_window_changed(self, roi_layer: Shapes) -> None:
+        if roi_layer is self._roi_layer:
+            self._refresh_roi_table_widget()
+
+    def _on_export_push_button_clicked(self, checked: bool) -> None:
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export ROI coordinates of all layers as",
+            str(Path.home()),
+            "Comma-separated values files (*.csv)",
+        )
+        if file_name:
+            path = Path(file_name)
+            if path.suffix.lower() != ".csv":
+                path = path.with_name(path.name + ".csv")
+            try:
+                self.export_roi_file(path)
+            except Exception as e:
+                QMessageBox.warning(self._viewer.window.qt_viewer, "Error", str(e))
+
     def _on_roi_layer_data_changed(self, event: Event) -> None:
         self._refresh_roi_table_widget()
+        self._publish_rois()
         if self._initialized and self.autosave_roi_file:
             self.save_roi_file()
 
     def _on_roi_layer_properties_changed(self, event: Event) -> None:
         self._refresh_roi_table_widget()
+        self._publish_rois()
         if self._initialized and self.autosave_roi_file:
             self.save_roi_file()
 
@@ -370,9 +1523,210 @@ class ROIWidget(QWidget):
             yield
             self._refresh_roi_table_widget()
             while event.type == "mouse_move":
+                assert self._roi_layer_accessor is not None
+                self._roi_layer_accessor.invalidate_boxes(roi_layer.selected_data)
                 self._refresh_roi_table_widget(row_indices=roi_layer.selected_data)
+                self._publish_rois()
                 yield
 
+    def _save_roi_journal(self) -> None:
+        assert self._roi_layer_accessor is not None
+        assert self.roi_file is not None
+        roi_names = self._roi_layer_accessor.roi_names
+        boxes = self._roi_layer_accessor.roi_boxes
+        metadata = self._roi_layer_accessor.roi_file_metadata
+        if self._roi_journal is None or self._roi_journal.metadata != metadata:
+            # e.g. after changing the layer transform in world coordinates
+            self._roi_journal = ROIJournal(self.roi_file, metadata=metadata)
+            self._roi_journal.reset(
+                roi_names, boxes, self._roi_layer_accessor.roi_origin
+            )
+        else:
+            self._roi_journal.record(roi_names, boxes)
+            if self._roi_journal.needs_compaction:
+                self._compact_roi_journal()
+
+    def _compact_roi_journal(self) -> None:
+        assert self._roi_layer_accessor is not None
+        assert self._roi_journal is not None
+        roi_journal = self._roi_journal
+        snapshot = roi_journal.start_compaction(self._roi_layer_accessor.roi_origin)
+        create_worker(
+            write_roi_journal_snapshot,
+            snapshot,
+            roi_journal.roi_file,
+            _connect={
+                "returned": lambda snapshot: self._on_roi_journal_compacted(
+                    roi_journal, snapshot
+                ),
+                "errored": lambda e: roi_journal.abort_compaction(),
+            },
+        )
+
+    def _on_roi_journal_compacted(
+        self, roi_journal: ROIJournal, snapshot: pd.DataFrame
+    ) -> None:
+        if (
+            self._roi_file_watcher is not None
+            and self._roi_file_watcher.roi_file == roi_journal.roi_file
+        ):
+            # the snapshot is older than the journal, do not reload it
+            self._roi_file_watcher.ignore_changes()
+        roi_journal.finish_compaction(snapshot)
+
+    def _refresh_roi_file_watcher(self) -> None:
+        if self._roi_file_watcher is not None:
+            self._roi_file_watcher.stop()
+            self._roi_file_watcher.deleteLater()
+            self._roi_file_watcher = None
+        if self.watch_roi_file and self.roi_file is not None:
+            self._roi_file_watcher = ROIFileWatcher(self.roi_file, parent=self)
+            self._roi_file_watcher.roi_file_changed.connect(self._on_roi_file_changed)
+            self._roi_file_watcher.start()
+
+    def _refresh_roi_label_lod(self) -> None:
+        assert self._roi_layer is not None
+        assert self._roi_layer_accessor is not None
+        roi_label_lod = self._roi_label_lods.get(id(self._roi_layer))
+        if self.label_lod:
+            if roi_label_lod is None:
+                self._roi_label_lods[id(self._roi_layer)] = ROILabelLOD(
+                    self._viewer,
+                    self._roi_layer_accessor,
+                    text_color=self.ROI_LAYER_TEXT_COLOR,
+                    min_label_size=self.min_label_size,
+                    parent=self,
+                )
+            else:
+                self._roi_layer.text.visible = False  # reset by setting the text
+                roi_label_lod.min_label_size = self.min_label_size
+        elif roi_label_lod is not None:
+            del self._roi_label_lods[id(self._roi_layer)]
+            roi_label_lod.close()
+
+    def _query_filtered_rois(self, all_rois: bool = False) -> Optional[np.ndarray]:
+        if self._roi_layer_accessor is None:
+            return None
+        expression = self._roi_filter_line_edit.text()
+        try:
+            roi_overview = self._roi_overviews.get(id(self._roi_layer))
+            if all_rois and roi_overview is not None:
+                # indices of all ROIs, not only of those in the Shapes layer
+                roi_overview.sync()
+                return roi_overview.roi_store.query(
+                    expression, self._roi_layer_accessor.roi_origin
+                )
+            return self.query_rois(expression)
+        except ValueError as e:
+            QMessageBox.warning(self, "Filter", str(e))
+            return None
+
+    def _add_boxes(self, boxes: np.ndarray) -> None:
+        assert self._roi_layer_accessor is not None
+        if len(boxes) == 0:
+            return
+        roi_names = self._roi_layer_accessor.create_roi_names(len(boxes))
+        with self._updating_roi_layer():
+            self._roi_layer_accessor.insert_boxes(
+                len(self._roi_layer_accessor), roi_names, boxes
+            )
+
+    @contextmanager
+    def _updating_roi_layer(self) -> Iterator[None]:
+        assert self._roi_layer is not None
+        with self._roi_layer.events.blocker_all():
+            yield
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        if roi_overview is not None:
+            roi_overview.sync()
+        roi_label_lod = self._roi_label_lods.get(id(self._roi_layer))
+        if roi_label_lod is not None:
+            roi_label_lod.update()
+        self._roi_layer.refresh()
+        self._refresh_roi_table_widget()
+        self._publish_rois()
+        if self.autosave_roi_file:
+            self.save_roi_file()
+
+    def _get_roi_file_state(self) -> Tuple[str, str, str, str, Optional[int]]:
+        assert self._roi_layer_accessor is not None
+        assert self.roi_file is not None
+        return (
+            str(self.roi_file),
+            self.roi_fingerprint,
+            str(self._roi_layer_accessor.roi_origin),
+            json.dumps(self._roi_layer_accessor.roi_file_metadata),
+            _get_mtime_ns(self.roi_file),  # detects external modifications
+        )
+
+    def _publish_rois(self) -> None:
+        if self._roi_server is not None and self._roi_layer_accessor is not None:
+            self._roi_server.publish(*self._get_rois())
+
+    def _reset_roi_server(self) -> None:
+        if self._roi_server is not None:
+            if self._roi_layer_accessor is not None:
+                self._roi_server.reset(*self._get_rois())
+            else:
+                self._roi_server.reset([], np.empty((0, 4)))
+
+    def _get_roi_fingerprint(self) -> ROIFingerprint:
+        roi_fingerprint = self._roi_fingerprints.get(id(self._roi_layer))
+        if roi_fingerprint is None:
+            roi_fingerprint = ROIFingerprint()
+            self._roi_fingerprints[id(self._roi_layer)] = roi_fingerprint
+        return roi_fingerprint
+
+    def _write_roi_state_cache(self) -> None:
+        assert self._roi_layer_accessor is not None
+        assert self.roi_file is not None
+        roi_layer_accessor = self._roi_layer_accessor
+        if (
+            self._roi_overviews.get(id(self._roi_layer)) is not None
+            or len(roi_layer_accessor.attribute_names) > 0
+        ):
+            return  # not cached, the ROI file is loaded instead
+        try:
+            roi_fingerprint = self._get_roi_fingerprint()
+            roi_fingerprint.update(*self._get_rois())
+            write_roi_state_cache(
+                self.roi_file,
+                roi_layer_accessor.roi_origin,
+                roi_layer_accessor.roi_names,
+                # as loaded from the ROI file, i.e. bounding boxes of all shapes
+                roi_layer_accessor.roi_boxes_to_rectangles(
+                    roi_layer_accessor.roi_boxes
+                ),
+                roi_fingerprint.boxes,
+                roi_fingerprint.row_hashes,
+            )
+        except Exception:
+            pass  # the cache is optional
+
+    def _get_rois(self) -> Tuple[np.ndarray, np.ndarray]:
+        assert self._roi_layer_accessor is not None
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        if roi_overview is not None:
+            roi_overview.sync()
+            return roi_overview.roi_store.roi_names, roi_overview.roi_store.boxes
+        return self._roi_layer_accessor.roi_names, self._roi_layer_accessor.roi_boxes
+
+    def _choose_layer(
+        self, title: str, layer_types: Tuple[Type[Layer], ...]
+    ) -> Optional[Layer]:
+        layers = [
+            layer for layer in self._viewer.layers if isinstance(layer, layer_types)
+        ]
+        if len(layers) == 0:
+            QMessageBox.warning(self, title, "No suitable layer found")
+            return None
+        layer_name, ok = QInputDialog.getItem(
+            self, title, "Layer:", [layer.name for layer in layers], editable=False
+        )
+        if ok:
+            return self._viewer.layers[layer_name]
+        return None
+
     def _update_layout(self, horizontal: bool) -> None:
         layout = self.layout()
         if horizontal:
@@ -406,6 +1760,8 @@ class ROIWidget(QWidget):
                 self._new_roi_width_double_spin_box.setValue(self.new_roi_width)
             with QSignalBlocker(self._new_roi_height_double_spin_box):
                 self._new_roi_height_double_spin_box.setValue(self.new_roi_height)
+            with QSignalBlocker(self._roi_grid_overlap_double_spin_box):
+                self._roi_grid_overlap_double_spin_box.setValue(self.roi_grid_overlap)
 
     def _refresh_roi_table_widget(
         self, row_indices: Optional[Sequence[int]] = None
@@ -415,42 +1771,45 @@ class ROIWidget(QWidget):
                 self._roi_table_model.refresh_rows(row_indices)
             else:
                 self._roi_table_model.reset()
+        if self._roi_gallery_view.isVisible():
+            self._roi_gallery_model.reset()  # cached thumbnails are kept
         if self._roi_layer_accessor is not None:
             with QSignalBlocker(self._roi_origin_combo_box):
                 self._roi_origin_combo_box.setCurrentText(str(self.roi_origin))
+            with QSignalBlocker(self._label_lod_check_box):
+                self._label_lod_check_box.setChecked(self.label_lod)
+            with QSignalBlocker(self._min_label_size_double_spin_box):
+                self._min_label_size_double_spin_box.setValue(self.min_label_size)
+            with QSignalBlocker(self._world_coordinates_check_box):
+                self._world_coordinates_check_box.setChecked(self.world_coordinates)
+            with QSignalBlocker(self._roi_unit_line_edit):
+                self._roi_unit_line_edit.setText(self.roi_unit)
+            # overview ROIs are stored in data coordinates
+            self._coordinates_widget.setEnabled(
+                id(self._roi_layer) not in self._roi_overviews
+            )
 
     def _refresh_save_widget(self) -> None:
         self._roi_file_line_edit.setEnabled(not self.autosave_roi_file)
         with QSignalBlocker(self._roi_file_line_edit):
             self._roi_file_line_edit.setText(str(self.roi_file or ""))
         self._autosave_roi_file_check_box.setEnabled(self.roi_file is not None)
+        self._journal_roi_file_check_box.setEnabled(self.roi_file is not None)
+        self._watch_roi_file_check_box.setEnabled(self.roi_file is not None)
         if self._roi_layer_accessor is not None:
             with QSignalBlocker(self._autosave_roi_file_check_box):
                 self._autosave_roi_file_check_box.setChecked(self.autosave_roi_file)
+            with QSignalBlocker(self._journal_roi_file_check_box):
+                self._journal_roi_file_check_box.setChecked(self.journal_roi_file)
+            with QSignalBlocker(self._watch_roi_file_check_box):
+                self._watch_roi_file_check_box.setChecked(self.watch_roi_file)
         self._save_push_button.setEnabled(
             self.roi_file is not None and not self.autosave_roi_file
         )
 
     def _create_roi_name(self) -> str:
-        assert self.new_roi_name is not None
-        desired_roi_name = self.new_roi_name
-        assert self._roi_layer_accessor is not None
-        existing_roi_names = [roi.name for roi in self._roi_layer_accessor]
-        existing_roi_numbers = []
-        regex = re.compile(rf"{desired_roi_name} \((?P<roi_number>\d+)\)")
-        for existing_roi_name in existing_roi_names:
-            m = regex.fullmatch(existing_roi_name)
-            if m is not None:
-                existing_roi_numbers.append(int(m.group("roi_number")))
-        if (
-            desired_roi_name not in existing_roi_names
-            and len(existing_roi_numbers) == 0
-        ):
-            return desired_roi_name
-        roi_number = 2
-        if len(existing_roi_numbers) > 0:
-            roi_number = max(existing_roi_numbers) + 1
-        return f"{desired_roi_name} ({roi_number})"
+        assert self._roi_layer_accessor is not None
+        return self._roi_layer_accessor.create_roi_names(1)[0]
 
     @property
     def viewer(self) -> Viewer:
@@ -460,6 +1819,27 @@ class ROIWidget(QWidget):
     def roi_layer(self) -> Optional[Shapes]:
         return self._roi_layer
 
+    @property
+    def selected_roi_indices(self) -> np.ndarray:
+        if self._roi_layer is not None:
+            return np.array(sorted(self._roi_layer.selected_data), dtype=int)
+        return np.empty(0, dtype=int)
+
+    @property
+    def roi_fingerprint(self) -> str:
+        roi_fingerprint = self._get_roi_fingerprint()
+        roi_overview = self._roi_overviews.get(id(self._roi_layer))
+        if roi_overview is not None:
+            attributes = roi_overview.roi_store.attributes
+        else:
+            assert self._roi_layer_accessor is not None
+            attributes = self._roi_layer_accessor.attributes
+        return roi_fingerprint.update(*self._get_rois(), attributes=attributes)
+
+    @property
+    def roi_layer_manager(self) -> ROILayerManager:
+        return self._roi_layer_manager
+
     @property
     def roi_layer_accessor(self) -> Optional[ROILayerAccessor]:
         return self._roi_layer_accessor
@@ -504,6 +1884,18 @@ class ROIWidget(QWidget):
         self._roi_layer_accessor.new_roi_height = new_roi_height
         self._new_roi_height_double_spin_box.setValue(new_roi_height)
 
+    @property
+    def roi_grid_overlap(self) -> float:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.roi_grid_overlap
+        return ROILayerAccessor.DEFAULT_ROI_GRID_OVERLAP
+
+    @roi_grid_overlap.setter
+    def roi_grid_overlap(self, roi_grid_overlap: float) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.roi_grid_overlap = roi_grid_overlap
+        self._roi_grid_overlap_double_spin_box.setValue(roi_grid_overlap)
+
     @property
     def roi_origin(self) -> Optional[ROIOrigin]:
         if self._roi_layer_accessor is not None:
@@ -514,6 +1906,7 @@ class ROIWidget(QWidget):
     def roi_origin(self, roi_origin: ROIOrigin) -> None:
         assert self._roi_layer_accessor is not None
         self._roi_layer_accessor.roi_origin = roi_origin
+        self._roi_journal = None  # snapshot X/Y coordinates depend on the origin
         self._roi_origin_combo_box.setCurrentText(str(roi_origin))
 
     @property
@@ -526,6 +1919,8 @@ class ROIWidget(QWidget):
     def roi_file(self, roi_file: Optional[Path]) -> None:
         assert self._roi_layer_accessor is not None
         self._roi_layer_accessor.roi_file = roi_file
+        self._roi_journal = None
+        self._refresh_roi_file_watcher()
         self._roi_file_line_edit.setText(
             str(roi_file) if roi_file is not None else None
         )
@@ -540,8 +1935,88 @@ class ROIWidget(QWidget):
     def autosave_roi_file(self, autosave_roi_file: bool) -> None:
         assert self._roi_layer_accessor is not None
         self._roi_layer_accessor.autosave_roi_file = autosave_roi_file
+        self._roi_journal = None
         self._autosave_roi_file_check_box.setChecked(autosave_roi_file)
 
+    @property
+    def journal_roi_file(self) -> bool:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.journal_roi_file
+        return False
+
+    @journal_roi_file.setter
+    def journal_roi_file(self, journal_roi_file: bool) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.journal_roi_file = journal_roi_file
+        self._roi_journal = None
+        self._journal_roi_file_check_box.setChecked(journal_roi_file)
+
+    @property
+    def watch_roi_file(self) -> bool:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.watch_roi_file
+        return False
+
+    @watch_roi_file.setter
+    def watch_roi_file(self, watch_roi_file: bool) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.watch_roi_file = watch_roi_file
+        self._refresh_roi_file_watcher()
+        self._watch_roi_file_check_box.setChecked(watch_roi_file)
+
+    @property
+    def label_lod(self) -> bool:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.label_lod
+        return False
+
+    @label_lod.setter
+    def label_lod(self, label_lod: bool) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.label_lod = label_lod
+        self._refresh_roi_label_lod()
+        self._label_lod_check_box.setChecked(label_lod)
+
+    @property
+    def min_label_size(self) -> float:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.min_label_size
+        return ROILayerAccessor.DEFAULT_MIN_LABEL_SIZE
+
+    @min_label_size.setter
+    def min_label_size(self, min_label_size: float) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.min_label_size = min_label_size
+        self._refresh_roi_label_lod()
+        self._min_label_size_double_spin_box.setValue(min_label_size)
+
+    @property
+    def world_coordinates(self) -> bool:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.world_coordinates
+        return False
+
+    @world_coordinates.setter
+    def world_coordinates(self, world_coordinates: bool) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.world_coordinates = world_coordinates
+        self._roi_journal = None
+        if self._roi_table_model is not None:
+            self._roi_table_model.refresh_columns([1, 2, 3, 4])  # x, y, w, h
+        self._world_coordinates_check_box.setChecked(world_coordinates)
+
+    @property
+    def roi_unit(self) -> str:
+        if self._roi_layer_accessor is not None:
+            return self._roi_layer_accessor.roi_unit
+        return ROILayerAccessor.DEFAULT_ROI_UNIT
+
+    @roi_unit.setter
+    def roi_unit(self, roi_unit: str) -> None:
+        assert self._roi_layer_accessor is not None
+        self._roi_layer_accessor.roi_unit = roi_unit
+        self._roi_unit_line_edit.setText(roi_unit)
+
     @property
     def current_roi_name(self) -> Optional[str]:
         if self._roi_layer_accessor is not None:
@@ -552,3 +2027,41 @@ class ROIWidget(QWidget):
     def current_roi_name(self, current_roi_name: str) -> None:
         assert self._roi_layer_accessor is not None
         self._roi_layer_accessor.current_roi_name = current_roi_name
+
+
+def _get_mtime_ns(path: Path) -> Optional[int]:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _fit_layer_boxes(
+    image: np.ndarray,
+    boxes: np.ndarray,
+    matrix: np.ndarray,
+    threshold: Optional[float] = None,
+    rgb: bool = False,
+) -> np.ndarray:
+    # fits ROI layer boxes to an image, given the ROI-to-image data transform
+    image_boxes = transform_boxes(boxes, matrix)
+    fitted_image_boxes = fit_boxes(image, image_boxes, threshold=threshold, rgb=rgb)
+    fitted = np.any(fitted_image_boxes != image_boxes, axis=1)
+    fitted_boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+    fitted_boxes[fitted] = transform_boxes(
+        fitted_image_boxes[fitted], np.linalg.inv(matrix)
+    )
+    return fitted_boxes
+
+
+def _get_layer_data_shape(layer: Layer) -> Tuple[int, ...]:
+    if layer.multiscale:
+        return tuple(layer.data[0].shape)
+    return tuple(layer.data.shape)
+
+
+def _get_layer_image_shape(layer: Layer) -> Tuple[int, int]:
+    # height and width, without the channel axis of RGB(A) images
+    shape = _get_layer_data_shape(layer)
+    height, width = shape[-3:-1] if getattr(layer, "rgb", False) else shape[-2:]
+    return height, width
@@ -1,4 +1,21 @@
+from ._roi_file_watcher import ROIFileWatcher
+from ._roi_gallery_model import ROIGalleryModel
+from ._roi_label_lod import ROILabelLOD
 from ._roi_layer_accessor import ROILayerAccessor
+from ._roi_layer_manager import ROILayerManager
+from ._roi_overview import ROIOverview
+from ._roi_selection_synchronizer import ROISelectionSynchronizer
+from ._roi_server import ROIServer
 from ._roi_table_model import ROITableModel
 
-__all__ = ["ROILayerAccessor", "ROITableModel"]
+__all__ = [
+    "ROIFileWatcher",
+    "ROIGalleryModel",
+    "ROILabelLOD",
+    "ROILayerAccessor",
+    "ROILayerManager",
+    "ROIOverview",
+    "ROISelectionSynchronizer",
+    "ROIServer",
+    "ROITableModel",
+]
@@ -0,0 +1,74 @@
+from os import PathLike
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+import pandas as pd
+from napari.qt.threading import create_worker
+from qtpy.QtCore import QObject, QTimer, Signal
+
+from .._roi_file import read_roi_file
+
+
+class ROIFileWatcher(QObject):
+    DEFAULT_INTERVAL = 1000  # milliseconds
+
+    roi_file_changed = Signal(object)  # pd.DataFrame
+
+    def __init__(
+        self,
+        roi_file: Union[str, PathLike],
+        interval: int = DEFAULT_INTERVAL,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super(ROIFileWatcher, self).__init__(parent=parent)
+        self._roi_file = Path(roi_file)
+        self._stat = self._get_stat()
+        self._reading = False
+        # polling is more robust than file system events for atomic replacements
+        self._timer = QTimer(parent=self)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self._on_timer_timeout)
+
+    def start(self) -> None:
+        self._timer.start()
+
+    def stop(self) -> None:
+        self._timer.stop()
+
+    def ignore_changes(self) -> None:
+        self._stat = self._get_stat()
+
+    def _on_timer_timeout(self) -> None:
+        stat = self._get_stat()
+        if stat != self._stat and not self._reading:
+            self._stat = stat
+            if stat is not None:
+                self._reading = True
+                # parse errors (e.g. incomplete files) are retried on the next change
+                create_worker(
+                    read_roi_file,
+                    self._roi_file,
+                    _connect={
+                        "returned": self._on_roi_file_read,
+                        "finished": self._on_roi_file_read_finished,
+                    },
+                    _ignore_errors=True,
+                )
+
+    def _on_roi_file_read(self, df: pd.DataFrame) -> None:
+        if self._timer.isActive():
+            self.roi_file_changed.emit(df)
+
+    def _on_roi_file_read_finished(self) -> None:
+        self._reading = False
+
+    def _get_stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self._roi_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    @property
+    def roi_file(self) -> Path:
+        return self._roi_file
@@ -0,0 +1,160 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Sequence, Tuple
+
+import numpy as np
+from napari.layers import Image
+from napari.qt.threading import create_worker
+from napari.viewer import Viewer
+from qtpy.QtCore import QAbstractListModel, QModelIndex, QObject, QSize, Qt
+from qtpy.QtGui import QColor, QImage, QPixmap
+
+from .._roi_thumbnails import crop_thumbnail
+from ._roi_layer_accessor import ROILayerAccessor
+
+
+class ROIGalleryModel(QAbstractListModel):
+    DEFAULT_THUMBNAIL_SIZE = 96  # pixels
+    DEFAULT_MAX_CACHED_THUMBNAILS = 2000
+
+    def __init__(
+        self,
+        viewer: Viewer,
+        roi_layer_accessor: Optional[ROILayerAccessor] = None,
+        image_layer: Optional[Image] = None,
+        thumbnail_size: int = DEFAULT_THUMBNAIL_SIZE,
+        max_cached_thumbnails: int = DEFAULT_MAX_CACHED_THUMBNAILS,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super(ROIGalleryModel, self).__init__(parent=parent)
+        self._viewer = viewer
+        self._roi_layer_accessor = roi_layer_accessor
+        self._image_layer = image_layer
+        self._thumbnail_size = thumbnail_size
+        self._max_cached_thumbnails = max_cached_thumbnails
+        # thumbnails by image and ROI box, such that changed ROIs are re-rendered
+        self._thumbnail_cache: "OrderedDict[Hashable, QPixmap]" = OrderedDict()
+        self._pending_rows: Dict[Hashable, int] = {}
+        self._placeholder = QPixmap(thumbnail_size, thumbnail_size)
+        self._placeholder.fill(QColor("black"))
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid() or self._roi_layer_accessor is None:
+            return 0
+        return len(self._roi_layer_accessor)
+
+    def data(
+        self,
+        index: QModelIndex,
+        role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if not 0 <= index.row() < self.rowCount():
+            return None
+        assert self._roi_layer_accessor is not None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            return self._roi_layer_accessor[index.row()].name
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._get_thumbnail(index.row())
+        if role == Qt.ItemDataRole.SizeHintRole:
+            return QSize(self._thumbnail_size + 8, self._thumbnail_size + 24)
+        return None
+
+    def reset(self) -> None:
+        # pending thumbnails are kept, such that finished crops are not discarded
+        self.beginResetModel()
+        self.endResetModel()
+
+    def clear_cache(self) -> None:
+        self._thumbnail_cache.clear()
+        self.reset()
+
+    def _get_thumbnail(self, row: int) -> QPixmap:
+        if self._image_layer is None:
+            return self._placeholder
+        assert self._roi_layer_accessor is not None
+        box = self._roi_layer_accessor.boxes[row]
+        leading_index = self._get_leading_index()
+        contrast_limits = tuple(self._image_layer.contrast_limits)
+        key = (id(self._image_layer), leading_index, contrast_limits, tuple(box))
+        thumbnail = self._thumbnail_cache.get(key)
+        if thumbnail is not None:
+            self._thumbnail_cache.move_to_end(key)
+            return thumbnail
+        if key not in self._pending_rows:
+            # only requested for visible items, rendered on a worker thread
+            levels = self._image_layer.data
+            if not self._image_layer.multiscale:
+                levels = [levels]
+            create_worker(
+                crop_thumbnail,
+                levels,
+                box,
+                self._thumbnail_size,
+                contrast_limits=contrast_limits,
+                leading_index=leading_index,
+                rgb=self._image_layer.rgb,
+                _connect={
+                    "returned": lambda thumbnail: self._on_thumbnail_cropped(
+                        key, thumbnail
+                    ),
+                    "errored": lambda e: self._pending_rows.pop(key, None),
+                },
+                _ignore_errors=True,
+            )
+        self._pending_rows[key] = row
+        return self._placeholder
+
+    def _on_thumbnail_cropped(self, key: Hashable, thumbnail: np.ndarray) -> None:
+        row = self._pending_rows.pop(key, None)
+        thumbnail = np.ascontiguousarray(thumbnail)
+        height, width = thumbnail.shape[:2]
+        if thumbnail.ndim == 3:
+            image = QImage(
+                thumbnail.data, width, height, 3 * width, QImage.Format.Format_RGB888
+            )
+        else:
+            image = QImage(
+                thumbnail.data, width, height, width, QImage.Format.Format_Grayscale8
+            )
+        self._thumbnail_cache[key] = QPixmap.fromImage(image)  # copies the data
+        while len(self._thumbnail_cache) > self._max_cached_thumbnails:
+            self._thumbnail_cache.popitem(last=False)  # least recently used
+        if row is not None and row < self.rowCount():
+            # the row may show another ROI after a reset, which is re-rendered
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def _get_leading_index(self) -> Tuple[int, ...]:
+        assert self._image_layer is not None
+        n_leading = self._image_layer.ndim - 2
+        if n_leading <= 0:
+            return ()
+        data_point = self._image_layer.world_to_data(self._viewer.dims.point)
+        level_shape: Sequence[int] = self._image_layer.level_shapes[0]
+        return tuple(
+            int(np.clip(round(value), 0, n - 1))
+            for value, n in zip(data_point[:n_leading], level_shape[:n_leading])
+        )
+
+    @property
+    def roi_layer_accessor(self) -> Optional[ROILayerAccessor]:
+        return self._roi_layer_accessor
+
+    @roi_layer_accessor.setter
+    def roi_layer_accessor(
+        self, roi_layer_accessor: Optional[ROILayerAccessor]
+    ) -> None:
+        self._roi_layer_accessor = roi_layer_accessor
+        self.reset()
+
+    @property
+    def image_layer(self) -> Optional[Image]:
+        return self._image_layer
+
+    @image_layer.setter
+    def image_layer(self, image_layer: Optional[Image]) -> None:
+        self._image_layer = image_layer
+        self.clear_cache()
+
+    @property
+    def thumbnail_size(self) -> int:
+        return self._thumbnail_size
@@ -0,0 +1,133 @@
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from napari.layers import Points
+from napari.utils.events import Event
+from napari.viewer import Viewer
+from qtpy.QtCore import QObject, QTimer
+
+from .._roi_boxes import find_visible_boxes
+from ._roi_layer_accessor import ROILayerAccessor
+from .utils import get_layer_view_extent, insert_layer
+
+
+class ROILabelLOD(QObject):
+    DEFAULT_MIN_LABEL_SIZE = ROILayerAccessor.DEFAULT_MIN_LABEL_SIZE  # pixels
+    DEFAULT_MAX_LABEL_COUNT = 1000
+    DEFAULT_INTERVAL = 100  # milliseconds
+
+    def __init__(
+        self,
+        viewer: Viewer,
+        roi_layer_accessor: ROILayerAccessor,
+        text_color: str = "red",
+        min_label_size: float = DEFAULT_MIN_LABEL_SIZE,
+        max_label_count: int = DEFAULT_MAX_LABEL_COUNT,
+        interval: int = DEFAULT_INTERVAL,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super(ROILabelLOD, self).__init__(parent=parent)
+        self._viewer = viewer
+        self._roi_layer_accessor = roi_layer_accessor
+        self._text_color = text_color
+        self._min_label_size = min_label_size
+        self._max_label_count = max_label_count
+        self._label_layer: Optional[Points] = None
+        # throttle camera events, which are emitted for every frame when panning
+        self._timer = QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.update)
+        roi_layer = roi_layer_accessor.layer
+        roi_layer.text.visible = False  # labels are shown by the label layer
+        self._viewer.camera.events.center.connect(self._on_changed)
+        self._viewer.camera.events.zoom.connect(self._on_changed)
+        roi_layer.events.data.connect(self._on_changed)
+        roi_layer.events.properties.connect(self._on_changed)
+        roi_layer.events.visible.connect(self._on_changed)
+        roi_layer.events.name.connect(self._on_changed)
+        self.update()
+
+    def close(self) -> None:
+        self._timer.stop()
+        roi_layer = self._roi_layer_accessor.layer
+        self._viewer.camera.events.center.disconnect(self._on_changed)
+        self._viewer.camera.events.zoom.disconnect(self._on_changed)
+        roi_layer.events.data.disconnect(self._on_changed)
+        roi_layer.events.properties.disconnect(self._on_changed)
+        roi_layer.events.visible.disconnect(self._on_changed)
+        roi_layer.events.name.disconnect(self._on_changed)
+        if self._label_layer is not None and self._label_layer in self._viewer.layers:
+            self._viewer.layers.remove(self._label_layer)
+        self._label_layer = None
+        roi_layer.text.visible = True
+
+    def update(self) -> None:
+        roi_layer = self._roi_layer_accessor.layer
+        boxes = self._roi_layer_accessor.boxes
+        scale = np.asarray(roi_layer.scale[-2:], dtype=float)
+        translate = np.asarray(roi_layer.translate[-2:], dtype=float)
+        indices = find_visible_boxes(
+            boxes,
+            get_layer_view_extent(self._viewer, roi_layer),
+            min_width=self._min_label_size / (self._viewer.camera.zoom * abs(scale[1])),
+            max_count=self._max_label_count,
+        )
+        label_layer = self._get_label_layer()
+        label_layer.scale = scale
+        label_layer.translate = translate
+        label_layer.visible = roi_layer.visible
+        label_layer.name = f"{roi_layer.name} labels"
+        visible_boxes = boxes[indices]
+        label_layer.data = (visible_boxes[:, :2] + visible_boxes[:, 2:]) / 2.0
+        label_layer.features = pd.DataFrame(
+            {
+                ROILayerAccessor.ROI_NAME_FEATURES_KEY: (
+                    self._roi_layer_accessor.roi_names[indices]
+                )
+            }
+        )
+        label_layer.refresh_text()
+
+    def _on_changed(self, event: Event) -> None:
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _get_label_layer(self) -> Points:
+        if self._label_layer is None or self._label_layer not in self._viewer.layers:
+            roi_layer = self._roi_layer_accessor.layer
+            self._label_layer = Points(
+                ndim=2,
+                size=0,
+                face_color="transparent",
+                edge_width=0,
+                features={ROILayerAccessor.ROI_NAME_FEATURES_KEY: np.empty(0, str)},
+                text={
+                    "string": ROILayerAccessor.ROI_NAME_FEATURES_KEY,
+                    "color": self._text_color,
+                    "anchor": "center",
+                },
+                name=f"{roi_layer.name} labels",
+            )
+            self._label_layer.editable = False
+            index = self._viewer.layers.index(roi_layer) + 1
+            insert_layer(self._viewer, index, self._label_layer)
+        return self._label_layer
+
+    @property
+    def roi_layer_accessor(self) -> ROILayerAccessor:
+        return self._roi_layer_accessor
+
+    @property
+    def label_layer(self) -> Optional[Points]:
+        return self._label_layer
+
+    @property
+    def min_label_size(self) -> float:
+        return self._min_label_size
+
+    @min_label_size.setter
+    def min_label_size(self, min_label_size: float) -> None:
+        self._min_label_size = min_label_size
+        self.update()
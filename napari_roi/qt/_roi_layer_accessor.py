@@ -1,31 +1,73 @@
+import re
 from collections.abc import MutableSequence
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import pandas as pd
 from napari.layers import Shapes
 from napari.layers.utils.layer_utils import features_to_pandas_dataframe
+from napari.utils.events import Event
 
 from .. import ROIBase, ROIOrigin
+from .._roi_boxes import (
+    boxes_to_rectangles,
+    boxes_to_xy,
+    is_axis_aligned,
+    shapes_to_boxes,
+    transform_boxes,
+    transform_points,
+    xywh_to_boxes,
+)
+from .._roi_file import (
+    ROI_ATTRIBUTE_TYPES,
+    ROI_FILE_COLUMNS,
+    ROI_FILE_COORDINATES_KEY,
+    ROI_FILE_TRANSFORM_KEY,
+    ROI_FILE_UNIT_KEY,
+    ROI_FILE_WORLD_COORDINATES,
+    boxes_to_roi_file,
+    get_roi_attribute_type,
+)
+from .._roi_query import create_roi_query_frame, query_rois
+from .._roi_snapshot import ROISnapshot
+from .utils import get_layer_data_to_world_matrix
 
 
 class ROILayerAccessor(MutableSequence[ROIBase]):
     ROI_NAME_FEATURES_KEY = "roi_name"
+    # features starting with this prefix are not ROI attributes
+    RESERVED_FEATURES_KEY_PREFIX = "roi_"
 
     NEW_ROI_NAME_METADATA_KEY = "new_roi_name"
     NEW_ROI_WIDTH_METADATA_KEY = "new_roi_width"
     NEW_ROI_HEIGHT_METADATA_KEY = "new_roi_height"
+    ROI_GRID_OVERLAP_METADATA_KEY = "roi_grid_overlap"
     ROI_ORIGIN_METADATA_KEY = "roi_origin"
     ROI_FILE_METADATA_KEY = "roi_file"
     AUTOSAVE_ROI_FILE_METADATA_KEY = "autosave_roi_file"
+    JOURNAL_ROI_FILE_METADATA_KEY = "journal_roi_file"
+    WATCH_ROI_FILE_METADATA_KEY = "watch_roi_file"
+    LABEL_LOD_METADATA_KEY = "label_lod"
+    MIN_LABEL_SIZE_METADATA_KEY = "min_label_size"
+    WORLD_COORDINATES_METADATA_KEY = "world_coordinates"
+    ROI_UNIT_METADATA_KEY = "roi_unit"
+    # napari does not preserve feature types when adding shapes
+    ATTRIBUTE_TYPES_METADATA_KEY = "attribute_types"
 
     DEFAULT_NEW_ROI_NAME = "New ROI"
     DEFAULT_NEW_ROI_WIDTH = 100.0
     DEFAULT_NEW_ROI_HEIGHT = 100.0
+    DEFAULT_ROI_GRID_OVERLAP = 0.0
     DEFAULT_ROI_ORIGIN = ROIOrigin.CENTER
     DEFAULT_ROI_FILE = ""
     DEFAULT_AUTOSAVE_ROI_FILE = False
+    DEFAULT_JOURNAL_ROI_FILE = False
+    DEFAULT_WATCH_ROI_FILE = False
+    DEFAULT_LABEL_LOD = False
+    DEFAULT_MIN_LABEL_SIZE = 50.0
+    DEFAULT_WORLD_COORDINATES = False
+    DEFAULT_ROI_UNIT = ""
 
     class ItemAccessor(ROIBase):
         def __init__(self, parent: "ROILayerAccessor", index: int) -> None:
@@ -33,25 +75,19 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
             self._index = index
 
         def insert(self, roi: ROIBase) -> None:
-            layer_data = self._parent._layer.data.copy()
-            layer_data.insert(self._index, self._create_rectangle_data(roi))
-            self._parent._layer.data = layer_data  # appends a row to features
-            layer_features = features_to_pandas_dataframe(self._parent._layer.features)
-            layer_features = pd.concat(
-                (
-                    layer_features.iloc[: self._index],
-                    layer_features.iloc[[-1]],
-                    layer_features.iloc[self._index : -1],
-                ),
-                ignore_index=True,
-            )  # move appended row to desired index
-            layer_features[ROILayerAccessor.ROI_NAME_FEATURES_KEY].iloc[
-                self._index
-            ] = roi.name
-            self._parent._layer.features = layer_features
+            boxes = xywh_to_boxes(
+                np.asarray(roi.x),
+                np.asarray(roi.y),
+                np.asarray(roi.width),
+                np.asarray(roi.height),
+                self._parent.roi_origin,
+            )
+            self._parent.insert_rectangles(
+                self._index, [roi.name], self._parent.roi_boxes_to_rectangles(boxes)
+            )
 
         def delete(self) -> None:
-            layer_features = features_to_pandas_dataframe(self._parent._layer.features)
+            layer_features = self._parent._get_layer_features()
             layer_features = pd.concat(
                 (
                     layer_features.iloc[: self._index],
@@ -60,7 +96,7 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
                 ),
                 ignore_index=True,
             )  # move deleted row to the end
-            self._parent._layer.features = layer_features
+            self._parent._set_layer_features(layer_features)
             layer_data = self._parent._layer.data.copy()
             del layer_data[self._index]
             self._parent._layer.data = layer_data  # removes last row from features
@@ -89,22 +125,26 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
             layer_data = self._parent._layer.data.copy()
             layer_data[self._index] = data
             self._parent._layer.data = layer_data
+            self._parent.invalidate_boxes([self._index])
 
         @property
         def features(self) -> pd.Series:
-            layer_features = features_to_pandas_dataframe(self._parent._layer.features)
+            layer_features = self._parent._get_layer_features()
             return layer_features.iloc[self._index]
 
         @features.setter
         def features(self, features: pd.Series) -> None:
-            layer_features = features_to_pandas_dataframe(self._parent._layer.features)
+            layer_features = self._parent._get_layer_features()
             layer_features = layer_features.copy()
             layer_features.iloc[self._index] = features
-            self._parent._layer.features = layer_features
+            self._parent._set_layer_features(layer_features)
 
         @property
         def name(self) -> str:
-            return str(self.features[ROILayerAccessor.ROI_NAME_FEATURES_KEY])
+            layer_features = self._parent._get_layer_features()
+            return str(
+                layer_features[ROILayerAccessor.ROI_NAME_FEATURES_KEY].iloc[self._index]
+            )
 
         @name.setter
         def name(self, name: str) -> None:
@@ -114,118 +154,60 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
 
         @property
         def x(self) -> float:
-            if self._parent.roi_origin == ROIOrigin.CENTER:
-                return 0.5 * (
-                    float(np.amin(self.data[:, -1])) + float(np.amax(self.data[:, -1]))
-                )
-            if self._parent.roi_origin in (
-                ROIOrigin.TOP_LEFT,
-                ROIOrigin.BOTTOM_LEFT,
-            ):
-                return float(np.amin(self.data[:, -1]))
-            if self._parent.roi_origin in (
-                ROIOrigin.TOP_RIGHT,
-                ROIOrigin.BOTTOM_RIGHT,
-            ):
-                return float(np.amax(self.data[:, -1]))
-            raise NotImplementedError()
+            return float(self._parent.roi_xy[0][self._index])
 
         @x.setter
         def x(self, x: float) -> None:
-            self.data += np.array([[0.0, x - self.x]])
+            self._transform_data(_translation_matrix(0.0, x - self.x))
 
         @property
         def y(self) -> float:
-            if self._parent.roi_origin == ROIOrigin.CENTER:
-                return 0.5 * (
-                    float(np.amin(self.data[:, -2])) + float(np.amax(self.data[:, -2]))
-                )
-            if self._parent.roi_origin in (
-                ROIOrigin.TOP_LEFT,
-                ROIOrigin.TOP_RIGHT,
-            ):
-                return float(np.amin(self.data[:, -2]))
-            if self._parent.roi_origin in (
-                ROIOrigin.BOTTOM_LEFT,
-                ROIOrigin.BOTTOM_RIGHT,
-            ):
-                return float(np.amax(self.data[:, -2]))
-            raise NotImplementedError()
+            return float(self._parent.roi_xy[1][self._index])
 
         @y.setter
         def y(self, y: float) -> None:
-            self.data += np.array([[y - self.y, 0.0]])
+            self._transform_data(_translation_matrix(y - self.y, 0.0))
 
         @property
         def width(self) -> float:
-            return float(np.amax(self.data[:, -1]) - np.amin(self.data[:, -1]))
+            box = self._parent.roi_boxes[self._index]
+            return float(box[3] - box[1])
 
         @width.setter
         def width(self, width: float) -> None:
-            origin = np.array([[self.y, self.x]])
-            scale = np.array([[1.0, width / self.width]])
-            self.data = (self.data - origin) * scale + origin
+            self._transform_data(
+                _scaling_matrix(1.0, width / self.width, self.y, self.x)
+            )
 
         @property
         def height(self) -> float:
-            return float(np.amax(self.data[:, -2]) - np.amin(self.data[:, -2]))
+            box = self._parent.roi_boxes[self._index]
+            return float(box[2] - box[0])
 
         @height.setter
         def height(self, height: float) -> None:
-            origin = np.array([[self.y, self.x]])
-            scale = np.array([[height / self.height, 1.0]])
-            self.data = (self.data - origin) * scale + origin
-
-        def _create_rectangle_data(self, roi: ROIBase) -> np.ndarray:
-            if self._parent.roi_origin == ROIOrigin.CENTER:
-                return np.array(
-                    [
-                        [roi.y - roi.height / 2.0, roi.x - roi.width / 2.0],
-                        [roi.y - roi.height / 2.0, roi.x + roi.width / 2.0],
-                        [roi.y + roi.height / 2.0, roi.x + roi.width / 2.0],
-                        [roi.y + roi.height / 2.0, roi.x - roi.width / 2.0],
-                    ]
-                )
-            if self._parent.roi_origin == ROIOrigin.TOP_LEFT:
-                return np.array(
-                    [
-                        [roi.y, roi.x],
-                        [roi.y, roi.x + roi.width],
-                        [roi.y + roi.height, roi.x + roi.width],
-                        [roi.y + roi.height, roi.x],
-                    ]
-                )
-            if self._parent.roi_origin == ROIOrigin.TOP_RIGHT:
-                return np.array(
-                    [
-                        [roi.y, roi.x - roi.width],
-                        [roi.y, roi.x],
-                        [roi.y + roi.height, roi.x],
-                        [roi.y + roi.height, roi.x - roi.width],
-                    ]
-                )
-            if self._parent.roi_origin == ROIOrigin.BOTTOM_LEFT:
-                return np.array(
-                    [
-                        [roi.y - roi.height, roi.x],
-                        [roi.y - roi.height, roi.x + roi.width],
-                        [roi.y, roi.x + roi.width],
-                        [roi.y, roi.x],
-                    ]
-                )
-            if self._parent.roi_origin == ROIOrigin.BOTTOM_RIGHT:
-                return np.array(
-                    [
-                        [roi.y - roi.height, roi.x - roi.width],
-                        [roi.y - roi.height, roi.x],
-                        [roi.y, roi.x],
-                        [roi.y, roi.x - roi.width],
-                    ]
-                )
-            raise NotImplementedError()
+            self._transform_data(
+                _scaling_matrix(height / self.height, 1.0, self.y, self.x)
+            )
+
+        def _transform_data(self, matrix: np.ndarray) -> None:
+            # matrix is given in ROI coordinates, i.e. data or world coordinates
+            roi_matrix = self._parent.roi_matrix
+            self.data = transform_points(
+                self.data, np.linalg.inv(roi_matrix) @ matrix @ roi_matrix
+            )
 
     def __init__(self, layer: Shapes) -> None:
         self._layer = layer
+        self._boxes: Optional[np.ndarray] = None
+        # incremented on every change, such that stale ROI snapshots can be detected
+        self._version = 0
+        self._roi_xy_cache: Optional[
+            Tuple[np.ndarray, ROIOrigin, Tuple[np.ndarray, np.ndarray]]
+        ] = None
+        self._world_boxes_cache: Optional[
+            Tuple[np.ndarray, np.ndarray, np.ndarray]
+        ] = None
         if self.ROI_NAME_FEATURES_KEY not in layer.features:
             layer.features[self.ROI_NAME_FEATURES_KEY] = ""
         if self.ROI_NAME_FEATURES_KEY not in layer.feature_defaults:
@@ -238,6 +220,10 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
             layer.metadata[
                 self.NEW_ROI_HEIGHT_METADATA_KEY
             ] = self.DEFAULT_NEW_ROI_HEIGHT
+        if self.ROI_GRID_OVERLAP_METADATA_KEY not in layer.metadata:
+            layer.metadata[
+                self.ROI_GRID_OVERLAP_METADATA_KEY
+            ] = self.DEFAULT_ROI_GRID_OVERLAP
         if self.ROI_ORIGIN_METADATA_KEY not in layer.metadata:
             layer.metadata[self.ROI_ORIGIN_METADATA_KEY] = self.DEFAULT_ROI_ORIGIN
         if self.ROI_FILE_METADATA_KEY not in layer.metadata:
@@ -246,6 +232,30 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
             layer.metadata[
                 self.AUTOSAVE_ROI_FILE_METADATA_KEY
             ] = self.DEFAULT_AUTOSAVE_ROI_FILE
+        if self.JOURNAL_ROI_FILE_METADATA_KEY not in layer.metadata:
+            layer.metadata[
+                self.JOURNAL_ROI_FILE_METADATA_KEY
+            ] = self.DEFAULT_JOURNAL_ROI_FILE
+        if self.WATCH_ROI_FILE_METADATA_KEY not in layer.metadata:
+            layer.metadata[
+                self.WATCH_ROI_FILE_METADATA_KEY
+            ] = self.DEFAULT_WATCH_ROI_FILE
+        if self.LABEL_LOD_METADATA_KEY not in layer.metadata:
+            layer.metadata[self.LABEL_LOD_METADATA_KEY] = self.DEFAULT_LABEL_LOD
+        if self.MIN_LABEL_SIZE_METADATA_KEY not in layer.metadata:
+            layer.metadata[
+                self.MIN_LABEL_SIZE_METADATA_KEY
+            ] = self.DEFAULT_MIN_LABEL_SIZE
+        if self.WORLD_COORDINATES_METADATA_KEY not in layer.metadata:
+            layer.metadata[
+                self.WORLD_COORDINATES_METADATA_KEY
+            ] = self.DEFAULT_WORLD_COORDINATES
+        if self.ROI_UNIT_METADATA_KEY not in layer.metadata:
+            layer.metadata[self.ROI_UNIT_METADATA_KEY] = self.DEFAULT_ROI_UNIT
+        if self.ATTRIBUTE_TYPES_METADATA_KEY not in layer.metadata:
+            layer.metadata[self.ATTRIBUTE_TYPES_METADATA_KEY] = {}
+        layer.events.data.connect(self._on_layer_data_changed)
+        layer.events.features.connect(self._on_layer_features_changed)
 
     def insert(self, index: int, roi: ROIBase) -> None:
         ROILayerAccessor.ItemAccessor(self, index).insert(roi)
@@ -274,10 +284,440 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
     def __len__(self) -> int:
         return len(self._layer.data)
 
+    def close(self) -> None:
+        self._layer.events.data.disconnect(self._on_layer_data_changed)
+        self._layer.events.features.disconnect(self._on_layer_features_changed)
+
+    def insert_boxes(
+        self,
+        index: int,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        self.insert_rectangles(
+            index, roi_names, boxes_to_rectangles(boxes), attributes=attributes
+        )
+
+    def insert_rectangles(
+        self,
+        index: int,
+        roi_names: Union[Sequence[str], np.ndarray],
+        rectangles: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        if len(rectangles) != len(roi_names):
+            raise ValueError("Number of ROI names and boxes differ")
+        if attributes is not None and len(attributes) != len(roi_names):
+            raise ValueError("Number of ROI names and attributes differ")
+        if len(rectangles) == 0:
+            return
+        n = len(self._layer.data)
+        if index < 0:
+            index = n + index
+        if index < 0 or index > n:
+            raise IndexError()
+        # validate the attributes before modifying the layer
+        new_attribute_types: Dict[str, str] = {}
+        converted_attribute_values: Dict[str, pd.Series] = {}
+        if attributes is not None:
+            attribute_types = self.attribute_types
+            for attribute_name in attributes.columns:
+                if attribute_name in attribute_types:
+                    attribute_type = attribute_types[attribute_name]
+                else:
+                    self._check_attribute_name(attribute_name)
+                    attribute_type = get_roi_attribute_type(attributes[attribute_name])
+                    new_attribute_types[attribute_name] = attribute_type
+                converted_attribute_values[attribute_name] = _convert_attribute_values(
+                    attributes[attribute_name], attribute_type, attribute_name
+                )  # raises ValueError
+        if index == n:
+            self._layer.add(rectangles, shape_type="rectangle")
+        else:
+            layer_data = list(zip(self._layer.data, self._layer.shape_type))
+            layer_data[index:index] = [(r, "rectangle") for r in rectangles]
+            self._layer.data = layer_data  # appends rows to features
+        layer_features = self._get_layer_features()
+        new_layer_features = layer_features.iloc[n:].copy()
+        new_layer_features[self.ROI_NAME_FEATURES_KEY] = list(roi_names)
+        layer_features = pd.concat(
+            (
+                layer_features.iloc[:index],
+                new_layer_features,
+                layer_features.iloc[index:n],
+            ),
+            ignore_index=True,
+        )  # move appended rows to desired index
+        indices = np.arange(index, index + len(rectangles))
+        for attribute_name, attribute_type in new_attribute_types.items():
+            layer_features[attribute_name] = _create_attribute_column(
+                attribute_type, len(layer_features)
+            )
+        for attribute_name, converted_values in converted_attribute_values.items():
+            layer_features[attribute_name] = _set_attribute_column_values(
+                layer_features[attribute_name], indices, converted_values
+            )
+        self._set_layer_features(layer_features)
+        if self._boxes is not None and len(self._boxes) == n:
+            # splice the new boxes instead of re-deriving all boxes from the layer
+            rectangles = np.asarray(rectangles, dtype=float)[..., -2:]
+            boxes = np.concatenate(
+                (
+                    self._boxes[:index],
+                    np.column_stack((rectangles.min(axis=1), rectangles.max(axis=1))),
+                    self._boxes[index:],
+                )
+            )
+            boxes.flags.writeable = False
+            self.invalidate_boxes()
+            self._boxes = boxes
+        else:
+            self.invalidate_boxes()
+
+    def update_boxes(self, indices: Iterable[int], boxes: np.ndarray) -> None:
+        self.update_rectangles(indices, boxes_to_rectangles(boxes))
+
+    def update_rectangles(self, indices: Iterable[int], rectangles: np.ndarray) -> None:
+        indices = np.asarray(list(indices), dtype=int)
+        if len(rectangles) != len(indices):
+            raise ValueError("Number of indices and boxes differ")
+        if len(indices) == 0:
+            return
+        layer_data = list(zip(self._layer.data, self._layer.shape_type))
+        for index, rectangle in zip(indices, rectangles):
+            layer_data[index] = (rectangle, "rectangle")
+        self._layer.data = layer_data
+        self.invalidate_boxes(indices)
+
+    def delete_rois(self, indices: Iterable[int]) -> None:
+        n = len(self._layer.data)
+        keep_mask = np.ones(n, dtype=bool)
+        keep_mask[np.asarray(list(indices), dtype=int)] = False
+        if keep_mask.all():
+            return
+        layer_features = self._get_layer_features()
+        self._layer.data = [
+            (data, shape_type)
+            for data, shape_type, keep in zip(
+                self._layer.data, self._layer.shape_type, keep_mask
+            )
+            if keep
+        ]
+        # features are not trimmed when removing all shapes
+        self._set_layer_features(layer_features.iloc[keep_mask].reset_index(drop=True))
+        self.invalidate_boxes()
+
+    def apply_rectangle_changes(
+        self,
+        deleted_indices: Iterable[int],
+        updated_indices: Iterable[int],
+        updated_rectangles: np.ndarray,
+        inserted_roi_names: Union[Sequence[str], np.ndarray],
+        inserted_rectangles: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        # updates, deletes and appends ROIs in a single layer update; attributes,
+        # if specified, replace the ROI attributes of all ROIs after the update
+        deleted = np.unique(np.asarray(list(deleted_indices), dtype=int))
+        updated = np.asarray(list(updated_indices), dtype=int)
+        if len(updated_rectangles) != len(updated):
+            raise ValueError("Number of indices and boxes differ")
+        if len(inserted_rectangles) != len(inserted_roi_names):
+            raise ValueError("Number of ROI names and boxes differ")
+        n = len(self._layer.data)
+        if attributes is not None and len(attributes) != n - len(deleted) + len(
+            inserted_roi_names
+        ):
+            raise ValueError("Number of ROIs and attributes differ")
+        keep_mask = np.ones(n, dtype=bool)
+        keep_mask[deleted] = False
+        layer_data = list(zip(self._layer.data, self._layer.shape_type))
+        for index, rectangle in zip(updated, updated_rectangles):
+            layer_data[index] = (rectangle, "rectangle")
+        layer_data = [d for d, keep in zip(layer_data, keep_mask) if keep]
+        layer_data += [(r, "rectangle") for r in inserted_rectangles]
+        layer_features = self._get_layer_features()
+        new_layer_features = (
+            features_to_pandas_dataframe(self._layer.feature_defaults)
+            .iloc[[0] * len(inserted_roi_names)]
+            .copy()
+        )
+        new_layer_features[self.ROI_NAME_FEATURES_KEY] = list(inserted_roi_names)
+        layer_features = pd.concat(
+            (layer_features.iloc[keep_mask], new_layer_features), ignore_index=True
+        )
+        if attributes is not None:
+            layer_features = layer_features.drop(columns=self.attribute_names)
+            for attribute_name in attributes.columns:
+                self._check_attribute_name(attribute_name)
+                values = attributes[attribute_name].reset_index(drop=True)
+                layer_features[attribute_name] = values.astype(
+                    get_roi_attribute_type(values)
+                )
+        if len(deleted) > 0 or len(updated) > 0 or len(inserted_roi_names) > 0:
+            self._layer.data = layer_data
+        self._set_layer_features(layer_features)
+        self.invalidate_boxes()
+
+    def rename_rois(
+        self, indices: Iterable[int], roi_names: Union[Sequence[str], np.ndarray]
+    ) -> None:
+        indices = np.asarray(list(indices), dtype=int)
+        if len(indices) != len(roi_names):
+            raise ValueError("Number of indices and ROI names differ")
+        layer_features = self._get_layer_features().copy()
+        column = layer_features.columns.get_loc(self.ROI_NAME_FEATURES_KEY)
+        layer_features.iloc[indices, column] = np.asarray(roi_names, dtype=str)
+        self._set_layer_features(layer_features)
+
+    def add_attribute(
+        self, attribute_name: str, attribute_type: str = "category", default: Any = None
+    ) -> None:
+        self._check_attribute_name(attribute_name)
+        if attribute_name in self._layer.features.columns:
+            raise ValueError(f"ROI attribute {attribute_name} already exists")
+        if attribute_type not in ROI_ATTRIBUTE_TYPES:
+            raise ValueError(f"Unsupported ROI attribute type: {attribute_type}")
+        layer_features = self._get_layer_features().copy()
+        layer_features[attribute_name] = _create_attribute_column(
+            attribute_type, len(layer_features), default=default
+        )
+        self._set_layer_features(layer_features)
+        if default is not None:
+            self._layer.feature_defaults[attribute_name] = default
+
+    def remove_attribute(self, attribute_name: str) -> None:
+        if attribute_name not in self.attribute_names:
+            raise ValueError(f"Unknown ROI attribute: {attribute_name}")
+        layer_features = self._get_layer_features()
+        self._set_layer_features(layer_features.drop(columns=attribute_name))
+
+    def set_attribute_values(
+        self, indices: Iterable[int], attribute_name: str, values: Sequence[Any]
+    ) -> None:
+        indices = np.asarray(list(indices), dtype=int)
+        if len(indices) != len(values):
+            raise ValueError("Number of indices and values differ")
+        if attribute_name not in self.attribute_names:
+            raise ValueError(f"Unknown ROI attribute: {attribute_name}")
+        attribute_type = self.attribute_types[attribute_name]
+        converted_values = _convert_attribute_values(  # raises ValueError
+            values, attribute_type, attribute_name
+        )
+        layer_features = self._get_layer_features().copy()
+        layer_features[attribute_name] = _set_attribute_column_values(
+            layer_features[attribute_name], indices, converted_values
+        )
+        self._set_layer_features(layer_features)
+
+    def invalidate_boxes(self, indices: Optional[Iterable[int]] = None) -> None:
+        self._version += 1
+        if indices is None or self._boxes is None:
+            self._boxes = None
+        else:
+            indices = np.asarray(list(indices), dtype=int)
+            if len(indices) > 0:
+                boxes = self._boxes.copy()
+                boxes[indices] = shapes_to_boxes([self._layer.data[i] for i in indices])
+                boxes.flags.writeable = False
+                self._boxes = boxes
+
+    def to_dataframe(self) -> pd.DataFrame:
+        df = boxes_to_roi_file(
+            self.roi_names, self.roi_boxes, self.roi_origin, attributes=self.attributes
+        )
+        df.attrs.update(self.roi_file_metadata)
+        return df
+
+    def query(self, expression: str) -> np.ndarray:
+        df = create_roi_query_frame(
+            self.roi_names, self.roi_boxes, self.roi_origin, attributes=self.attributes
+        )
+        return query_rois(df, expression)
+
+    def roi_boxes_to_rectangles(self, roi_boxes: np.ndarray) -> np.ndarray:
+        # rectangles in data coordinates, rotated for non-axis-aligned transforms
+        rectangles = boxes_to_rectangles(roi_boxes)
+        if self.world_coordinates:
+            rectangles = transform_points(rectangles, np.linalg.inv(self.roi_matrix))
+        return rectangles
+
+    def create_roi_names(self, count: int) -> List[str]:
+        desired_roi_name = self.new_roi_name
+        existing_roi_names = pd.Series(self.roi_names, dtype=object)
+        existing_roi_numbers = pd.to_numeric(
+            existing_roi_names.str.extract(
+                rf"^{re.escape(desired_roi_name)} \((\d+)\)$", expand=False
+            )
+        ).dropna()
+        roi_names: List[str] = []
+        if (
+            count > 0
+            and not (existing_roi_names == desired_roi_name).any()
+            and len(existing_roi_numbers) == 0
+        ):
+            roi_names.append(desired_roi_name)
+        roi_number = 2
+        if len(existing_roi_numbers) > 0:
+            roi_number = int(existing_roi_numbers.max()) + 1
+        roi_names += [
+            f"{desired_roi_name} ({n})"
+            for n in range(roi_number, roi_number + count - len(roi_names))
+        ]
+        return roi_names
+
+    def snapshot(self, vertices: bool = False) -> ROISnapshot:
+        return ROISnapshot(
+            self._version,
+            self.roi_names,
+            self.boxes,  # read-only, replaced on change
+            vertices=(
+                tuple(np.array(data) for data in self._layer.data) if vertices else None
+            ),
+        )
+
+    def _check_attribute_name(self, attribute_name: str) -> None:
+        if (
+            attribute_name == ""
+            or attribute_name.startswith(self.RESERVED_FEATURES_KEY_PREFIX)
+            or attribute_name in ROI_FILE_COLUMNS
+        ):
+            raise ValueError(f"Invalid ROI attribute name: {attribute_name}")
+
+    def _get_layer_features(self) -> pd.DataFrame:
+        layer_features = features_to_pandas_dataframe(self._layer.features)
+        return _cast_attribute_columns(layer_features, self.attribute_types)
+
+    def _set_layer_features(self, layer_features: pd.DataFrame) -> None:
+        declared_attribute_types = self._layer.metadata.get(
+            self.ATTRIBUTE_TYPES_METADATA_KEY, {}
+        )
+        attribute_types = {
+            str(column): str(dtype)
+            if str(dtype) in ROI_ATTRIBUTE_TYPES
+            else declared_attribute_types.get(str(column))
+            or get_roi_attribute_type(layer_features[column])
+            for column, dtype in layer_features.dtypes.items()
+            if not str(column).startswith(self.RESERVED_FEATURES_KEY_PREFIX)
+        }
+        self._layer.metadata[self.ATTRIBUTE_TYPES_METADATA_KEY] = attribute_types
+        self._layer.features = _cast_attribute_columns(layer_features, attribute_types)
+        self._version += 1
+
+    def _on_layer_data_changed(self, event: Event) -> None:
+        self.invalidate_boxes()
+        layer_features = features_to_pandas_dataframe(self._layer.features)
+        if any(
+            str(layer_features[attribute_name].dtype) != attribute_type
+            for attribute_name, attribute_type in self.attribute_types.items()
+        ):
+            # napari converts categorical features to objects when adding shapes
+            self._set_layer_features(layer_features)
+
+    def _on_layer_features_changed(self, event: Event) -> None:
+        self._version += 1
+
     @property
     def layer(self) -> Shapes:
         return self._layer
 
+    @property
+    def boxes(self) -> np.ndarray:
+        if self._boxes is None or len(self._boxes) != len(self._layer.data):
+            self._boxes = shapes_to_boxes(self._layer.data)
+            self._boxes.flags.writeable = False
+        return self._boxes
+
+    @property
+    def data_to_world_matrix(self) -> np.ndarray:
+        return get_layer_data_to_world_matrix(self._layer)
+
+    @property
+    def roi_matrix(self) -> np.ndarray:
+        if self.world_coordinates:
+            return self.data_to_world_matrix
+        return np.eye(3)
+
+    @property
+    def roi_boxes(self) -> np.ndarray:
+        if not self.world_coordinates:
+            return self.boxes
+        return self.world_boxes
+
+    @property
+    def world_boxes(self) -> np.ndarray:
+        boxes = self.boxes
+        matrix = self.data_to_world_matrix
+        if (
+            self._world_boxes_cache is None
+            or self._world_boxes_cache[0] is not boxes
+            or not np.array_equal(self._world_boxes_cache[1], matrix)
+        ):
+            if is_axis_aligned(matrix):
+                world_boxes = transform_boxes(boxes, matrix)
+            else:
+                # bounding boxes of the transformed vertices, not of transformed boxes
+                world_boxes = shapes_to_boxes(self._layer.data, matrix=matrix)
+            world_boxes.flags.writeable = False
+            self._world_boxes_cache = (boxes, matrix, world_boxes)
+        return self._world_boxes_cache[2]
+
+    @property
+    def roi_file_metadata(self) -> Dict[str, Any]:
+        if self.world_coordinates:
+            return {
+                ROI_FILE_COORDINATES_KEY: ROI_FILE_WORLD_COORDINATES,
+                ROI_FILE_UNIT_KEY: self.roi_unit,
+                ROI_FILE_TRANSFORM_KEY: self.data_to_world_matrix.tolist(),
+            }
+        return {}
+
+    @property
+    def roi_xy(self) -> Tuple[np.ndarray, np.ndarray]:
+        boxes = self.roi_boxes
+        roi_origin = self.roi_origin
+        if (
+            self._roi_xy_cache is None
+            or self._roi_xy_cache[0] is not boxes
+            or self._roi_xy_cache[1] != roi_origin
+        ):
+            self._roi_xy_cache = (boxes, roi_origin, boxes_to_xy(boxes, roi_origin))
+        return self._roi_xy_cache[2]
+
+    @property
+    def roi_names(self) -> np.ndarray:
+        layer_features = self._get_layer_features()
+        return layer_features[self.ROI_NAME_FEATURES_KEY].astype(str).to_numpy()
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def attribute_names(self) -> List[str]:
+        return [
+            str(c)
+            for c in self._layer.features.columns
+            if not str(c).startswith(self.RESERVED_FEATURES_KEY_PREFIX)
+        ]
+
+    @property
+    def attribute_types(self) -> Dict[str, str]:
+        attribute_types = self._layer.metadata.get(
+            self.ATTRIBUTE_TYPES_METADATA_KEY, {}
+        )
+        return {
+            attribute_name: attribute_types.get(attribute_name)
+            or get_roi_attribute_type(self._layer.features[attribute_name])
+            for attribute_name in self.attribute_names
+        }
+
+    @property
+    def attributes(self) -> pd.DataFrame:
+        layer_features = self._get_layer_features()
+        return layer_features[self.attribute_names].reset_index(drop=True)
+
     @property
     def new_roi_name(self) -> str:
         return self._layer.metadata[self.NEW_ROI_NAME_METADATA_KEY]
@@ -302,6 +742,14 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
     def new_roi_height(self, new_roi_height: float) -> None:
         self._layer.metadata[self.NEW_ROI_HEIGHT_METADATA_KEY] = new_roi_height
 
+    @property
+    def roi_grid_overlap(self) -> float:
+        return self._layer.metadata[self.ROI_GRID_OVERLAP_METADATA_KEY]
+
+    @roi_grid_overlap.setter
+    def roi_grid_overlap(self, roi_grid_overlap: float) -> None:
+        self._layer.metadata[self.ROI_GRID_OVERLAP_METADATA_KEY] = roi_grid_overlap
+
     @property
     def roi_origin(self) -> ROIOrigin:
         return ROIOrigin(self._layer.metadata[self.ROI_ORIGIN_METADATA_KEY])
@@ -327,6 +775,54 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
     def autosave_roi_file(self, autosave_roi_file: bool) -> None:
         self._layer.metadata[self.AUTOSAVE_ROI_FILE_METADATA_KEY] = autosave_roi_file
 
+    @property
+    def journal_roi_file(self) -> bool:
+        return self._layer.metadata[self.JOURNAL_ROI_FILE_METADATA_KEY]
+
+    @journal_roi_file.setter
+    def journal_roi_file(self, journal_roi_file: bool) -> None:
+        self._layer.metadata[self.JOURNAL_ROI_FILE_METADATA_KEY] = journal_roi_file
+
+    @property
+    def watch_roi_file(self) -> bool:
+        return self._layer.metadata[self.WATCH_ROI_FILE_METADATA_KEY]
+
+    @watch_roi_file.setter
+    def watch_roi_file(self, watch_roi_file: bool) -> None:
+        self._layer.metadata[self.WATCH_ROI_FILE_METADATA_KEY] = watch_roi_file
+
+    @property
+    def label_lod(self) -> bool:
+        return self._layer.metadata[self.LABEL_LOD_METADATA_KEY]
+
+    @label_lod.setter
+    def label_lod(self, label_lod: bool) -> None:
+        self._layer.metadata[self.LABEL_LOD_METADATA_KEY] = label_lod
+
+    @property
+    def min_label_size(self) -> float:
+        return self._layer.metadata[self.MIN_LABEL_SIZE_METADATA_KEY]
+
+    @min_label_size.setter
+    def min_label_size(self, min_label_size: float) -> None:
+        self._layer.metadata[self.MIN_LABEL_SIZE_METADATA_KEY] = min_label_size
+
+    @property
+    def world_coordinates(self) -> bool:
+        return self._layer.metadata[self.WORLD_COORDINATES_METADATA_KEY]
+
+    @world_coordinates.setter
+    def world_coordinates(self, world_coordinates: bool) -> None:
+        self._layer.metadata[self.WORLD_COORDINATES_METADATA_KEY] = world_coordinates
+
+    @property
+    def roi_unit(self) -> str:
+        return self._layer.metadata[self.ROI_UNIT_METADATA_KEY]
+
+    @roi_unit.setter
+    def roi_unit(self, roi_unit: str) -> None:
+        self._layer.metadata[self.ROI_UNIT_METADATA_KEY] = roi_unit
+
     @property
     def current_roi_name(self) -> Optional[str]:
         if (
@@ -344,3 +840,78 @@ class ROILayerAccessor(MutableSequence[ROIBase]):
             [current_roi_name] if current_roi_name is not None else []
         )
         self._layer.current_properties = layer_current_properties
+
+
+def _create_attribute_column(
+    attribute_type: str, n: int, default: Any = None
+) -> Union[pd.Categorical, np.ndarray]:
+    if attribute_type == "category":
+        categories = [] if default is None else [default]
+        return pd.Categorical([default] * n, categories=categories)
+    if default is None:
+        default = np.nan if attribute_type == "float64" else 0
+    return np.full(n, default, dtype=attribute_type)
+
+
+def _set_attribute_column_values(
+    column: pd.Series, indices: np.ndarray, converted_values: pd.Series
+) -> pd.Series:
+    # values converted to the attribute type using _convert_attribute_values
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        new_categories = pd.Index(converted_values.dropna().unique()).difference(
+            column.cat.categories
+        )
+        if len(new_categories) > 0:
+            column = column.cat.add_categories(new_categories)
+    column = column.copy()
+    column.iloc[indices] = converted_values.to_numpy()
+    return column
+
+
+def _convert_attribute_values(
+    values: Iterable[Any], attribute_type: str, attribute_name: str
+) -> pd.Series:
+    converted_values = pd.Series(list(values), dtype=object)
+    converted_values = converted_values.where(
+        converted_values.notna() & (converted_values.astype(str) != ""), None
+    )
+    if attribute_type == "category":
+        return converted_values.where(
+            converted_values.isna(), converted_values.astype(str)
+        )
+    try:
+        return converted_values.astype(attribute_type)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid values for ROI attribute {attribute_name}")
+
+
+def _cast_attribute_columns(
+    features: pd.DataFrame, attribute_types: Dict[str, str]
+) -> pd.DataFrame:
+    changed_attribute_types = {
+        attribute_name: attribute_type
+        for attribute_name, attribute_type in attribute_types.items()
+        if str(features[attribute_name].dtype) != attribute_type
+    }
+    if len(changed_attribute_types) == 0:
+        return features
+    features = features.copy()
+    for attribute_name, attribute_type in changed_attribute_types.items():
+        column = features[attribute_name]
+        if attribute_type == "category":
+            features[attribute_name] = column.astype("category")
+        else:
+            column = pd.to_numeric(column, errors="coerce")
+            if attribute_type == "int64":
+                column = column.fillna(0)
+            features[attribute_name] = column.astype(attribute_type)
+    return features
+
+
+def _translation_matrix(dy: float, dx: float) -> np.ndarray:
+    return np.array([[1.0, 0.0, dy], [0.0, 1.0, dx], [0.0, 0.0, 1.0]])
+
+
+def _scaling_matrix(sy: float, sx: float, y: float, x: float) -> np.ndarray:
+    # scales around (y, x)
+    return np.array([[sy, 0.0, y - sy * y], [0.0, sx, x - sx * x], [0.0, 0.0, 1.0]])
@@ -0,0 +1,78 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from napari.layers import Shapes
+
+from .. import ROIOrigin
+from .._roi_file import (
+    ROI_FILE_ATTRIBUTES_KEY,
+    ROI_FILE_COLUMNS,
+    ROI_FILE_COORDINATES_KEY,
+    ROI_FILE_WORLD_COORDINATES,
+    boxes_to_roi_file,
+    get_roi_attribute_types,
+)
+from ._roi_layer_accessor import ROILayerAccessor
+from ._roi_table_model import ROITableModel
+
+
+class ROILayerManager:
+    LAYER_COLUMN = "Layer"
+
+    def __init__(self) -> None:
+        self._entries: Dict[int, Tuple[Shapes, ROILayerAccessor, ROITableModel]] = {}
+
+    def get_roi_layer_accessor(self, layer: Shapes) -> ROILayerAccessor:
+        return self._get_entry(layer)[1]
+
+    def get_roi_table_model(self, layer: Shapes) -> ROITableModel:
+        return self._get_entry(layer)[2]
+
+    def remove(self, layer: Shapes) -> None:
+        entry = self._entries.pop(id(layer), None)
+        if entry is not None:
+            _, roi_layer_accessor, _ = entry
+            roi_layer_accessor.close()
+
+    def to_dataframe(
+        self, roi_origin: ROIOrigin, layers: Optional[Iterable[Shapes]] = None
+    ) -> pd.DataFrame:
+        # ROIs of all layers in world coordinates, such that they are comparable
+        layers = self.layers if layers is None else list(layers)
+        dfs = []
+        attribute_types: Dict[str, str] = {}
+        for layer in layers:
+            roi_layer_accessor = self.get_roi_layer_accessor(layer)
+            attributes = roi_layer_accessor.attributes
+            df = boxes_to_roi_file(
+                roi_layer_accessor.roi_names,
+                roi_layer_accessor.world_boxes,
+                roi_origin,
+                attributes=attributes,
+            )
+            df.insert(0, self.LAYER_COLUMN, layer.name)
+            dfs.append(df)
+            attribute_types.update(get_roi_attribute_types(attributes))
+        if len(dfs) == 0:
+            df = pd.DataFrame(columns=[self.LAYER_COLUMN, *ROI_FILE_COLUMNS])
+        else:
+            df = pd.concat(dfs, ignore_index=True)
+        df.attrs = {ROI_FILE_COORDINATES_KEY: ROI_FILE_WORLD_COORDINATES}
+        if len(attribute_types) > 0:
+            df.attrs[ROI_FILE_ATTRIBUTES_KEY] = attribute_types
+        return df
+
+    def _get_entry(
+        self, layer: Shapes
+    ) -> Tuple[Shapes, ROILayerAccessor, ROITableModel]:
+        entry = self._entries.get(id(layer))
+        if entry is None or entry[0] is not layer:
+            roi_layer_accessor = ROILayerAccessor(layer)
+            roi_table_model = ROITableModel(roi_layer_accessor)
+            entry = (layer, roi_layer_accessor, roi_table_model)
+            self._entries[id(layer)] = entry
+        return entry
+
+    @property
+    def layers(self) -> List[Shapes]:
+        return [layer for layer, _, _ in self._entries.values()]
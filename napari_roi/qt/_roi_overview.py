@@ -0,0 +1,237 @@
+from typing import Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from napari.layers import Image
+from napari.layers.utils.layer_utils import features_to_pandas_dataframe
+from napari.utils.events import Event
+from napari.viewer import Viewer
+from qtpy.QtCore import QObject, QTimer, Signal
+
+from .._roi_store import ROIStore, compute_roi_density
+from ._roi_layer_accessor import ROILayerAccessor
+from .utils import get_layer_view_extent, insert_layer
+
+
+class ROIOverview(QObject):
+    ROI_INDEX_FEATURES_KEY = "roi_index"
+
+    DEFAULT_MAX_SHAPES = 5000
+    DEFAULT_MARGIN = 0.5  # relative to the view size
+    DEFAULT_DENSITY_SIZE = 1024  # pixels
+    DEFAULT_INTERVAL = 100  # milliseconds
+
+    window_changed = Signal()
+
+    def __init__(
+        self,
+        viewer: Viewer,
+        roi_store: ROIStore,
+        roi_layer_accessor: ROILayerAccessor,
+        max_shapes: int = DEFAULT_MAX_SHAPES,
+        margin: float = DEFAULT_MARGIN,
+        interval: int = DEFAULT_INTERVAL,
+        parent: Optional[QObject] = None,
+    ) -> None:
+        super(ROIOverview, self).__init__(parent=parent)
+        self._viewer = viewer
+        self._roi_store = roi_store
+        self._roi_layer_accessor = roi_layer_accessor
+        self._max_shapes = max_shapes
+        self._margin = margin
+        # store indices of the ROIs in the Shapes layer ("window"), in layer order
+        self._window_indices = np.empty(0, dtype=int)
+        self._window_extent: Optional[Tuple[float, float, float, float]] = None
+        self._density_outdated = True
+        self._density_layer: Optional[Image] = None
+        # throttle camera events, which are emitted for every frame when panning
+        self._timer = QTimer(parent=self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(interval)
+        self._timer.timeout.connect(self.update)
+        roi_layer = roi_layer_accessor.layer
+        roi_layer.features[self.ROI_INDEX_FEATURES_KEY] = -1
+        roi_layer.feature_defaults[self.ROI_INDEX_FEATURES_KEY] = -1  # new ROIs
+        self._viewer.camera.events.center.connect(self._on_camera_changed)
+        self._viewer.camera.events.zoom.connect(self._on_camera_changed)
+        roi_layer.events.data.connect(self._on_roi_layer_changed)
+        roi_layer.events.properties.connect(self._on_roi_layer_changed)
+        self.update()
+
+    def close(self) -> None:
+        self._timer.stop()
+        roi_layer = self._roi_layer_accessor.layer
+        self._viewer.camera.events.center.disconnect(self._on_camera_changed)
+        self._viewer.camera.events.zoom.disconnect(self._on_camera_changed)
+        roi_layer.events.data.disconnect(self._on_roi_layer_changed)
+        roi_layer.events.properties.disconnect(self._on_roi_layer_changed)
+        if (
+            self._density_layer is not None
+            and self._density_layer in self._viewer.layers
+        ):
+            self._viewer.layers.remove(self._density_layer)
+        self._density_layer = None
+
+    def sync(self) -> None:
+        roi_layer = self._roi_layer_accessor.layer
+        layer_features = features_to_pandas_dataframe(roi_layer.features)
+        roi_indices = layer_features[self.ROI_INDEX_FEATURES_KEY].to_numpy(dtype=int)
+        roi_names = self._roi_layer_accessor.roi_names
+        boxes = self._roi_layer_accessor.boxes
+        # new shapes may inherit the store index of the selected shape
+        existing_mask = (roi_indices >= 0) & ~pd.Series(roi_indices).duplicated()
+        existing_mask = existing_mask.to_numpy()
+        deleted_indices = np.setdiff1d(self._window_indices, roi_indices[existing_mask])
+        updated_mask = existing_mask.copy()
+        updated_mask[existing_mask] = (
+            self._roi_store.roi_names[roi_indices[existing_mask]]
+            != roi_names[existing_mask]
+        ) | np.any(
+            self._roi_store.boxes[roi_indices[existing_mask]] != boxes[existing_mask],
+            axis=1,
+        )
+        if len(deleted_indices) == 0 and not updated_mask.any() and existing_mask.all():
+            return
+        self._roi_store.update(
+            roi_indices[updated_mask], roi_names[updated_mask], boxes[updated_mask]
+        )
+        roi_indices[~existing_mask] = self._roi_store.append(
+            roi_names[~existing_mask], boxes[~existing_mask]
+        )
+        if len(deleted_indices) > 0:
+            self._roi_store.delete(deleted_indices)
+            # shift the store indices of all ROIs after deleted ROIs
+            roi_indices -= np.searchsorted(deleted_indices, roi_indices)
+        self._set_window_indices(roi_indices)
+        self._density_outdated = True
+        self._timer.start()
+
+    def reset(
+        self,
+        roi_names: Union[Sequence[str], np.ndarray],
+        boxes: np.ndarray,
+        attributes: Optional[pd.DataFrame] = None,
+    ) -> None:
+        self._roi_store.reset(roi_names, boxes, attributes=attributes)
+        self._window_extent = None
+        self._load_window(np.empty(0, dtype=int), clear=True)
+        self._density_outdated = True
+        self.update()
+
+    def update(self) -> None:
+        if self._density_outdated:
+            self._refresh_density_layer()
+        roi_layer = self._roi_layer_accessor.layer
+        view_extent = get_layer_view_extent(self._viewer, roi_layer)
+        if self._window_extent is not None and _contains(
+            self._window_extent, view_extent
+        ):
+            return
+        y_min, x_min, y_max, x_max = view_extent
+        margin_y = self._margin * (y_max - y_min)
+        margin_x = self._margin * (x_max - x_min)
+        window_extent = (
+            y_min - margin_y,
+            x_min - margin_x,
+            y_max + margin_y,
+            x_max + margin_x,
+        )
+        indices = self._roi_store.find(window_extent)
+        if len(indices) > self._max_shapes:
+            # zoomed out, only show the density image
+            self._window_extent = None
+            self._load_window(np.empty(0, dtype=int), clear=True)
+            assert self._density_layer is not None
+            self._density_layer.visible = True
+        else:
+            self._window_extent = window_extent
+            # keep ROIs that left the view unless the Shapes layer is full
+            entered_indices = np.setdiff1d(indices, self._window_indices)
+            clear = len(self._window_indices) + len(entered_indices) > self._max_shapes
+            self._load_window(indices if clear else entered_indices, clear=clear)
+            assert self._density_layer is not None
+            self._density_layer.visible = False
+
+    def _on_camera_changed(self, event: Event) -> None:
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _on_roi_layer_changed(self, event: Event) -> None:
+        self.sync()
+
+    def _load_window(self, indices: np.ndarray, clear: bool = False) -> None:
+        if len(indices) == 0 and not (clear and len(self._window_indices) > 0):
+            return
+        roi_layer = self._roi_layer_accessor.layer
+        with roi_layer.events.blocker_all():
+            if clear:
+                self._roi_layer_accessor.delete_rois(
+                    range(len(self._roi_layer_accessor))
+                )
+                self._window_indices = np.empty(0, dtype=int)
+            self._roi_layer_accessor.insert_boxes(
+                len(self._roi_layer_accessor),
+                self._roi_store.roi_names[indices],
+                self._roi_store.boxes[indices],
+            )
+        self._set_window_indices(np.concatenate((self._window_indices, indices)))
+        roi_layer.refresh()
+        self.window_changed.emit()
+
+    def _set_window_indices(self, window_indices: np.ndarray) -> None:
+        roi_layer = self._roi_layer_accessor.layer
+        layer_features = features_to_pandas_dataframe(roi_layer.features).copy()
+        layer_features[self.ROI_INDEX_FEATURES_KEY] = window_indices
+        with roi_layer.events.blocker_all():
+            roi_layer.features = layer_features
+        self._window_indices = np.asarray(window_indices, dtype=int)
+
+    def _refresh_density_layer(self) -> None:
+        density, scale, translate = compute_roi_density(
+            self._roi_store.boxes, max_size=self.DEFAULT_DENSITY_SIZE
+        )
+        if (
+            self._density_layer is None
+            or self._density_layer not in self._viewer.layers
+        ):
+            roi_layer = self._roi_layer_accessor.layer
+            self._density_layer = Image(
+                density,
+                scale=scale,
+                translate=translate,
+                colormap="magma",
+                opacity=0.7,
+                name=f"{roi_layer.name} overview",
+            )
+            index = self._viewer.layers.index(roi_layer)
+            insert_layer(self._viewer, index, self._density_layer)
+        else:
+            self._density_layer.data = density
+            self._density_layer.scale = scale
+            self._density_layer.translate = translate
+            self._density_layer.reset_contrast_limits()
+        self._density_outdated = False
+
+    @property
+    def roi_store(self) -> ROIStore:
+        return self._roi_store
+
+    @property
+    def roi_layer_accessor(self) -> ROILayerAccessor:
+        return self._roi_layer_accessor
+
+    @property
+    def density_layer(self) -> Optional[Image]:
+        return self._density_layer
+
+
+def _contains(
+    outer_extent: Tuple[float, float, float, float],
+    inner_extent: Tuple[float, float, float, float],
+) -> bool:
+    return (
+        outer_extent[0] <= inner_extent[0]
+        and outer_extent[1] <= inner_extent[1]
+        and outer_extent[2] >= inner_extent[2]
+        and outer_extent[3] >= inner_extent[3]
+    )
@@ -0,0 +1,98 @@
+from contextlib import contextmanager
+from typing import Iterable, Iterator, Optional, Set
+
+from napari.layers import Shapes
+from napari.utils.events import Event
+from qtpy.QtCore import QItemSelection, QItemSelectionModel, QObject, QTimer
+from qtpy.QtWidgets import QTableView
+
+from .utils import item_selection_to_rows, rows_to_item_selection
+
+
+class ROISelectionSynchronizer(QObject):
+    def __init__(
+        self, layer: Shapes, table_view: QTableView, parent: Optional[QObject] = None
+    ) -> None:
+        super(ROISelectionSynchronizer, self).__init__(parent=parent)
+        self._layer = layer
+        self._table_view = table_view
+        selection_model = table_view.selectionModel()
+        assert selection_model is not None
+        model = selection_model.model()
+        assert model is not None
+        self._selection_model = selection_model
+        self._model = model
+        self._selected_rows: Set[int] = set()
+        self._synchronizing = False
+        # coalesce consecutive table view selection changes into one layer update
+        self._layer_update_timer = QTimer(parent=self)
+        self._layer_update_timer.setSingleShot(True)
+        self._layer_update_timer.setInterval(0)
+        self._layer_update_timer.timeout.connect(self._on_layer_update_timer_timeout)
+        self._selection_model.selectionChanged.connect(
+            self._on_table_view_selection_changed
+        )
+        self._model.modelReset.connect(self._on_model_reset)
+        self._layer.events.highlight.connect(self._on_layer_highlight)
+        self._set_table_view_selection(self._layer.selected_data)
+
+    def close(self) -> None:
+        self._layer_update_timer.stop()
+        self._selection_model.selectionChanged.disconnect(
+            self._on_table_view_selection_changed
+        )
+        self._model.modelReset.disconnect(self._on_model_reset)
+        self._layer.events.highlight.disconnect(self._on_layer_highlight)
+
+    def select(self, rows: Iterable[int]) -> None:
+        rows = set(int(row) for row in rows)
+        self._layer_update_timer.stop()
+        self._set_layer_selection(rows)
+        self._set_table_view_selection(rows)
+
+    def _on_table_view_selection_changed(
+        self, selected: QItemSelection, deselected: QItemSelection
+    ) -> None:
+        if not self._synchronizing:
+            self._layer_update_timer.start()
+
+    def _on_layer_update_timer_timeout(self) -> None:
+        # use the full selection, not just the incremental change
+        rows = item_selection_to_rows(self._selection_model.selection())
+        self._set_layer_selection(set(rows.tolist()))
+
+    def _on_model_reset(self) -> None:
+        self._set_table_view_selection(self._layer.selected_data)
+
+    def _on_layer_highlight(self, event: Event) -> None:
+        # highlight events are also emitted on hover, without selection changes
+        if not self._synchronizing and self._layer.selected_data != self._selected_rows:
+            self._set_table_view_selection(self._layer.selected_data)
+
+    def _set_layer_selection(self, rows: Set[int]) -> None:
+        self._selected_rows = rows
+        with self._synchronize():
+            self._layer.selected_data = rows
+            # setting the selection does not redraw the selection highlight; only
+            # redraw the highlight instead of refreshing the whole layer
+            self._layer.events.highlight()
+
+    def _set_table_view_selection(self, rows: Iterable[int]) -> None:
+        row_count = self._model.rowCount()
+        rows = set(row for row in rows if row < row_count)
+        self._selected_rows = rows
+        item_selection = rows_to_item_selection(self._model, rows)
+        with self._synchronize():
+            self._selection_model.select(
+                item_selection,
+                QItemSelectionModel.SelectionFlag.ClearAndSelect
+                | QItemSelectionModel.SelectionFlag.Rows,
+            )
+
+    @contextmanager
+    def _synchronize(self) -> Iterator[None]:
+        self._synchronizing = True
+        try:
+            yield
+        finally:
+            self._synchronizing = False
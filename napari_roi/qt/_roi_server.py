@@ -0,0 +1,139 @@
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+from qtpy.QtCore import QObject, Signal
+from qtpy.QtNetwork import QAbstractSocket, QLocalServer, QLocalSocket
+
+from .._roi_changes import diff_rois
+from .._roi_ipc import (
+    DEFAULT_ROI_SERVER_NAME,
+    ROI_MESSAGE_PUSH,
+    ROIMessage,
+    create_changes_message,
+    create_snapshot_message,
+    decode_roi_message,
+    encode_roi_message,
+)
+
+
+class ROIServer(QObject):
+    DEFAULT_SERVER_NAME = DEFAULT_ROI_SERVER_NAME
+
+    rois_pushed = Signal(list, object, bool)  # ROI names, boxes, replace
+
+    def __init__(self, parent: Optional[QObject] = None) -> None:
+        super(ROIServer, self).__init__(parent=parent)
+        self._server = QLocalServer(parent=self)
+        self._server.setSocketOptions(QLocalServer.SocketOption.UserAccessOption)
+        self._server.newConnection.connect(self._on_server_new_connection)
+        self._sockets: List[QLocalSocket] = []
+        self._roi_names = np.empty(0, dtype=str)
+        self._boxes = np.empty((0, 4))
+
+    def listen(self, server_name: str = DEFAULT_SERVER_NAME) -> None:
+        # listening replaces the sockets of running servers on some platforms
+        if _is_server_running(server_name):
+            raise RuntimeError(f"ROI server {server_name} is already running")
+        if self._server.listen(server_name):
+            return
+        if self._server.serverError() == QAbstractSocket.SocketError.AddressInUseError:
+            QLocalServer.removeServer(server_name)  # stale socket of a crashed server
+            if self._server.listen(server_name):
+                return
+        raise RuntimeError(self._server.errorString())
+
+    def close(self) -> None:
+        for socket in self._sockets:
+            socket.disconnectFromServer()
+        self._sockets.clear()
+        self._server.close()
+
+    def reset(
+        self, roi_names: Union[Sequence[str], np.ndarray], boxes: np.ndarray
+    ) -> None:
+        self._roi_names = np.array(roi_names, dtype=str)
+        self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+        self._broadcast(create_snapshot_message(self._roi_names, self._boxes))
+
+    def publish(
+        self, roi_names: Union[Sequence[str], np.ndarray], boxes: np.ndarray
+    ) -> None:
+        changes = diff_rois(self._roi_names, self._boxes, roi_names, boxes)
+        if len(changes) > 0:
+            self._roi_names = np.array(roi_names, dtype=str)
+            self._boxes = np.array(boxes, dtype=float).reshape(-1, 4)
+            self._broadcast(create_changes_message(changes))
+
+    def _on_server_new_connection(self) -> None:
+        while self._server.hasPendingConnections():
+            socket = self._server.nextPendingConnection()
+            if socket is None:
+                break
+            socket.readyRead.connect(
+                lambda socket=socket: self._on_socket_ready(socket)
+            )
+            socket.disconnected.connect(
+                lambda socket=socket: self._on_socket_disconnected(socket)
+            )
+            self._sockets.append(socket)
+            message = create_snapshot_message(self._roi_names, self._boxes)
+            socket.write(encode_roi_message(message))
+
+    def _on_socket_ready(self, socket: QLocalSocket) -> None:
+        while socket.canReadLine():
+            line = bytes(socket.readLine())
+            try:
+                message = decode_roi_message(line)
+            except ValueError:
+                continue  # also covers JSON decoding errors
+            self._handle_message(message)
+
+    def _on_socket_disconnected(self, socket: QLocalSocket) -> None:
+        if socket in self._sockets:
+            self._sockets.remove(socket)
+        socket.deleteLater()
+
+    def _handle_message(self, message: ROIMessage) -> None:
+        if message["type"] == ROI_MESSAGE_PUSH:
+            # ignore malformed messages, raising here would abort the Qt slot
+            try:
+                boxes = np.asarray(message.get("boxes", []), dtype=float)
+            except (TypeError, ValueError):
+                return
+            if boxes.size == 0:
+                boxes = boxes.reshape(0, 4)
+            roi_names = message.get("names", [])
+            if (
+                boxes.ndim == 2
+                and boxes.shape[1] == 4
+                and np.isfinite(boxes).all()
+                and isinstance(roi_names, list)
+                and len(roi_names) == len(boxes)
+            ):
+                self.rois_pushed.emit(
+                    [str(roi_name) for roi_name in roi_names],
+                    boxes,
+                    bool(message.get("replace", False)),
+                )
+
+    def _broadcast(self, message: ROIMessage) -> None:
+        data = encode_roi_message(message)
+        for socket in self._sockets:
+            socket.write(data)
+            socket.flush()
+
+    @property
+    def server_name(self) -> str:
+        return self._server.fullServerName()
+
+    @property
+    def is_listening(self) -> bool:
+        return self._server.isListening()
+
+
+def _is_server_running(server_name: str, timeout: int = 1000) -> bool:
+    socket = QLocalSocket()
+    socket.connectToServer(server_name)
+    connected = socket.waitForConnected(timeout)
+    socket.abort()
+    return connected
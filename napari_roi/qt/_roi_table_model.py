@@ -1,5 +1,7 @@
-from typing import Any, MutableSequence, Optional, Sequence
+from typing import Any, List, MutableSequence, Optional, Sequence
 
+import numpy as np
+import pandas as pd
 from qtpy.QtCore import QAbstractTableModel, QModelIndex, QObject, Qt
 
 from .. import ROI, ROIBase
@@ -20,7 +22,7 @@ class ROITableModel(QAbstractTableModel):
     def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
         if parent.isValid():
             return 0
-        return 5
+        return 5 + len(self._attribute_names)
 
     def data(
         self,
@@ -41,6 +43,12 @@ class ROITableModel(QAbstractTableModel):
                 return self._rois[index.row()].width
             if index.column() == 4:
                 return self._rois[index.row()].height
+            if index.column() < self.columnCount():
+                attribute_name = self._attribute_names[index.column() - 5]
+                value = self._rois[index.row()].features[attribute_name]  # type: ignore
+                if pd.isna(value):
+                    return None
+                return value.item() if isinstance(value, np.generic) else value
         return None
 
     def headerData(
@@ -53,7 +61,9 @@ class ROITableModel(QAbstractTableModel):
             orientation == Qt.Orientation.Horizontal
             and role == Qt.ItemDataRole.DisplayRole
         ):
-            return ("name", "x", "y", "width", "height")[section]
+            return ("name", "x", "y", "width", "height", *self._attribute_names)[
+                section
+            ]
         return None
 
     def setData(
@@ -65,9 +75,8 @@ class ROITableModel(QAbstractTableModel):
         if 0 <= index.row() < self.rowCount() and role == Qt.ItemDataRole.EditRole:
             if index.column() == 0:
                 str_value = str(value).strip()
-                if len(str_value) > 0 and not any(
-                    roi.name == str_value and i != index.row()
-                    for i, roi in enumerate(self._rois)
+                if len(str_value) > 0 and not self._is_duplicate_name(
+                    str_value, index.row()
                 ):
                     self._rois[index.row()].name = str_value
                 else:
@@ -100,6 +109,14 @@ class ROITableModel(QAbstractTableModel):
                     self._rois[index.row()].height = float_value
                 else:
                     return False
+            elif index.column() < self.columnCount():
+                attribute_name = self._attribute_names[index.column() - 5]
+                try:
+                    self._rois.set_attribute_values(  # type: ignore
+                        [index.row()], attribute_name, [value]
+                    )
+                except ValueError:
+                    return False
             self.dataChanged.emit(
                 self.createIndex(index.row(), index.column()),
                 self.createIndex(index.row(), index.column()),
@@ -108,6 +125,11 @@ class ROITableModel(QAbstractTableModel):
             return True
         return False
 
+    @property
+    def _attribute_names(self) -> List[str]:
+        # only ROI layers support attributes
+        return getattr(self._rois, "attribute_names", [])
+
     def flags(self, index: QModelIndex) -> Qt.ItemFlags:
         if (
             0 <= index.row() < self.rowCount()
@@ -151,6 +173,22 @@ class ROITableModel(QAbstractTableModel):
                 [Qt.ItemDataRole.DisplayRole],
             )
 
+    def refresh_columns(self, column_indices: Sequence[int]) -> None:
+        if self.rowCount() > 0:
+            for column_index in column_indices:
+                self.dataChanged.emit(
+                    self.createIndex(0, column_index),
+                    self.createIndex(self.rowCount() - 1, column_index),
+                    [Qt.ItemDataRole.DisplayRole],
+                )
+
+    def _is_duplicate_name(self, name: str, row: int) -> bool:
+        roi_names = getattr(self._rois, "roi_names", None)
+        if roi_names is not None:  # vectorized, e.g. for ROILayerAccessor
+            rows = np.flatnonzero(np.asarray(roi_names) == name)
+            return bool(np.any(rows != row))
+        return any(roi.name == name and i != row for i, roi in enumerate(self._rois))
+
     def reset(self) -> None:
         self.beginResetModel()
         self.endResetModel()
@@ -1,7 +1,20 @@
 from collections.abc import MutableSequence
-from typing import TypeVar
+from typing import Any, Iterable, Optional, Tuple, TypeVar
 
-from qtpy.QtCore import QAbstractItemModel, QModelIndex, Qt
+import numpy as np
+import pandas as pd
+from napari.layers import Layer
+from napari.utils.transforms import CompositeAffine
+from napari.viewer import Viewer
+from qtpy.QtCore import (
+    QAbstractItemModel,
+    QAbstractTableModel,
+    QItemSelection,
+    QItemSelectionRange,
+    QModelIndex,
+    QObject,
+    Qt,
+)
 
 T = TypeVar("T")
 
@@ -42,3 +55,130 @@ class MutableItemModelSequenceWrapper(MutableSequence[T]):
     @property
     def model(self) -> QAbstractItemModel:
         return self._model
+
+
+class DataFrameTableModel(QAbstractTableModel):
+    def __init__(
+        self, df: Optional[pd.DataFrame] = None, parent: Optional[QObject] = None
+    ) -> None:
+        super(DataFrameTableModel, self).__init__(parent=parent)
+        self._df = df if df is not None else pd.DataFrame()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._df.index)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        if parent.isValid():
+            return 0
+        return len(self._df.columns)
+
+    def data(
+        self,
+        index: QModelIndex,
+        role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if (
+            0 <= index.row() < self.rowCount()
+            and 0 <= index.column() < self.columnCount()
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            value = self._df.iat[index.row(), index.column()]
+            if isinstance(value, (float, np.floating)):
+                return f"{value:.4g}"
+            return str(value)
+        return None
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: Qt.ItemDataRole = Qt.ItemDataRole.DisplayRole,
+    ) -> Any:
+        if role == Qt.ItemDataRole.DisplayRole:
+            if orientation == Qt.Orientation.Horizontal:
+                return str(self._df.columns[section])
+            return str(self._df.index[section])
+        return None
+
+    @property
+    def dataframe(self) -> pd.DataFrame:
+        return self._df
+
+    @dataframe.setter
+    def dataframe(self, df: pd.DataFrame) -> None:
+        self.beginResetModel()
+        self._df = df
+        self.endResetModel()
+
+
+def item_selection_to_rows(item_selection: QItemSelection) -> np.ndarray:
+    row_ranges = [(r.top(), r.bottom() + 1) for r in item_selection]
+    if len(row_ranges) == 0:
+        return np.empty(0, dtype=int)
+    return np.unique(np.concatenate([np.arange(a, b) for a, b in row_ranges]))
+
+
+def rows_to_item_selection(
+    model: QAbstractItemModel, rows: Iterable[int]
+) -> QItemSelection:
+    unique_rows = np.unique(np.fromiter(rows, dtype=int))
+    item_selection = QItemSelection()
+    if len(unique_rows) > 0:
+        # split into runs of consecutive rows, such that each run is one range
+        run_starts = np.flatnonzero(
+            np.diff(unique_rows, prepend=unique_rows[0] - 2) != 1
+        )
+        run_stops = np.append(run_starts[1:], len(unique_rows)) - 1
+        last_column = model.columnCount() - 1
+        for first_row, last_row in zip(unique_rows[run_starts], unique_rows[run_stops]):
+            item_selection.append(
+                QItemSelectionRange(
+                    model.index(int(first_row), 0),
+                    model.index(int(last_row), last_column),
+                )
+            )
+    return item_selection
+
+
+def get_layer_view_extent(
+    viewer: Viewer, layer: Layer
+) -> Tuple[float, float, float, float]:
+    # camera extent in world coordinates, transformed to layer data coordinates
+    scale = np.asarray(layer.scale[-2:], dtype=float)
+    translate = np.asarray(layer.translate[-2:], dtype=float)
+    center = np.asarray(viewer.camera.center[-2:], dtype=float)
+    half_size = np.asarray(viewer._canvas_size, dtype=float) / (
+        2.0 * viewer.camera.zoom
+    )
+    corners = (np.array([center - half_size, center + half_size]) - translate) / scale
+    y_min, x_min = corners.min(axis=0)
+    y_max, x_max = corners.max(axis=0)
+    return y_min, x_min, y_max, x_max
+
+
+def get_layer_data_to_world_matrix(layer: Layer) -> np.ndarray:
+    # 3x3 matrix in (Y, X) order, for the last two axes of the layer
+    ndim = layer.ndim
+    matrix = (
+        layer.affine.affine_matrix
+        @ CompositeAffine(
+            scale=layer.scale,
+            translate=layer.translate,
+            rotate=layer.rotate,
+            shear=layer.shear,
+            ndim=ndim,
+        ).affine_matrix
+    )
+    yx_indices = [ndim - 2, ndim - 1, ndim]  # last two axes and translation
+    return matrix[np.ix_(yx_indices, yx_indices)]
+
+
+def insert_layer(viewer: Viewer, index: int, layer: Layer) -> None:
+    # keep the active layer, such that the ROI widget stays active
+    selection = viewer.layers.selection
+    active_layer = selection.active
+    with selection.events.blocker_all():
+        viewer.layers.insert(index, layer)
+        selection.active = active_layer